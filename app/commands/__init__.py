@@ -0,0 +1,2 @@
+# app/commands/__init__.py
+# Maintenance commands, run as modules, e.g. `python -m app.commands.rebucket_conversations`.
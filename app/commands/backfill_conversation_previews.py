@@ -0,0 +1,42 @@
+# app/commands/backfill_conversation_previews.py
+"""Set `last_message_preview` on conversations stored before it existed.
+
+Usage: python -m app.commands.backfill_conversation_previews
+
+One pipeline update_many copies the start of the last stored message, which
+both layouts keep on the conversation document (bucketed conversations keep
+their latest messages inline). Conversations that already have a preview or
+have no messages are not touched, so the command is safe to re-run.
+"""
+import argparse
+import asyncio
+import time
+
+from app.database import collections
+from app.database.config import CONVERSATION_PREVIEW_LENGTH
+from app.database.session import db_session
+
+
+async def backfill_conversation_previews() -> None:
+    await db_session.connect()
+    try:
+        started = time.monotonic()
+        result = await db_session.db[collections.CONVERSATIONS].update_many(
+            {"last_message_preview": None, "messages.0": {"$exists": True}},
+            [{"$set": {"last_message_preview": {
+                "$substrCP": [{"$arrayElemAt": ["$messages.content", -1]}, 0, CONVERSATION_PREVIEW_LENGTH],
+            }}}],
+        )
+        print(f"Done in {time.monotonic() - started:.1f}s: {result.modified_count} conversations updated")
+    finally:
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    asyncio.run(backfill_conversation_previews())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# app/commands/backfill_coordinates.py
+"""Convert legacy `{latitude, longitude}` coordinates to GeoJSON points.
+
+Usage: python -m app.commands.backfill_coordinates [--collection locations] [--batch-size 500]
+
+Documents are read in `_id` order and rewritten with one unordered bulk write
+per batch. Each update is conditional on the document still holding the
+legacy value, so concurrent edits win and the command is safe to re-run.
+Run it before relying on the 2dsphere indexes: a 2dsphere index reads a
+`{latitude, longitude}` pair as [x, y], i.e. with the axes swapped.
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from pymongo import ASCENDING, UpdateOne
+
+from app.database import collections
+from app.database.session import db_session
+from app.models.location_models.geo_point import GeoPoint
+
+GEO_COLLECTIONS = [collections.LOCATIONS, collections.PROPERTIES]
+LEGACY_FILTER = {"coordinates.latitude": {"$exists": True}, "coordinates.longitude": {"$exists": True}}
+
+
+async def backfill_collection(name: str, batch_size: int) -> None:
+    collection = db_session.db[name]
+    converted = invalid = 0
+    last_id = None
+    started = time.monotonic()
+    while True:
+        query = dict(LEGACY_FILTER)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        cursor = collection.find(query, {"coordinates": 1}).sort("_id", ASCENDING).limit(batch_size)
+        documents = await cursor.to_list(length=batch_size)
+        if not documents:
+            break
+        last_id = documents[-1]["_id"]
+        updates = []
+        for document in documents:
+            legacy = document["coordinates"]
+            try:
+                point = GeoPoint(**legacy)
+            except ValueError:
+                invalid += 1
+                print(f"{name}/{document['_id']}: invalid coordinates {legacy}, left unchanged")
+                continue
+            updates.append(UpdateOne(
+                {"_id": document["_id"], "coordinates": legacy},
+                {"$set": {"coordinates": point.dict()}},
+            ))
+        if updates:
+            result = await collection.bulk_write(updates, ordered=False)
+            converted += result.modified_count
+        print(f"{name}: {converted} converted ({time.monotonic() - started:.1f}s)")
+    print(f"Done with {name}: {converted} converted, {invalid} invalid")
+
+
+async def backfill_coordinates(names: List[str], batch_size: int) -> None:
+    await db_session.connect()
+    try:
+        for name in names:
+            await backfill_collection(name, batch_size)
+    finally:
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collection", choices=GEO_COLLECTIONS, action="append",
+                        help="Collection to convert; may be repeated (default: all)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(backfill_coordinates(args.collection or GEO_COLLECTIONS, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# app/commands/import_feed.py
+"""Import a developer's property or project feed from CSV or JSONL.
+
+Usage: python -m app.commands.import_feed FILE --entity {property,project} [--format {csv,jsonl}]
+           [--batch-size 500] [--workers N] [--restart]
+
+Rows are read in batches and validated into models by a process pool; the
+writer upserts each batch on `external_id` with one unordered bulk write, in
+file order. At most two batches per worker are in flight, so memory stays
+bounded however large the file is. An imported `current_price` replaces the
+stored one unless that was submitted later, and every new price is recorded
+in the price history, as for prices submitted through the API.
+
+CSV columns are dotted paths into the model (`current_price.amount`,
+`current_price.payment_plans.0.name`); numeric segments index lists, and
+list-of-value fields such as `location_ids` take `|`-separated values. Empty
+cells are left out. JSONL rows are already nested.
+
+Rejected rows are written to FILE.rejects.jsonl with their row number and
+errors. After every written batch the row count is saved to FILE.checkpoint,
+so a rerun resumes after the last written batch (--restart ignores it); the
+checkpoint is removed once the import completes.
+"""
+import argparse
+import asyncio
+import csv
+import inspect
+import json
+import multiprocessing
+import os
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterator, List, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+from app.config import settings
+from app.database import collections
+from app.database.session import db_session
+from app.models.developer_models.project import Project
+from app.models.property_models.property import Property
+from app.repositories.invalidation_bus import create_invalidation_bus
+from app.repositories.location_repository import LocationRepository
+from app.repositories.location_rollup import LocationPriceRollup
+from app.repositories.location_tree import LocationTree
+from app.repositories.price_history_repository import PriceHistoryRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.property_repository import PropertyRepository
+from app.schemas.bulk import SUCCESS_STATUSES, BulkItemStatus
+from app.services.bulk import describe_errors
+
+MODELS = {"property": Property, "project": Project}
+REPOSITORIES = {
+    "property": (PropertyRepository, collections.PROPERTIES),
+    "project": (ProjectRepository, collections.PROJECTS),
+}
+LIST_SEPARATOR = "|"
+
+# (1-based row number, CSV row dict or raw JSONL line)
+Row = Tuple[int, Union[Dict[str, str], str]]
+
+
+@lru_cache(maxsize=None)
+def list_paths(model: Type[BaseModel], prefix: str = "") -> FrozenSet[str]:
+    """Dotted paths of list-of-value fields, whose CSV cells hold `|`-separated values."""
+    paths = set()
+    for name, info in model.model_fields.items():
+        annotation = info.annotation
+        if get_origin(annotation) is Union:
+            annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+        many = get_origin(annotation) in (list, List)
+        item = get_args(annotation)[0] if many else annotation
+        if inspect.isclass(item) and issubclass(item, BaseModel):
+            paths |= list_paths(item, f"{prefix}{name}.")
+        elif many:
+            paths.add(f"{prefix}{name}")
+    return frozenset(paths)
+
+
+def _lists(value: Any) -> Any:
+    # {"0": a, "1": b} -> [a, b]
+    if isinstance(value, dict):
+        if value and all(key.isdigit() for key in value):
+            return [_lists(value[key]) for key in sorted(value, key=int)]
+        return {key: _lists(item) for key, item in value.items()}
+    return value
+
+
+def unflatten(row: Dict[str, str], model: Type[BaseModel]) -> Dict[str, Any]:
+    """Turn a CSV row with dotted column names into the nested dict the model expects."""
+    nested: Dict[str, Any] = {}
+    for column, value in row.items():
+        if not column or value is None or value == "":
+            continue
+        parts = column.strip().split(".")
+        if ".".join(part for part in parts if not part.isdigit()) in list_paths(model):
+            value = [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+        target = nested
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+            if not isinstance(target, dict):
+                raise ValueError(f"{column}: conflicts with a column for its parent")
+        target[parts[-1]] = value
+    return _lists(nested)
+
+
+def validate_batch(entity: str, rows: List[Row]) -> Tuple[List[Tuple[int, BaseModel]], List[Dict[str, Any]]]:
+    """Runs in a pool process: the valid rows as models, and a reject record for every other row.
+
+    When a batch repeats an external id the later row wins, as it would across batches.
+    """
+    model = MODELS[entity]
+    valid: Dict[str, Tuple[int, BaseModel]] = {}
+    rejects = []
+    for number, row in rows:
+        try:
+            data = json.loads(row) if isinstance(row, str) else unflatten(row, model)
+            aggregate = model(**data)
+        except ValidationError as e:
+            rejects.append({"row": number, "error": describe_errors(e), "data": row})
+            continue
+        except (ValueError, TypeError) as e:
+            # Malformed JSON or a CSV header clash.
+            rejects.append({"row": number, "error": str(e), "data": row})
+            continue
+        if not aggregate.external_id:
+            rejects.append({"row": number, "error": "external_id: Field required", "data": row})
+            continue
+        # Only used if the upsert creates the document.
+        aggregate.id = str(uuid.uuid4())
+        if aggregate.external_id in valid:
+            rejects.append({"row": valid[aggregate.external_id][0], "error": f"superseded by row {number}"})
+        valid[aggregate.external_id] = (number, aggregate)
+    return list(valid.values()), rejects
+
+
+def read_rows(path: str, file_format: str) -> Iterator[Union[Dict[str, str], str]]:
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        if file_format == "csv":
+            yield from csv.DictReader(file)
+        else:
+            # Lines are parsed in the workers, where a bad one becomes a reject.
+            yield from (line for line in file if line.strip())
+
+
+def load_checkpoint(path: str, source: str, entity: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path) as file:
+        checkpoint = json.load(file)
+    if checkpoint["source"] != source or checkpoint["entity"] != entity:
+        raise SystemExit(f"{path} belongs to another import; pass --restart to ignore it")
+    return checkpoint["rows"]
+
+
+def save_checkpoint(path: str, source: str, entity: str, rows: int) -> None:
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump({"source": source, "entity": entity, "rows": rows}, file)
+    os.replace(temporary, path)
+
+
+async def _produce(rows: Iterator[Row], entity: str, batch_size: int, executor: ProcessPoolExecutor, queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while batch := list(islice(rows, batch_size)):
+            # Blocks once the queue is full, until the writer catches up.
+            await queue.put((batch[-1][0], loop.run_in_executor(executor, validate_batch, entity, batch)))
+    finally:
+        await queue.put(None)
+
+
+async def import_feed(path: str, entity: str, file_format: str, batch_size: int, workers: int, restart: bool) -> None:
+    source = os.path.abspath(path)
+    checkpoint_path, rejects_path = f"{path}.checkpoint", f"{path}.rejects.jsonl"
+    skip = 0 if restart else load_checkpoint(checkpoint_path, source, entity)
+    if skip:
+        print(f"Resuming after row {skip}")
+
+    await db_session.connect()
+    repository_class, collection = REPOSITORIES[entity]
+    repository = repository_class(db_session.db[collection])
+    # Tells the API workers to drop cached copies of updated documents.
+    repository.invalidation_bus = create_invalidation_bus(
+        settings.CACHE_INVALIDATION_BACKEND, settings.REDIS_URL, settings.CACHE_INVALIDATION_CHANNEL
+    )
+    if entity == "property":
+        # Imported prices count towards the location averages like any other property write.
+        tree = LocationTree(db_session.db[collections.LOCATIONS])
+        await tree.load()
+        locations = LocationRepository(db_session.db[collections.LOCATIONS])
+        locations.invalidation_bus = repository.invalidation_bus
+        repository.rollup = LocationPriceRollup(locations, tree)
+        # And are recorded in the price history, so trends include them.
+        repository.price_history = PriceHistoryRepository(db_session.db[collections.PRICE_HISTORY])
+        repository.price_history.invalidation_bus = repository.invalidation_bus
+    counts: Counter = Counter()
+    started = time.monotonic()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2 * workers)
+    rows = islice(enumerate(read_rows(path, file_format), start=1), skip, None)
+    try:
+        # Spawned rather than forked: this process already holds a MongoDB client.
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor, \
+                open(rejects_path, "a" if skip else "w") as rejects:
+            producer = asyncio.create_task(_produce(rows, entity, batch_size, executor, queue))
+            try:
+                while (batch := await queue.get()) is not None:
+                    last_row, validated = batch
+                    valid, rejected = await validated
+                    results = await repository.upsert_by_external_id([aggregate for _, aggregate in valid]) if valid else []
+                    for result in results:
+                        if result.status not in SUCCESS_STATUSES:
+                            number, aggregate = valid[result.index]
+                            rejected.append({"row": number, "external_id": aggregate.external_id, "error": result.error})
+                    for reject in rejected:
+                        rejects.write(json.dumps(reject, default=str) + "\n")
+                    rejects.flush()
+                    save_checkpoint(checkpoint_path, source, entity, last_row)
+
+                    counts.update(result.status for result in results if result.status in SUCCESS_STATUSES)
+                    counts["rejected"] += len(rejected)
+                    rows_done = last_row - skip
+                    print(
+                        f"row {last_row}: {counts[BulkItemStatus.CREATED]} created, {counts[BulkItemStatus.UPDATED]} updated, "
+                        f"{counts['rejected']} rejected ({rows_done / (time.monotonic() - started):.0f} rows/s)"
+                    )
+                await producer
+            finally:
+                producer.cancel()
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        elapsed = time.monotonic() - started
+        print(
+            f"Done in {elapsed:.1f}s: {counts[BulkItemStatus.CREATED]} created, {counts[BulkItemStatus.UPDATED]} updated, "
+            f"{counts['rejected']} rejected (see {rejects_path})"
+        )
+    finally:
+        await repository.invalidation_bus.stop()
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file")
+    parser.add_argument("--entity", choices=sorted(MODELS), required=True)
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start from the first row")
+    args = parser.parse_args()
+    file_format = args.format or ("jsonl" if args.file.endswith((".jsonl", ".ndjson")) else "csv")
+    asyncio.run(import_feed(args.file, args.entity, file_format, args.batch_size, args.workers, args.restart))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# app/commands/migrate_price_history.py
+"""Move embedded `Property.prices` lists into the `price_history` collection.
+
+Usage: python -m app.commands.migrate_price_history [--batch-size 500]
+
+Properties are read in `_id` order; each batch becomes one unordered bulk
+write of history records and one of property updates. Records are keyed by
+the price id (or property id and position), so re-running never duplicates
+them. The property update removes `prices` and, when the property has no
+`current_price` yet, sets it to the latest embedded price. It is conditional
+on `prices` being unchanged, so a property edited mid-run is left for the
+next run.
+"""
+import argparse
+import asyncio
+import time
+
+from pymongo import ASCENDING, ReplaceOne, UpdateOne
+
+from app.database import collections
+from app.database.session import db_session
+
+
+async def migrate_price_history(batch_size: int) -> None:
+    await db_session.connect()
+    try:
+        properties = db_session.db[collections.PROPERTIES]
+        history = db_session.db[collections.PRICE_HISTORY]
+        migrated = records = 0
+        last_id = None
+        started = time.monotonic()
+        while True:
+            query = {"prices": {"$exists": True}}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            cursor = properties.find(query, {"prices": 1, "current_price": 1, "location_ids": 1})
+            documents = await cursor.sort("_id", ASCENDING).limit(batch_size).to_list(length=batch_size)
+            if not documents:
+                break
+            last_id = documents[-1]["_id"]
+            writes, updates = [], []
+            for document in documents:
+                prices = document.get("prices") or []
+                for position, price in enumerate(prices):
+                    record = {
+                        **price,
+                        "_id": price.get("id") or f"{document['_id']}:{position}",
+                        "property_id": document["_id"],
+                        "location_ids": document.get("location_ids") or [],
+                    }
+                    record.pop("id", None)
+                    writes.append(ReplaceOne({"_id": record["_id"]}, record, upsert=True))
+                update = {"$unset": {"prices": ""}}
+                if not document.get("current_price") and prices:
+                    # Undated prices sort first, so a dated one wins when there is one.
+                    latest = max(prices, key=lambda price: (price.get("date_submitted") is not None, price.get("date_submitted") or 0))
+                    update["$set"] = {"current_price": latest}
+                updates.append(UpdateOne({"_id": document["_id"], "prices": document.get("prices")}, update))
+            if writes:
+                await history.bulk_write(writes, ordered=False)
+                records += len(writes)
+            result = await properties.bulk_write(updates, ordered=False)
+            migrated += result.modified_count
+            print(f"{migrated} properties migrated, {records} price records ({time.monotonic() - started:.1f}s)")
+        print(f"Done: {migrated} properties migrated, {records} price records written")
+    finally:
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(migrate_price_history(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
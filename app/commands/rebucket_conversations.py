@@ -0,0 +1,57 @@
+# app/commands/rebucket_conversations.py
+"""Move embedded conversation messages into `conversation_messages` buckets.
+
+Usage: python -m app.commands.rebucket_conversations [--batch-size 100] [--limit N]
+
+Conversations are streamed from a cursor in batches, so memory is bounded by
+one batch regardless of collection size. The command is safe to re-run: bucket
+writes are idempotent and already bucketed conversations are skipped.
+"""
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from app.database.collections import get_conversation_collection, get_conversation_message_collection
+from app.database.session import db_session
+from app.models.conversation_models.conversation import MessageStorage
+from app.repositories.conversation_repository import ConversationRepository
+
+
+async def rebucket_conversations(batch_size: int, limit: Optional[int] = None) -> None:
+    await db_session.connect()
+    try:
+        repository = ConversationRepository(
+            await get_conversation_collection(),
+            await get_conversation_message_collection(),
+            storage_mode=MessageStorage.BUCKETED,
+        )
+        cursor = repository.collection.find(
+            {"message_storage": {"$ne": MessageStorage.BUCKETED}}, batch_size=batch_size
+        )
+        if limit:
+            cursor = cursor.limit(limit)
+        migrated = skipped = 0
+        started = time.monotonic()
+        async for document in cursor:
+            if await repository.rebucket(document):
+                migrated += 1
+            else:
+                skipped += 1
+            if (migrated + skipped) % batch_size == 0:
+                print(f"{migrated} migrated, {skipped} changed during migration ({time.monotonic() - started:.1f}s)")
+        print(f"Done: {migrated} migrated, {skipped} changed during migration and left for the next run")
+    finally:
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many conversations")
+    args = parser.parse_args()
+    asyncio.run(rebucket_conversations(args.batch_size, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# app/commands/rebuild_location_prices.py
+"""Recompute every location's `average_price_m2` from the properties.
+
+Usage: python -m app.commands.rebuild_location_prices
+
+Property writes keep the averages current incrementally (see
+`app.repositories.location_rollup`); this rebuilds them from scratch, e.g.
+after bulk changes made outside the API or `migrate_price_history`. One
+aggregation over the active priced properties expands each property's
+locations to everything containing them with `$graphLookup`, groups the
+price per sqm by location and `$merge`s the sums, counts and averages into
+the locations collection, stamping them with the run's start time. Locations
+the run did not stamp have no priced properties left and are reset. Property
+writes made while it runs can be lost, so run it when imports are not.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.database import collections
+from app.database.session import db_session
+from app.repositories.invalidation_bus import create_invalidation_bus
+from app.repositories.location_rollup import PRICE_FIELD
+
+
+def rollup_pipeline(rebuilt_at: datetime):
+    return [
+        {"$match": {"is_active": True, PRICE_FIELD: {"$type": "number"}}},
+        {"$project": {"location_ids": 1, "value": f"${PRICE_FIELD}"}},
+        # Depth 0 matches the property's own locations, so they are included.
+        {"$graphLookup": {
+            "from": collections.LOCATIONS,
+            "startWith": "$location_ids",
+            "connectFromField": "parent_ids",
+            "connectToField": "_id",
+            "as": "enclosing",
+        }},
+        {"$unwind": "$enclosing"},
+        {"$group": {"_id": "$enclosing._id", "sum": {"$sum": "$value"}, "count": {"$sum": 1}}},
+        {"$merge": {
+            "into": collections.LOCATIONS,
+            "on": "_id",
+            "whenMatched": [{"$set": {
+                "price_rollup": {"sum": "$$new.sum", "count": "$$new.count", "rebuilt_at": rebuilt_at},
+                "average_price_m2": {"$divide": ["$$new.sum", "$$new.count"]},
+            }}],
+            "whenNotMatched": "discard",
+        }},
+    ]
+
+
+async def rebuild_location_prices() -> None:
+    await db_session.connect()
+    # Tells the API workers to drop their cached locations once the rebuild is done.
+    bus = create_invalidation_bus(
+        settings.CACHE_INVALIDATION_BACKEND, settings.REDIS_URL, settings.CACHE_INVALIDATION_CHANNEL
+    )
+    try:
+        properties = db_session.db[collections.PROPERTIES]
+        locations = db_session.db[collections.LOCATIONS]
+        started = time.monotonic()
+        now = datetime.now(timezone.utc)
+        # Truncated to milliseconds, as MongoDB stores it, so the stamp compares equal below.
+        rebuilt_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        await properties.aggregate(rollup_pipeline(rebuilt_at)).to_list(length=None)
+        priced = await locations.count_documents({"price_rollup.rebuilt_at": rebuilt_at})
+        reset = await locations.update_many(
+            {"price_rollup.rebuilt_at": {"$ne": rebuilt_at}},
+            {"$set": {"price_rollup": {"sum": 0, "count": 0, "rebuilt_at": rebuilt_at}, "average_price_m2": None}},
+        )
+        await bus.publish_many(collections.LOCATIONS, await locations.distinct("_id"))
+        print(
+            f"Done in {time.monotonic() - started:.1f}s: {priced} locations priced, "
+            f"{reset.modified_count} reset"
+        )
+    finally:
+        await bus.stop()
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    asyncio.run(rebuild_location_prices())
+
+
+if __name__ == "__main__":
+    main()
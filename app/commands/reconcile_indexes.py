@@ -0,0 +1,34 @@
+# app/commands/reconcile_indexes.py
+"""Rebuild indexes that differ from their repository declarations.
+
+Usage: python -m app.commands.reconcile_indexes
+
+API workers only create missing indexes at startup and log the ones that
+have drifted. This drops and recreates those, so run it once per deploy, not
+from every worker. While an index is rebuilt the collection is without it;
+for a unique index that means duplicates can get in until it is back.
+"""
+import argparse
+import asyncio
+
+from app.container import Container
+from app.database.session import db_session
+from app.repositories.index_registry import ensure_indexes
+
+
+async def reconcile_indexes() -> None:
+    await db_session.connect()
+    try:
+        await ensure_indexes(Container(db_session.db).repositories, rebuild=True)
+    finally:
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    asyncio.run(reconcile_indexes())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# app/commands/verify_indexes.py
+"""Explain every declared repository query and fail if any of them scans a whole collection.
+
+Usage: python -m app.commands.verify_indexes [--ensure]
+
+Each repository lists its queries, finds and aggregations, in `query_shapes`;
+this runs explain() on each one and reports the winning plan's stages. The
+exit status is 1 when a COLLSCAN is found, so the command can gate deployments.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.container import Container
+from app.database.indexes import plan_stages, winning_plan
+from app.database.session import db_session
+from app.repositories.index_registry import ensure_indexes
+
+
+async def verify_indexes(ensure: bool) -> bool:
+    await db_session.connect()
+    try:
+        repositories = Container(db_session.db).repositories
+        if ensure:
+            await ensure_indexes(repositories)
+        ok = True
+        for repository in repositories:
+            for shape in repository.query_shapes:
+                collection = getattr(repository, shape.collection)
+                if shape.pipeline is not None:
+                    explanation = await collection.database.command(
+                        "aggregate", collection.name, pipeline=shape.pipeline, explain=True
+                    )
+                else:
+                    cursor = collection.find(shape.filter)
+                    if shape.sort:
+                        cursor = cursor.sort(shape.sort)
+                    explanation = await cursor.explain()
+                stages = list(plan_stages(winning_plan(explanation)))
+                scans = "COLLSCAN" in stages
+                ok = ok and not scans
+                status = "FAIL" if scans else "ok"
+                print(f"{status:4}  {type(repository).__name__}.{shape.name}: {' <- '.join(stages)}")
+        return ok
+    finally:
+        await db_session.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ensure", action="store_true", help="Create missing declared indexes before explaining")
+    args = parser.parse_args()
+    if not asyncio.run(verify_indexes(args.ensure)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
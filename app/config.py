@@ -8,8 +8,38 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Shared outbound HTTP client (Google sign-in)
+    HTTP_TIMEOUT_SECONDS: float = 10
+    HTTP_MAX_CONNECTIONS: int = 20
+
+    # List endpoints
+    DEFAULT_PAGE_SIZE: int = 10
+    MAX_PAGE_SIZE: int = 100
+    # Ids accepted by one GET /{entity}/batch request, and per query of a BatchLoader
+    BATCH_MAX_IDS: int = 100
+    # Items accepted by one bulk create/update/status request
+    BULK_MAX_ITEMS: int = 1000
+    # (price, plan) pairs accepted by one /payment-plans/schedule/batch request
+    SCHEDULE_BATCH_MAX_ITEMS: int = 10000
+
+    # Serve get-by-id reads straight from the stored document, skipping model and
+    # response validation; only safe while every write goes through the repositories.
+    TRUSTED_READS: bool = False
+
+    # Repository entity cache
+    CACHE_EXPIRATION: int = 300
+    CACHE_NEGATIVE_EXPIRATION: int = 30
+    CACHE_MAX_ENTRIES: int = 10000
+    # "local" for a single worker, "redis" to keep caches coherent across workers
+    CACHE_INVALIDATION_BACKEND: str = "local"
+    CACHE_INVALIDATION_CHANNEL: str = "cache-invalidation"
+    REDIS_URL: str = "redis://localhost:6379"
+    # Resolved access tokens kept per worker; each entry expires with its token
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
     class Config:
         env_file = ".env"
+        extra = "ignore"
 
 
 settings = Settings()
\ No newline at end of file
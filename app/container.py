@@ -0,0 +1,156 @@
+# app/container.py
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Union
+
+import httpx
+
+from app.config import settings
+from app.controllers.auth_controller import AuthController
+from app.controllers.conversation_controller import ConversationController
+from app.controllers.developer_controller import DeveloperController
+from app.controllers.location_controller import LocationController
+from app.controllers.payment_plan_controller import PaymentPlanController
+from app.controllers.project_controller import ProjectController
+from app.controllers.property_controller import PropertyController
+from app.controllers.user_controller import UserController
+from app.database import collections
+from app.repositories.base_repository import BaseRepository
+from app.repositories.conversation_repository import ConversationRepository
+from app.repositories.developer_repository import DeveloperRepository
+from app.repositories.entity_cache import EntityCache
+from app.repositories.invalidation_bus import InProcessInvalidationBus, InvalidationBus
+from app.repositories.location_repository import LocationRepository
+from app.repositories.location_rollup import LocationPriceRollup
+from app.repositories.location_tree import LocationTree
+from app.repositories.price_history_repository import PriceHistoryRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.property_repository import PropertyRepository
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import AuthService
+from app.services.conversation_service import ConversationService
+from app.services.developer_service import DeveloperService
+from app.services.google_auth import GoogleTokenVerifier, create_http_client
+from app.services.location_service import LocationService
+from app.services.payment_plan_service import PaymentPlanService
+from app.services.principal_cache import PrincipalCache
+from app.services.project_service import ProjectService
+from app.services.property_service import PropertyService
+from app.services.user_service import UserService
+
+
+class Container:
+    """The repository -> service -> controller graph, built once per worker.
+
+    Created in the application lifespan and stored on `app.state.container`;
+    the router dependencies only look objects up on it. Any attribute can be
+    replaced for a test with `override`, or a whole container can be built
+    around a fake database.
+
+    Repository writes are published on the invalidation bus; the container
+    applies them to the cache of whichever repository owns that collection.
+    """
+
+    def __init__(self, db, invalidation_bus: Optional[InvalidationBus] = None, http_client: Optional[httpx.AsyncClient] = None):
+        # Users are read on every authenticated request (see PrincipalCache).
+        self.user_repository = UserRepository(db[collections.USERS], self._cache(collections.USERS))
+        self.principal_cache = PrincipalCache(max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES)
+        self.property_repository = PropertyRepository(db[collections.PROPERTIES])
+        self.price_history_repository = PriceHistoryRepository(db[collections.PRICE_HISTORY])
+        # Near-static entities read from every listing page are cached per worker.
+        self.project_repository = ProjectRepository(db[collections.PROJECTS], self._cache(collections.PROJECTS))
+        self.location_repository = LocationRepository(db[collections.LOCATIONS], self._cache(collections.LOCATIONS))
+        self.location_tree = LocationTree(db[collections.LOCATIONS])
+        self.property_repository.rollup = LocationPriceRollup(self.location_repository, self.location_tree)
+        self.property_repository.price_history = self.price_history_repository
+        self.developer_repository = DeveloperRepository(db[collections.DEVELOPERS], self._cache(collections.DEVELOPERS))
+        self.conversation_repository = ConversationRepository(
+            db[collections.CONVERSATIONS], db[collections.CONVERSATION_MESSAGES]
+        )
+
+        self.invalidation_bus = invalidation_bus or InProcessInvalidationBus()
+        for repository in self.repositories:
+            repository.invalidation_bus = self.invalidation_bus
+        self.invalidation_bus.subscribe(self._apply_invalidation)
+        self.invalidation_bus.subscribe_reset(self._clear_caches)
+
+        self.user_service = UserService(self.user_repository)
+        # One pooled client for every outbound call; the lifespan owns and closes it.
+        self.http_client = http_client or create_http_client()
+        self.google_token_verifier = GoogleTokenVerifier(self.http_client)
+        self.auth_service = AuthService(self.user_service, self.google_token_verifier, self.principal_cache)
+        self.property_service = PropertyService(
+            self.property_repository,
+            self.location_tree,
+            self.price_history_repository,
+            self.location_repository,
+            self.project_repository,
+            self.developer_repository,
+        )
+        self.project_service = ProjectService(self.project_repository)
+        self.location_service = LocationService(
+            self.location_repository, self.location_tree, self.price_history_repository
+        )
+        self.developer_service = DeveloperService(self.developer_repository)
+        self.conversation_service = ConversationService(self.conversation_repository)
+        self.payment_plan_service = PaymentPlanService()
+
+        self.user_controller = UserController(self.user_service)
+        self.auth_controller = AuthController(self.auth_service)
+        self.property_controller = PropertyController(self.property_service)
+        self.project_controller = ProjectController(self.project_service)
+        self.location_controller = LocationController(self.location_service)
+        self.developer_controller = DeveloperController(self.developer_service)
+        self.conversation_controller = ConversationController(self.conversation_service)
+        self.payment_plan_controller = PaymentPlanController(self.payment_plan_service)
+
+    @staticmethod
+    def _cache(name: str) -> EntityCache:
+        return EntityCache(
+            name,
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.CACHE_EXPIRATION,
+            negative_ttl_seconds=settings.CACHE_NEGATIVE_EXPIRATION,
+        )
+
+    async def _apply_invalidation(self, collection: str, document_id: Any) -> None:
+        for repository in self.repositories:
+            if repository.cache is not None and repository.collection.name == collection:
+                repository.cache.invalidate(document_id)
+        if collection == collections.LOCATIONS:
+            await self.location_tree.refresh(document_id)
+        elif collection == collections.USERS:
+            self.principal_cache.invalidate_user(document_id)
+
+    async def _clear_caches(self) -> None:
+        for cache in self.caches:
+            cache.clear()
+        await self.location_tree.load()
+
+    @property
+    def caches(self) -> List[Union[EntityCache, PrincipalCache]]:
+        caches = [repository.cache for repository in self.repositories if repository.cache is not None]
+        return caches + [self.principal_cache]
+
+    @property
+    def repositories(self) -> List[BaseRepository]:
+        return [
+            self.user_repository,
+            self.property_repository,
+            self.price_history_repository,
+            self.project_repository,
+            self.location_repository,
+            self.developer_repository,
+            self.conversation_repository,
+        ]
+
+    @contextmanager
+    def override(self, **replacements: Any) -> Iterator["Container"]:
+        """Temporarily replace container attributes, e.g. `override(user_controller=fake)`."""
+        originals = {name: getattr(self, name) for name in replacements}
+        for name, value in replacements.items():
+            setattr(self, name, value)
+        try:
+            yield self
+        finally:
+            for name, value in originals.items():
+                setattr(self, name, value)
@@ -14,9 +14,9 @@ class AuthController:
 
             # Check if user exists or create new user
             email = user_data.get("email")
-            existing_users = await self.auth_service.user_service.get_users_by_email(email)
+            existing_user = await self.auth_service.user_service.get_user_by_email(email)
 
-            if not existing_users:
+            if existing_user is None:
                 # Create new user
                 new_user = User(
                     email=Email(address=email, is_verified=True),
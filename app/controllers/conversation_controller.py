@@ -1,7 +1,9 @@
 from typing import Optional, List
 
-from app.models.conversation_models.conversation import Conversation
-from app.schemas.conversation import ConversationCreate, ConversationUpdate
+from app.models.conversation_models.conversation import Conversation, ConversationStatus, Message, Response
+from app.schemas.batch import Batch
+from app.schemas.conversation import ConversationCreate, ConversationSummary, ConversationUpdate, MessagePage
+from app.schemas.pagination import Page, TotalCount
 from app.services.conversation_service import ConversationService
 
 
@@ -13,11 +15,40 @@ class ConversationController:
         conversation = Conversation(**conversation_data.dict())
         return await self.service.create_conversation(conversation)
 
+    async def get_conversation_json(self, conversation_id: str) -> Optional[bytes]:
+        return await self.service.get_conversation_json(conversation_id)
+
     async def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
         return await self.service.get_conversation_by_id(conversation_id)
 
-    async def get_conversations_by_user(self, user_id: str) -> List[Conversation]:
-        return await self.service.get_conversations_by_user_id(user_id)
+    async def get_conversations_by_ids(self, conversation_ids: List[str]) -> Batch[Conversation]:
+        return await self.service.get_conversations_by_ids(conversation_ids)
+
+    async def add_message(self, conversation_id: str, message: Message) -> Optional[Message]:
+        return await self.service.add_message(conversation_id, message)
+
+    async def add_response(self, conversation_id: str, response: Response) -> Optional[Message]:
+        return await self.service.add_response(conversation_id, response)
+
+    async def get_conversation_history(
+        self, conversation_id: str, limit: int, offset: int, before: Optional[int]
+    ) -> Optional[MessagePage]:
+        return await self.service.get_conversation_history(conversation_id, limit, offset, before)
+
+    async def get_conversations_by_user(
+        self,
+        user_id: str,
+        status: Optional[ConversationStatus],
+        limit: int,
+        cursor: Optional[str] = None,
+        total: TotalCount = TotalCount.NONE,
+    ) -> Page[ConversationSummary]:
+        return await self.service.get_conversation_summaries(user_id, status, limit, cursor, total)
+
+    async def get_conversations_by_status(
+        self, status: ConversationStatus, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE
+    ) -> Page[ConversationSummary]:
+        return await self.service.get_conversation_summaries(None, status, limit, cursor, total)
 
     async def update_conversation(self, conversation_id: str, conversation_update: ConversationUpdate) -> Optional[Conversation]:
         conversation = await self.service.get_conversation_by_id(conversation_id)
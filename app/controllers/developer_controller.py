@@ -1,7 +1,10 @@
 # app/controllers/developer_controller.py
-from typing import List
+from typing import AsyncIterator, List, Optional
 from app.services.developer_service import DeveloperService
 from app.models.developer_models.developer import Developer
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.pagination import Page, TotalCount
 
 
 class DeveloperController:
@@ -11,14 +14,26 @@ class DeveloperController:
     async def create_developer(self, developer: Developer) -> Developer:
         return await self.developer_service.create_developer(developer)
 
-    async def get_developer_by_id(self, developer_id: str) -> Developer:
-        return await self.developer_service.get_developer_by_id(developer_id)
+    async def get_developer_json(self, developer_id: str) -> Optional[bytes]:
+        return await self.developer_service.get_developer_json(developer_id)
 
-    async def get_all_developers(self) -> List[Developer]:
-        return await self.developer_service.get_all_developers()
+    async def get_developer_by_id(self, developer_id: str, fields: Optional[FieldSet] = None) -> Developer:
+        return await self.developer_service.get_developer_by_id(developer_id, fields)
+
+    async def get_developers_by_ids(self, developer_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Developer]:
+        return await self.developer_service.get_developers_by_ids(developer_ids, fields)
+
+    async def get_all_developers(
+        self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Developer]:
+        return await self.developer_service.get_all_developers(limit, cursor, total, fields)
 
     async def update_developer(self, developer: Developer) -> Developer:
         return await self.developer_service.update_developer(developer)
 
     async def delete_developer(self, developer_id: str) -> None:
         await self.developer_service.delete_developer(developer_id)
+
+    def export_developers(self, after: Optional[str] = None) -> AsyncIterator[Developer]:
+        return self.developer_service.export_developers(after)
@@ -1,7 +1,14 @@
 # src/controllers/location_controller.py
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from app.services.location_service import LocationService
+from app.models.location_models.geo_point import GeoPoint
 from app.models.location_models.location import Location, LocationType
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page, TotalCount
+from app.schemas.price import PriceTrend, TrendInterval
 
 
 class LocationController:
@@ -11,18 +18,53 @@ class LocationController:
     async def create_location(self, location: Location) -> Location:
         return await self.location_service.create_location(location)
 
-    async def get_location_by_id(self, location_id: str) -> Location:
-        return await self.location_service.get_location_by_id(location_id)
+    async def get_location_json(self, location_id: str) -> Optional[bytes]:
+        return await self.location_service.get_location_json(location_id)
 
-    async def get_locations_by_type(self, location_type: LocationType) -> List[Location]:
-        return await self.location_service.get_locations_by_type(location_type)
+    async def get_location_by_id(self, location_id: str, fields: Optional[FieldSet] = None) -> Location:
+        return await self.location_service.get_location_by_id(location_id, fields)
+
+    async def get_locations_by_ids(self, location_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Location]:
+        return await self.location_service.get_locations_by_ids(location_ids, fields)
+
+    async def get_locations_by_type(
+        self, location_type: LocationType, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Location]:
+        return await self.location_service.get_locations_by_type(location_type, limit, cursor, total, fields)
 
     async def get_direct_children(self, location_id: str) -> List[Location]:
         return await self.location_service.get_direct_children(location_id)
 
-    async def get_direct_parents(self, location_id: str) -> List[Location]:
+    async def get_direct_parents(self, location_id: str) -> Optional[List[Location]]:
         return await self.location_service.get_direct_parents(location_id)
 
+    async def get_ancestors(self, location_id: str) -> Optional[List[Location]]:
+        return await self.location_service.get_ancestors(location_id)
+
+    async def get_descendants(self, location_id: str) -> Optional[List[Location]]:
+        return await self.location_service.get_descendants(location_id)
+
+    async def get_locations_near(
+        self,
+        point: GeoPoint,
+        max_distance_m: float,
+        location_types: Optional[List[LocationType]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> NearbyPage[Location]:
+        return await self.location_service.get_locations_near(point, max_distance_m, location_types, limit, cursor)
+
+    async def get_price_trend(
+        self,
+        location_id: str,
+        interval: TrendInterval,
+        currency: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> PriceTrend:
+        return await self.location_service.get_price_trend(location_id, interval, currency, start, end)
+
     async def update_location(self, location: Location) -> Location:
         return await self.location_service.update_location(location)
 
@@ -0,0 +1,16 @@
+# app/controllers/payment_plan_controller.py
+from decimal import Decimal
+from app.models.property_models.payment_plan import PaymentPlan
+from app.schemas.payment_plan import PaymentSchedule, ScheduleBatchRequest, ScheduleBatchResult
+from app.services.payment_plan_service import PaymentPlanService
+
+
+class PaymentPlanController:
+    def __init__(self, payment_plan_service: PaymentPlanService):
+        self.payment_plan_service = payment_plan_service
+
+    def schedule(self, price: Decimal, plan: PaymentPlan) -> PaymentSchedule:
+        return self.payment_plan_service.schedule(price, plan)
+
+    def schedule_batch(self, request: ScheduleBatchRequest) -> ScheduleBatchResult:
+        return self.payment_plan_service.schedule_batch(request)
@@ -1,7 +1,11 @@
 # app/controllers/project_controller.py
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional
 from app.services.project_service import ProjectService
-from app.models.developer_models.project import Project
+from app.models.developer_models.project import Project, ProjectStatus
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.bulk import BulkResult
+from app.schemas.pagination import Page, TotalCount
 
 
 class ProjectController:
@@ -11,14 +15,37 @@ class ProjectController:
     async def create_project(self, project: Project) -> Project:
         return await self.project_service.create_project(project)
 
-    async def get_project_by_id(self, project_id: str) -> Project:
-        return await self.project_service.get_project_by_id(project_id)
+    async def get_project_json(self, project_id: str) -> Optional[bytes]:
+        return await self.project_service.get_project_json(project_id)
 
-    async def get_all_projects(self) -> List[Project]:
-        return await self.project_service.get_all_projects()
+    async def get_project_by_id(self, project_id: str, fields: Optional[FieldSet] = None) -> Project:
+        return await self.project_service.get_project_by_id(project_id, fields)
+
+    async def get_projects_by_ids(self, project_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Project]:
+        return await self.project_service.get_projects_by_ids(project_ids, fields)
+
+    async def get_all_projects(
+        self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Project]:
+        return await self.project_service.get_all_projects(limit, cursor, total, fields)
 
     async def update_project(self, project: Project) -> Project:
         return await self.project_service.update_project(project)
 
+    async def create_projects(self, items: List[Dict[str, Any]]) -> BulkResult:
+        return await self.project_service.create_projects(items)
+
+    async def update_projects(self, items: List[Dict[str, Any]]) -> BulkResult:
+        return await self.project_service.update_projects(items)
+
+    async def set_projects_status(self, project_ids: List[str], status: ProjectStatus) -> BulkResult:
+        return await self.project_service.set_projects_status(project_ids, status)
+
     async def delete_project(self, project_id: str) -> None:
         await self.project_service.delete_project(project_id)
+
+    def export_projects(
+        self, developer_id: Optional[str] = None, status: Optional[ProjectStatus] = None, after: Optional[str] = None
+    ) -> AsyncIterator[Project]:
+        return self.project_service.export_projects(developer_id, status, after)
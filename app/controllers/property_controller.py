@@ -1,7 +1,20 @@
 # app/controllers/property_controller.py
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
 from app.services.property_service import PropertyService
-from app.models.property_models.property import Property
+from app.models.location_models.geo_point import GeoPoint
+from app.models.property_models.price import Price
+from app.models.property_models.price_record import PriceRecord
+from app.models.property_models.property import Property, PropertyType
+from app.repositories.batch_loader import Loaders
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.bulk import BulkResult
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page, TotalCount
+from app.schemas.price import PriceTrend, TrendInterval
+from app.schemas.property import PropertyDetail, PropertySearchRequest, PropertySearchResult
+from app.services.server_timing import ServerTiming
 
 
 class PropertyController:
@@ -11,14 +24,74 @@ class PropertyController:
     async def create_property(self, property: Property) -> Property:
         return await self.property_service.create_property(property)
 
-    async def get_property_by_id(self, property_id: str) -> Property:
-        return await self.property_service.get_property_by_id(property_id)
+    async def get_property_json(self, property_id: str) -> Optional[bytes]:
+        return await self.property_service.get_property_json(property_id)
 
-    async def get_all_properties(self) -> List[str]:
-        return await self.property_service.get_all_property_ids()
+    async def get_property_by_id(self, property_id: str, fields: Optional[FieldSet] = None) -> Property:
+        return await self.property_service.get_property_by_id(property_id, fields)
+
+    async def get_properties_by_ids(self, property_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Property]:
+        return await self.property_service.get_properties_by_ids(property_ids, fields)
+
+    async def get_property_detail(
+        self, property_id: str, loaders: Loaders, timing: ServerTiming
+    ) -> Optional[PropertyDetail]:
+        return await self.property_service.get_property_detail(property_id, loaders, timing)
+
+    async def get_all_properties(self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE) -> Page[str]:
+        return await self.property_service.get_all_property_ids(limit, cursor, total)
+
+    async def search_properties(self, request: PropertySearchRequest) -> PropertySearchResult:
+        return await self.property_service.search_properties(request)
+
+    async def get_properties_near(
+        self,
+        point: GeoPoint,
+        max_distance_m: float,
+        property_types: Optional[List[PropertyType]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> NearbyPage[Property]:
+        return await self.property_service.get_properties_near(point, max_distance_m, property_types, limit, cursor)
+
+    async def submit_price(self, property_id: str, price: Price) -> Optional[PriceRecord]:
+        return await self.property_service.submit_price(property_id, price)
+
+    async def get_price_history(
+        self, property_id: str, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE
+    ) -> Page[PriceRecord]:
+        return await self.property_service.get_price_history(property_id, limit, cursor, total)
+
+    async def get_price_trend(
+        self,
+        property_id: str,
+        interval: TrendInterval,
+        currency: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> PriceTrend:
+        return await self.property_service.get_price_trend(property_id, interval, currency, start, end)
 
     async def update_property(self, property: Property) -> Property:
         return await self.property_service.update_property(property)
 
+    async def create_properties(self, items: List[Dict[str, Any]]) -> BulkResult:
+        return await self.property_service.create_properties(items)
+
+    async def update_properties(self, items: List[Dict[str, Any]]) -> BulkResult:
+        return await self.property_service.update_properties(items)
+
+    async def set_properties_active(self, property_ids: List[str], is_active: bool) -> BulkResult:
+        return await self.property_service.set_properties_active(property_ids, is_active)
+
     async def delete_property(self, property_id: str) -> None:
         await self.property_service.delete_property(property_id)
+
+    def export_properties(
+        self,
+        is_active: Optional[bool] = None,
+        property_types: Optional[List[PropertyType]] = None,
+        location_id: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> AsyncIterator[Property]:
+        return self.property_service.export_properties(is_active, property_types, location_id, after)
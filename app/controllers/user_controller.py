@@ -1,7 +1,10 @@
 # src/controllers/user_controller.py
-from typing import List
+from typing import AsyncIterator, List, Optional
 from app.services.user_service import UserService
-from app.models.user_models.user import User
+from app.models.user_models.user import User, UserRole
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.pagination import Page, TotalCount
 
 
 class UserController:
@@ -11,14 +14,26 @@ class UserController:
     async def create_user(self, user: User) -> User:
         return await self.user_service.create_user(user)
 
-    async def get_user_by_id(self, user_id: str) -> User:
-        return await self.user_service.get_user_by_id(user_id)
+    async def get_user_json(self, user_id: str) -> Optional[bytes]:
+        return await self.user_service.get_user_json(user_id)
 
-    async def get_users_by_role(self, role: str, skip: int, limit: int) -> List[User]:
-        return await self.user_service.get_users_by_role(role, skip, limit)
+    async def get_user_by_id(self, user_id: str, fields: Optional[FieldSet] = None) -> User:
+        return await self.user_service.get_user_by_id(user_id, fields)
+
+    async def get_users_by_ids(self, user_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[User]:
+        return await self.user_service.get_users_by_ids(user_ids, fields)
+
+    async def get_users_by_role(
+        self, role: str, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[User]:
+        return await self.user_service.get_users_by_role(role, limit, cursor, total, fields)
 
     async def update_user(self, user: User) -> User:
         return await self.user_service.update_user(user)
 
     async def delete_user(self, user_id: str) -> None:
         await self.user_service.delete_user(user_id)
+
+    def export_users(self, role: Optional[UserRole] = None, after: Optional[str] = None) -> AsyncIterator[User]:
+        return self.user_service.export_users(role, after)
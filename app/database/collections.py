@@ -1,20 +1,35 @@
 # src/database/collections.py
 from app.database.session import db_session
 
+USERS = "users"
+PROPERTIES = "properties"
+PROJECTS = "projects"
+LOCATIONS = "locations"
+DEVELOPERS = "developers"
+CONVERSATIONS = "conversations"
+CONVERSATION_MESSAGES = "conversation_messages"
+PRICE_HISTORY = "price_history"
+
 async def get_user_collection():
-    return db_session.db["users"]
+    return db_session.db[USERS]
 
 async def get_property_collection():
-    return db_session.db["properties"]
+    return db_session.db[PROPERTIES]
 
 async def get_project_collection():
-    return db_session.db["projects"]
+    return db_session.db[PROJECTS]
 
 async def get_location_collection():
-    return db_session.db["locations"]
+    return db_session.db[LOCATIONS]
 
 async def get_developer_collection():
-    return db_session.db["developers"]
+    return db_session.db[DEVELOPERS]
 
 async def get_conversation_collection():
-    return db_session.db["conversations"]
\ No newline at end of file
+    return db_session.db[CONVERSATIONS]
+
+async def get_conversation_message_collection():
+    return db_session.db[CONVERSATION_MESSAGES]
+
+async def get_price_history_collection():
+    return db_session.db[PRICE_HISTORY]
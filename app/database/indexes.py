@@ -0,0 +1,88 @@
+# app/database/indexes.py
+import logging
+from typing import Any, Dict, Iterator, List
+
+from pymongo import IndexModel
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+INDEX_NOT_FOUND = 27
+
+# Index options compared when deciding whether an existing index matches its declaration.
+COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "collation")
+
+
+def _differs(existing: Dict[str, Any], declared: Dict[str, Any]) -> List[str]:
+    """Return the names of the properties in which an existing index differs from its declaration."""
+    differences = []
+    if list(existing["key"]) != list(declared["key"].items()):
+        differences.append("key")
+    for option in COMPARED_OPTIONS:
+        if existing.get(option) != declared.get(option):
+            differences.append(option)
+    return differences
+
+
+async def reconcile_indexes(collection: Collection, indexes: List[IndexModel], rebuild: bool = False) -> None:
+    """Bring the declared indexes of a collection in line with their declarations.
+
+    Missing indexes are created in one `create_indexes` call, which is safe for
+    every worker to run at startup. An index that differs from its declaration
+    is only logged unless `rebuild` is set: dropping it would leave the
+    collection without it (and without its uniqueness) until it is recreated,
+    so that is left to `app.commands.reconcile_indexes`, run once per deploy.
+    A TTL-only change is applied in place with `collMod` either way. Indexes
+    that are not declared are left alone.
+    """
+    if not indexes:
+        return
+    existing = await collection.index_information()
+    to_create = []
+    for index in indexes:
+        declared = index.document
+        current = existing.get(declared["name"])
+        if current is None:
+            to_create.append(index)
+            continue
+        differences = _differs(current, declared)
+        if differences == ["expireAfterSeconds"] and "expireAfterSeconds" in declared:
+            await collection.database.command({
+                "collMod": collection.name,
+                "index": {"name": declared["name"], "expireAfterSeconds": declared["expireAfterSeconds"]},
+            })
+        elif differences and rebuild:
+            try:
+                await collection.drop_index(declared["name"])
+            except OperationFailure as e:
+                if e.code != INDEX_NOT_FOUND:
+                    raise
+            to_create.append(index)
+        elif differences:
+            logger.warning(
+                "Index %s.%s differs from its declaration in %s; run app.commands.reconcile_indexes to rebuild it",
+                collection.name, declared["name"], ", ".join(differences),
+            )
+    if to_create:
+        await collection.create_indexes(to_create)
+
+
+def winning_plan(explanation: Dict[str, Any]) -> Dict[str, Any]:
+    """The winning plan of a find or aggregate explain(), wherever the aggregation put it."""
+    planner = explanation.get("queryPlanner")
+    if planner is None:
+        # Stages that are not pushed down into the query leave it under the leading $cursor.
+        planner = explanation["stages"][0]["$cursor"]["queryPlanner"]
+    return planner["winningPlan"]
+
+
+def plan_stages(plan: Dict[str, Any]) -> Iterator[str]:
+    """Yield every stage name in an explain() plan tree."""
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan", "outerStage", "innerStage"):
+        if isinstance(plan.get(key), dict):
+            yield from plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from plan_stages(child)
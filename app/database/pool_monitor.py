@@ -0,0 +1,119 @@
+# app/database/pool_monitor.py
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from pymongo import monitoring
+
+from app.schemas.admin import ConnectionPoolStats
+
+
+class _PoolCounters:
+    def __init__(self, sample_size: int):
+        self.open = 0
+        self.in_use = 0
+        self.checkouts = 0
+        self.failed_checkouts = 0
+        self.cleared = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.recent_waits_ms: Deque[float] = deque(maxlen=sample_size)
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool listener keeping per-server pool size, usage and checkout wait times.
+
+    PyMongo calls the listener from its own threads (Motor runs pymongo in a
+    thread pool), so all counters are guarded by a lock.
+    """
+
+    def __init__(self, sample_size: int = 1000):
+        self._sample_size = sample_size
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _PoolCounters] = {}
+        self._checkout_started = threading.local()
+
+    def _pool(self, address) -> _PoolCounters:
+        key = f"{address[0]}:{address[1]}"
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _PoolCounters(self._sample_size)
+        return pool
+
+    def _wait_ms(self, event) -> Optional[float]:
+        # `duration` is reported by PyMongo 4.7+; older versions fall back to a per-thread timer.
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            return duration * 1000
+        started = getattr(self._checkout_started, "value", None)
+        return (time.perf_counter() - started) * 1000 if started is not None else None
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pool(event.address).cleared += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address).open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.open = max(pool.open - 1, 0)
+
+    def connection_check_out_started(self, event):
+        self._checkout_started.value = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._pool(event.address).failed_checkouts += 1
+
+    def connection_checked_out(self, event):
+        wait_ms = self._wait_ms(event)
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use += 1
+            pool.checkouts += 1
+            if wait_ms is not None:
+                pool.wait_total_ms += wait_ms
+                pool.wait_max_ms = max(pool.wait_max_ms, wait_ms)
+                pool.recent_waits_ms.append(wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.in_use = max(pool.in_use - 1, 0)
+
+    def stats(self) -> List[ConnectionPoolStats]:
+        with self._lock:
+            snapshot = []
+            for address, pool in self._pools.items():
+                waits = sorted(pool.recent_waits_ms)
+                snapshot.append(ConnectionPoolStats(
+                    address=address,
+                    open_connections=pool.open,
+                    in_use=pool.in_use,
+                    available=max(pool.open - pool.in_use, 0),
+                    checkouts=pool.checkouts,
+                    failed_checkouts=pool.failed_checkouts,
+                    cleared=pool.cleared,
+                    wait_avg_ms=pool.wait_total_ms / pool.checkouts if pool.checkouts else 0.0,
+                    wait_p95_ms=waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    wait_max_ms=pool.wait_max_ms,
+                ))
+            return snapshot
@@ -1,35 +1,82 @@
 # src/database/session.py
+import asyncio
+import logging
+from decimal import Decimal
+from typing import Any, Optional
+
+from bson import Decimal128
+from bson.codec_options import TypeRegistry
 from motor.motor_asyncio import AsyncIOMotorClient
-from app.database.config import MONGO_URI, MONGO_DB_NAME
+from pymongo.errors import ConnectionFailure
+
+from app.database.config import DatabaseSettings, database_settings
+from app.database.pool_monitor import PoolMonitor
+from app.schemas.admin import DatabasePoolReport
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_decimal(value: Any) -> Any:
+    # Models hold Decimal (prices, payment plans); BSON stores Decimal128.
+    if isinstance(value, Decimal):
+        return Decimal128(value)
+    return value
+
 
 class DatabaseSession:
-    def __init__(self):
-        self.client = None
+    """The process-wide MongoDB client and its connection pool."""
+
+    def __init__(self, settings: DatabaseSettings = database_settings):
+        self.settings = settings
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.pool_monitor = PoolMonitor()
 
     async def connect(self):
-        """Initialize MongoDB connection."""
+        """Initialize MongoDB connection and pre-warm the pool."""
         try:
-            print(MONGO_URI)
-            self.client = AsyncIOMotorClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+            self.client = AsyncIOMotorClient(
+                self.settings.MONGODB_URI,
+                event_listeners=[self.pool_monitor],
+                type_registry=TypeRegistry(fallback_encoder=_encode_decimal),
+                **self.settings.client_options(),
+            )
             await self.client.server_info()
-            print(self.client)
-            print("Connected to MongoDB successfully!")
+            if self.settings.MONGODB_PREWARM_POOL:
+                await self.prewarm()
+            logger.info("Connected to MongoDB successfully!")
         except ConnectionFailure as e:
-            print(f"Failed to connect to MongoDB: {e}")
+            logger.error(f"Failed to connect to MongoDB: {e}")
             self.client = None
 
+    async def prewarm(self):
+        """Open `minPoolSize` connections now instead of on the first requests.
+
+        Concurrent pings each need their own connection, so the pool grows to
+        the minimum size before the application starts serving traffic.
+        """
+        await asyncio.gather(*(
+            self.client.admin.command("ping") for _ in range(self.settings.MONGODB_MIN_POOL_SIZE)
+        ))
+
     async def disconnect(self):
         """Close MongoDB connection."""
         if self.client:
             self.client.close()
-            print("Disconnected from MongoDB")
+            logger.info("Disconnected from MongoDB")
+
+    def pool_report(self) -> DatabasePoolReport:
+        return DatabasePoolReport(
+            min_pool_size=self.settings.MONGODB_MIN_POOL_SIZE,
+            max_pool_size=self.settings.MONGODB_MAX_POOL_SIZE,
+            pools=self.pool_monitor.stats(),
+        )
 
     @property
     def db(self):
         """Get the database instance."""
         if not self.client:
             raise Exception("Database client is not initialized")
-        return self.client[MONGO_DB_NAME]
+        return self.client[self.settings.DATABASE_NAME]
 
 
 # Global database session instance
@@ -1,13 +1,114 @@
 # app/dependencies.py
 
-from sqlalchemy.orm import Session
-from app.database.session import db_session
-from fastapi import Depends
+from datetime import datetime
+from typing import List, Optional
 
-def get_db() -> Session:
-    db = db_session
-    try:
-        yield db
-    finally:
-        db.close()
+from fastapi import Depends, HTTPException, Query, Request
+from fastapi.security import OAuth2PasswordBearer
+from pydantic import BaseModel
+from app.config import settings
+from app.container import Container
+from app.models.user_models.user import User, UserRole
+from app.repositories.batch_loader import Loaders
+from app.repositories.projection import FieldSet, InvalidFieldsError, parse_fields
+from app.schemas.pagination import TotalCount
+from app.schemas.price import TrendInterval
 
+
+def get_container(request: Request) -> Container:
+    """The worker's dependency container, created in the application lifespan."""
+    return request.app.state.container
+
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+
+async def current_user(request: Request, token: str = Depends(oauth2_scheme)) -> User:
+    """The authenticated user, for any route: `user: User = Depends(current_user)`.
+
+    Answers 401 when the bearer token is invalid, expired or its user is gone.
+    """
+    user = await get_container(request).auth_service.get_current_user(token)
+    if user is None:
+        raise HTTPException(
+            status_code=401, detail="Invalid authentication credentials", headers={"WWW-Authenticate": "Bearer"}
+        )
+    return user
+
+
+async def admin_user(user: User = Depends(current_user)) -> User:
+    """The authenticated user if they are an admin; answers 403 for anyone else."""
+    if user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
+
+
+class PageParams:
+    """Query parameters shared by the paginated list routes: `Depends()` it as `page: PageParams`."""
+
+    def __init__(
+        self,
+        limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        total: TotalCount = TotalCount.NONE,
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.total = total
+
+
+class TrendParams:
+    """Query parameters of the price trend routes: `Depends()` it as `trend: TrendParams`."""
+
+    def __init__(
+        self,
+        interval: TrendInterval = TrendInterval.MONTH,
+        currency: str = "EGP",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        self.interval = interval
+        self.currency = currency
+        self.start = start
+        self.end = end
+
+
+def batch_ids(
+    ids: str = Query(..., description=f"Comma separated ids, at most {settings.BATCH_MAX_IDS}"),
+) -> List[str]:
+    """The `ids=` query parameter of the multi-get routes, without blanks or repeats."""
+    unique = list(dict.fromkeys(part.strip() for part in ids.split(",") if part.strip()))
+    if not unique:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(unique) > settings.BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_IDS} ids per request")
+    return unique
+
+
+def get_loaders() -> Loaders:
+    """Batch loaders for the current request: `loaders(repository).load(id)`.
+
+    FastAPI resolves a dependency once per request, so every route dependency
+    and handler of a request shares the same loaders.
+    """
+    return Loaders(settings.BATCH_MAX_IDS)
+
+
+class SparseFields:
+    """The `fields=` query parameter for a model, e.g. `Depends(SparseFields(Project))`.
+
+    Resolves to the validated field paths, or None when the full model was asked for.
+    """
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+
+    def __call__(
+        self, fields: Optional[str] = Query(None, description="Comma separated field paths, e.g. id,basic_info.name")
+    ) -> Optional[FieldSet]:
+        if not fields:
+            return None
+        try:
+            return parse_fields(self.model, fields)
+        except InvalidFieldsError as e:
+            raise HTTPException(status_code=400, detail=str(e))
@@ -1,5 +1,11 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from app.config import settings
+from app.container import Container
 from app.database.session import db_session
+from app.repositories.index_registry import ensure_indexes
+from app.repositories.invalidation_bus import create_invalidation_bus
+from app.services.google_auth import create_http_client
 from app.routers import auth_router
 from app.routers.conversation_router import router as conversation_router
 from app.routers.user_router import router as user_router
@@ -7,26 +13,39 @@ from app.routers.property_router import router as property_router
 from app.routers.project_router import router as project_router
 from app.routers.developer_router import router as developer_router
 from app.routers.location_router import router as location_router
+from app.routers.payment_plan_router import router as payment_plan_router
+from app.routers.admin_router import router as admin_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await db_session.connect()
+    # Build repositories, services and controllers once per worker
+    invalidation_bus = create_invalidation_bus(
+        settings.CACHE_INVALIDATION_BACKEND, settings.REDIS_URL, settings.CACHE_INVALIDATION_CHANNEL
+    )
+    http_client = create_http_client()
+    app.state.container = Container(db_session.db, invalidation_bus, http_client)
+    await invalidation_bus.start()
+    await app.state.container.location_tree.load()
+    await ensure_indexes(app.state.container.repositories)
+    yield
+    await app.state.container.google_token_verifier.close()
+    await http_client.aclose()
+    await invalidation_bus.stop()
+    await db_session.disconnect()
+
 
 app = FastAPI(
     title="AI-Powered Real Estate Brokerage API",
     description="API for managing real estate listings with AI features",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
-# Include event handlers
-@app.on_event("startup")
-async def startup_event():
-    await db_session.connect()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await db_session.disconnect()
-
 
 
 
-app.include_router(user_router.router, prefix="/users", tags=["users"])
 app.include_router(auth_router.router, prefix="/auth", tags=["auth"])
 # Include routers
 app.include_router(user_router, prefix="/users", tags=["Users"])
@@ -34,8 +53,10 @@ app.include_router(property_router, prefix="/properties", tags=["Properties"])
 app.include_router(project_router, prefix="/projects", tags=["Projects"])
 app.include_router(developer_router, prefix="/developers", tags=["Developers"])
 app.include_router(location_router, prefix="/locations", tags=["Locations"])
+app.include_router(payment_plan_router, prefix="/payment-plans", tags=["Payment Plans"])
 
 app.include_router(conversation_router, prefix="/conversations", tags=["Conversations"])
+app.include_router(admin_router, prefix="/admin", tags=["Admin"])
 
 # Add endpoints
 @app.get("/")
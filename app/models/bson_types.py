@@ -0,0 +1,14 @@
+# app/models/bson_types.py
+from decimal import Decimal
+from typing import Annotated, Any
+
+from bson import Decimal128
+from pydantic import BeforeValidator
+
+
+def _from_decimal128(value: Any) -> Any:
+    return value.to_decimal() if isinstance(value, Decimal128) else value
+
+
+# A Decimal that also accepts the Decimal128 values MongoDB hands back.
+BsonDecimal = Annotated[Decimal, BeforeValidator(_from_decimal128)]
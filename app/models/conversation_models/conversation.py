@@ -17,6 +17,11 @@ class ConversationStatus(str, Enum):
     DELETED = "deleted"
 
 
+class MessageStorage(str, Enum):
+    EMBEDDED = "embedded"
+    BUCKETED = "bucketed"
+
+
 # Value Objects
 class Response(BaseModel):
     content: str
@@ -42,6 +47,9 @@ class Conversation(BaseModel):
     message_count: int = 0
     related_property_ids: List[str] = Field(default_factory=list)
     last_message_timestamp: datetime = Field(default_factory=datetime.now)
+    # Start of the last message, kept up to date by the repository for list views
+    last_message_preview: Optional[str] = None
+    message_storage: MessageStorage = MessageStorage.EMBEDDED
 
     def add_message(self, message: Message):
         """Add a message to the conversation."""
@@ -0,0 +1,17 @@
+# src/models/conversation_models/message_bucket.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.models.conversation_models.conversation import Message
+
+
+class MessageBucket(BaseModel):
+    """A fixed-size slice of a conversation's messages stored outside the conversation document."""
+    id: Optional[str] = Field(alias="_id")
+    conversation_id: str
+    bucket: int
+    count: int = 0
+    messages: List[Message] = Field(default_factory=list)
+
+    @staticmethod
+    def make_id(conversation_id: str, bucket: int) -> str:
+        return f"{conversation_id}:{bucket}"
@@ -79,6 +79,7 @@ class DetailedProjectInfo(BaseModel):
 # Project Entity
 class Project(BaseModel):
     id: Optional[str] = None  # MongoDB or UUID
+    external_id: Optional[str] = None  # Key in the developer's feed; imports upsert on it
     basic_info: BasicProjectInfo
     detailed_info: Optional[DetailedProjectInfo] = None
     backend_info: Optional[BackendProjectInfo] = None
@@ -0,0 +1,43 @@
+# app/models/location_models/geo_point.py
+from typing import Any, List, Literal
+
+from pydantic import BaseModel, field_validator, model_validator
+
+
+class GeoPoint(BaseModel):
+    """A GeoJSON point, stored as-is so it can be served by a 2dsphere index.
+
+    GeoJSON orders coordinates [longitude, latitude]. The legacy
+    `{"latitude": .., "longitude": ..}` shape is still accepted on input.
+    """
+    type: Literal["Point"] = "Point"
+    coordinates: List[float]
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_lat_lng(cls, value: Any) -> Any:
+        if isinstance(value, dict) and "latitude" in value and "longitude" in value:
+            return {"type": "Point", "coordinates": [value["longitude"], value["latitude"]]}
+        return value
+
+    @field_validator("coordinates")
+    @classmethod
+    def _check_coordinates(cls, coordinates: List[float]) -> List[float]:
+        if len(coordinates) != 2:
+            raise ValueError("A point has exactly two coordinates: [longitude, latitude]")
+        longitude, latitude = coordinates
+        if not -180 <= longitude <= 180 or not -90 <= latitude <= 90:
+            raise ValueError("Coordinates out of range; expected [longitude, latitude]")
+        return coordinates
+
+    @classmethod
+    def from_lat_lng(cls, latitude: float, longitude: float) -> "GeoPoint":
+        return cls(coordinates=[longitude, latitude])
+
+    @property
+    def longitude(self) -> float:
+        return self.coordinates[0]
+
+    @property
+    def latitude(self) -> float:
+        return self.coordinates[1]
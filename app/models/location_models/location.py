@@ -4,6 +4,8 @@ from enum import Enum
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+from app.models.location_models.geo_point import GeoPoint
+
 
 class LocationType(str, Enum):
     GOVERNORATE = "governorate"
@@ -16,16 +18,11 @@ class LocationType(str, Enum):
     OTHER = "other"
 
 
-class Coordinates(BaseModel):
-    latitude: float
-    longitude: float
-
-
 class Location(BaseModel):
     id: Optional[str] = None
     name: str
     location_type: LocationType
     parent_ids: List[str] = Field(default_factory=list)
-    coordinates: Optional[Coordinates] = None
+    coordinates: Optional[GeoPoint] = None
     average_price_m2: Optional[float] = None
     gallery_urls: List[str] = Field(default_factory=list)
@@ -2,7 +2,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from enum import Enum
-from decimal import Decimal
+from app.models.bson_types import BsonDecimal
 
 
 class InstallmentType(str, Enum):
@@ -15,7 +15,7 @@ class SpecialPayment(BaseModel):
     id: Optional[str] = None  # MongoDB or UUID
     name: str
     event_month: Optional[int] = None  # Month number of the payment
-    amount: Optional[Decimal] = None
+    amount: Optional[BsonDecimal] = None
     percentage: Optional[float] = None
     description: Optional[str] = None
 
@@ -26,10 +26,10 @@ class PaymentPlan(BaseModel):
     description: Optional[str] = None
     down_payment_percentage: Optional[float] = None
     installment_years: Optional[int] = None
-    installment_amount: Optional[Decimal] = None
+    installment_amount: Optional[BsonDecimal] = None
     installment_type: Optional[InstallmentType] = None
     special_payments: List[SpecialPayment] = Field(default_factory=list)
     interest_rate: Optional[float] = None
     discount_percentage: Optional[float] = None
-    discount_amount: Optional[Decimal] = None
+    discount_amount: Optional[BsonDecimal] = None
     is_active: bool = True
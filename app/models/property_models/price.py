@@ -2,13 +2,13 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
-from decimal import Decimal
+from app.models.bson_types import BsonDecimal
 from app.models.property_models.payment_plan import PaymentPlan
 
 
 class Price(BaseModel):
     id: Optional[str] = None  # MongoDB or UUID
-    amount: Decimal
+    amount: BsonDecimal
     currency: str = "EGP"
     price_per_sqm: Optional[float] = None
     payment_plans: List[PaymentPlan] = Field(default_factory=list)
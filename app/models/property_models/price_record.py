@@ -0,0 +1,10 @@
+# src/models/property_models/price_record.py
+from pydantic import Field
+from typing import List
+from app.models.property_models.price import Price
+
+
+class PriceRecord(Price):
+    """One submitted price of a property, kept in `price_history` instead of on the property."""
+    property_id: str
+    location_ids: List[str] = Field(default_factory=list)  # The property's locations when the price was submitted
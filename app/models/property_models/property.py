@@ -2,6 +2,7 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
+from app.models.location_models.geo_point import GeoPoint
 from app.models.property_models.price import Price
 from enum import Enum
 
@@ -26,9 +27,12 @@ class FinishingType(str, Enum):
 
 class Property(BaseModel):
     id: Optional[str] = None  # MongoDB or UUID
+    external_id: Optional[str] = None  # Key in the developer's feed; imports upsert on it
     title: str
     description: Optional[str] = None
+    project_id: Optional[str] = None  # Owning project, for units sold as part of one
     location_ids: List[str] = Field(default_factory=list)
+    coordinates: Optional[GeoPoint] = None
     property_type: PropertyType
     usage_type: UsageType
     area: Optional[float] = None
@@ -38,6 +42,6 @@ class Property(BaseModel):
     delivery_date: Optional[datetime] = None
     basic_images: List[str] = Field(default_factory=list)
     floor_plan_images: List[str] = Field(default_factory=list)
-    prices: List[Price] = Field(default_factory=list)  # List of price objects
+    # Latest submitted price; the full history is in `price_history` (see PriceHistoryRepository)
     current_price: Optional[Price] = None
     is_active: bool = True
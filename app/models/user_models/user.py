@@ -26,7 +26,7 @@ class Phone(BaseModel):
 
 
 class User(BaseModel):
-    id: Optional[str] = Field(alias="_id")  # MongoDB's primary key
+    id: Optional[str] = Field(default=None, alias="_id")  # MongoDB's primary key; assigned on save
     email: Email
     full_name: str
     role: UserRole
@@ -1,47 +1,423 @@
 # app/repositories/base_repository.py
 
+import time
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, List, Type
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Iterator, NamedTuple, TypeVar, Optional, List, Tuple, Type
 
+from bson import ObjectId, json_util
 from pydantic import BaseModel
-from sqlalchemy.cyextension.collections import Collection
-from sqlalchemy.orm import Session
+from pymongo import ASCENDING, IndexModel, ReplaceOne, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+from app.database.config import BULK_CHUNK_SIZE, EXPORT_BATCH_SIZE
+from app.database.indexes import reconcile_indexes
+from app.models.location_models.geo_point import GeoPoint
+from app.repositories.entity_cache import EntityCache
+from app.repositories.geo import DISTANCE_FIELD, geo_near_pipeline
+from app.repositories.invalidation_bus import InvalidationBus
+from app.repositories.pagination import encode_cursor, get_path, keyset_filter
+from app.repositories.projection import FieldSet, build_projection, partial_model
+from app.repositories.serialization import DocumentSerializer
+from app.schemas.batch import Batch
+from app.schemas.bulk import BulkItemResult, BulkItemStatus
+from app.schemas.geo import Nearby, NearbyPage
+from app.schemas.pagination import Page, TotalCount
 
 T = TypeVar("T")
 ID = TypeVar("ID")
 
+DUPLICATE_KEY = 11000
+# Key from a source feed; repositories that import feeds declare a unique index
+# on it, partial on {"external_id": {"$type": "string"}}, and queries repeat that
+# condition so the planner can use it.
+EXTERNAL_ID = "external_id"
+
+
+class QueryShape(NamedTuple):
+    """A representative query a repository issues, checked with explain() by `app.commands.verify_indexes`.
+
+    Aggregations give their `pipeline` instead of a filter and sort.
+    """
+    name: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    collection: str = "collection"
+    pipeline: Optional[List[Dict[str, Any]]] = None
+
+
 class BaseRepository(ABC, Generic[T, ID]):
-    def __init__(self, collection: Collection, model: Type[BaseModel]):
+    # Indexes this repository's queries rely on; created at startup by `ensure_indexes`.
+    # IndexModel options such as unique=True, partialFilterExpression and expireAfterSeconds are honoured.
+    indexes: List[IndexModel] = []
+    # One entry per query method, with sample values, so index coverage can be verified.
+    query_shapes: List[QueryShape] = []
+    # How long an exact count for a given filter is reused by `count`.
+    count_cache_seconds: float = 60
+
+    def __init__(self, collection: Collection, model: Type[BaseModel], cache: Optional[EntityCache] = None):
         self.collection = collection
         self.model = model
+        self.serializer = DocumentSerializer(model)
+        # Opt-in read-through cache for get_by_id; every write below invalidates it.
+        self.cache = cache
+        # Set by the container; broadcasts invalidations to the other workers' caches.
+        self.invalidation_bus: Optional[InvalidationBus] = None
+        self._counts: Dict[str, Tuple[float, int]] = {}
+
+    async def _invalidate(self, aggregate_id: Any) -> None:
+        if aggregate_id is None:
+            return
+        if self.invalidation_bus is not None:
+            # The bus applies the invalidation locally before forwarding it.
+            await self.invalidation_bus.publish(self.collection.name, aggregate_id)
+        elif self.cache is not None:
+            self.cache.invalidate(aggregate_id)
+
+    async def _invalidate_many(self, aggregate_ids: List[Any]) -> None:
+        if not aggregate_ids:
+            return
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.publish_many(self.collection.name, aggregate_ids)
+        elif self.cache is not None:
+            for aggregate_id in aggregate_ids:
+                self.cache.invalidate(aggregate_id)
+
+    async def ensure_indexes(self, rebuild: bool = False) -> None:
+        """Create the declared indexes on this repository's collection; `rebuild` also replaces drifted ones."""
+        await reconcile_indexes(self.collection, self.indexes, rebuild)
+
+    def _to_document(self, aggregate: BaseModel) -> Dict[str, Any]:
+        """Dump a model for storage, always keying it by `_id`."""
+        document = aggregate.dict(by_alias=True)
+        if "_id" not in document and "id" in document:
+            document_id = document.pop("id")
+            if document_id is not None:
+                document["_id"] = document_id
+        return document
+
+    def _to_model(self, document: Dict[str, Any], model: Optional[Type[BaseModel]] = None) -> BaseModel:
+        """Build a model from a stored document, mapping `_id` for models without an alias."""
+        model = model or self.model
+        if "id" in model.model_fields and model.model_fields["id"].alias != "_id" and "_id" in document:
+            document = dict(document)
+            document["id"] = str(document.pop("_id"))
+        return model(**document)
+
+    @staticmethod
+    def _assign_id(aggregate: BaseModel) -> None:
+        """Give a new aggregate a string id, the form every read by id looks it up by."""
+        if "id" in type(aggregate).model_fields and aggregate.id is None:
+            aggregate.id = str(ObjectId())
 
     async def save(self, aggregate: BaseModel) -> None:
         """Save a document to the MongoDB collection."""
-        document = aggregate.dict(by_alias=True)
-        await self.collection.insert_one(document)
+        self._assign_id(aggregate)
+        document = self._to_document(aggregate)
+        result = await self.collection.insert_one(document)
+        await self._invalidate(result.inserted_id)
 
     async def delete(self, aggregate_id: str) -> None:
         """Delete a document by ID."""
         await self.collection.delete_one({"_id": aggregate_id})
+        await self._invalidate(aggregate_id)
 
     async def update(self, aggregate: BaseModel) -> None:
         """Update a document by ID."""
-        document = aggregate.dict(by_alias=True)
+        document = self._to_document(aggregate)
         await self.collection.replace_one({"_id": aggregate.id}, document)
+        await self._invalidate(aggregate.id)
+
+    async def get_by_id(self, aggregate_id: str, fields: Optional[FieldSet] = None) -> Optional[BaseModel]:
+        """Get a document by ID, through the cache when one is configured.
 
-    async def get_by_id(self, aggregate_id: str) -> Optional[BaseModel]:
-        print(aggregate_id , " from fast api\n\n\n")
-        print(self.collection , " \n " , self.model)
-        document = await self.collection.find_one({"_id": aggregate_id})
-        print("Document from DB:", document)
+        With `fields`, only those paths are fetched and validated, into a partial model.
+        """
+        model = partial_model(self.model, fields) if fields else self.model
+        document = await self._find_document(aggregate_id, build_projection(self.model, fields) if fields else None)
         if document:
-            return self.model(**document)
+            return self._to_model(document, model)
         return None
 
+    async def get_many(self, aggregate_ids: List[str], fields: Optional[FieldSet] = None) -> Batch:
+        """Get many documents by id with one `$in` query, through the cache when one is configured.
+
+        Items keep the order of `aggregate_ids`, without repeats; ids with no
+        document are listed in `missing`.
+        """
+        aggregate_ids = list(dict.fromkeys(aggregate_ids))
+        model = partial_model(self.model, fields) if fields else self.model
+        documents = await self._find_documents(aggregate_ids, build_projection(self.model, fields) if fields else None)
+        items, missing = [], []
+        for aggregate_id in aggregate_ids:
+            document = documents.get(aggregate_id)
+            if document:
+                items.append(self._to_model(document, model))
+            else:
+                missing.append(aggregate_id)
+        return Batch(items=items, missing=missing)
+
+    async def get_json_by_id(self, aggregate_id: str) -> Optional[bytes]:
+        """Trusted read: the stored document serialised straight to JSON, without building a model."""
+        document = await self._find_document(aggregate_id)
+        return self.serializer.dumps(document) if document else None
+
+    async def _complete(self, documents: List[Dict[str, Any]]) -> None:
+        """Fill in parts of freshly read documents stored outside them, before they are cached or returned."""
+
+    async def _find_document(self, aggregate_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        async def load() -> Optional[Dict[str, Any]]:
+            # Cached documents are complete; callers asking for a projection just ignore the rest.
+            document = await self.collection.find_one({"_id": aggregate_id}, projection if self.cache is None else None)
+            if document:
+                await self._complete([document])
+            return document
+
+        if self.cache is not None:
+            return await self.cache.get_or_load(aggregate_id, load)
+        return await load()
+
+    async def _find_documents(
+        self, aggregate_ids: List[str], projection: Optional[Dict[str, Any]] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        async def load(ids: List[str]) -> Dict[Any, Dict[str, Any]]:
+            # Cached documents are complete, so the projection only applies without a cache.
+            cursor = self.collection.find({"_id": {"$in": ids}}, projection if self.cache is None else None)
+            documents = {document["_id"]: document async for document in cursor}
+            await self._complete(list(documents.values()))
+            return documents
+
+        if not aggregate_ids:
+            return {}
+        if self.cache is not None:
+            return await self.cache.get_many_or_load(aggregate_ids, load)
+        return await load(aggregate_ids)
+
     async def activate(self, aggregate_id: str) -> None:
         """Activate a document by ID."""
         await self.collection.update_one({"_id": aggregate_id}, {"$set": {"is_active": True}})
+        await self._invalidate(aggregate_id)
 
     async def deactivate(self, aggregate_id: str) -> None:
         """Deactivate a document by ID."""
-        await self.collection.update_one({"_id": aggregate_id}, {"$set": {"is_active": False}})
\ No newline at end of file
+        await self.collection.update_one({"_id": aggregate_id}, {"$set": {"is_active": False}})
+        await self._invalidate(aggregate_id)
+
+    @staticmethod
+    def _chunks(items: List[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+        for start in range(0, len(items), size):
+            yield start, items[start:start + size]
+
+    @staticmethod
+    def _bulk_result(index: int, aggregate_id: Any, status: BulkItemStatus, write_error: Optional[Dict[str, Any]] = None) -> BulkItemResult:
+        if write_error is not None:
+            status = BulkItemStatus.CONFLICT if write_error.get("code") == DUPLICATE_KEY else BulkItemStatus.FAILED
+            return BulkItemResult(index=index, id=str(aggregate_id), status=status, error=write_error.get("errmsg"))
+        return BulkItemResult(index=index, id=str(aggregate_id), status=status)
+
+    @staticmethod
+    def _write_errors(error: BulkWriteError) -> Dict[int, Dict[str, Any]]:
+        return {write_error["index"]: write_error for write_error in error.details.get("writeErrors", [])}
+
+    def _replace_operation(self, document: Dict[str, Any]) -> Any:
+        """The bulk write `replace_many` uses to replace a stored document with `document`."""
+        return ReplaceOne({"_id": document["_id"]}, document)
+
+    def _upsert_operation(self, document: Dict[str, Any], document_id: Any) -> Any:
+        """The bulk write `upsert_by_external_id` uses for `document` (without `_id`); a new document gets `document_id`."""
+        return UpdateOne(
+            {EXTERNAL_ID: {"$eq": document[EXTERNAL_ID], "$type": "string"}},
+            {"$set": document, "$setOnInsert": {"_id": document_id}},
+            upsert=True,
+        )
+
+    async def _existing_ids(self, ids: List[Any]) -> set:
+        documents = await self.collection.find({"_id": {"$in": ids}}, {"_id": 1}).to_list(length=None)
+        return {document["_id"] for document in documents}
+
+    async def insert_many(self, aggregates: List[BaseModel], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        """Insert with one unordered insert_many per chunk.
+
+        Returns a result per aggregate, indexed by its position in `aggregates`;
+        a failing document (e.g. a duplicate id) does not stop the rest.
+        """
+        results = []
+        for start, chunk in self._chunks(aggregates, chunk_size):
+            for aggregate in chunk:
+                self._assign_id(aggregate)
+            documents = [self._to_document(aggregate) for aggregate in chunk]
+            errors = {}
+            try:
+                await self.collection.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                errors = self._write_errors(e)
+            results.extend(
+                self._bulk_result(start + offset, document["_id"], BulkItemStatus.CREATED, errors.get(offset))
+                for offset, document in enumerate(documents)
+            )
+            await self._invalidate_many([document["_id"] for document in documents])
+        return results
+
+    async def replace_many(self, aggregates: List[BaseModel], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        """Replace existing documents with one unordered bulk_write per chunk; unknown ids are reported, not inserted."""
+        results = []
+        for start, chunk in self._chunks(aggregates, chunk_size):
+            documents = [self._to_document(aggregate) for aggregate in chunk]
+            existing = await self._existing_ids([document["_id"] for document in documents])
+            offsets = [offset for offset, document in enumerate(documents) if document["_id"] in existing]
+            errors = {}
+            if offsets:
+                operations = [self._replace_operation(documents[offset]) for offset in offsets]
+                try:
+                    await self.collection.bulk_write(operations, ordered=False)
+                except BulkWriteError as e:
+                    errors = {offsets[position]: error for position, error in self._write_errors(e).items()}
+            for offset, document in enumerate(documents):
+                status = BulkItemStatus.UPDATED if document["_id"] in existing else BulkItemStatus.NOT_FOUND
+                results.append(self._bulk_result(start + offset, document["_id"], status, errors.get(offset)))
+            await self._invalidate_many([documents[offset]["_id"] for offset in offsets])
+        return results
+
+    async def set_many(self, aggregate_ids: List[Any], values: Dict[str, Any], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        """`$set` the same values on many documents with one update_many per chunk."""
+        results = []
+        for start, chunk in self._chunks(aggregate_ids, chunk_size):
+            existing = await self._existing_ids(chunk)
+            if existing:
+                await self.collection.update_many({"_id": {"$in": list(existing)}}, {"$set": values})
+            results.extend(
+                self._bulk_result(
+                    start + offset, aggregate_id,
+                    BulkItemStatus.UPDATED if aggregate_id in existing else BulkItemStatus.NOT_FOUND,
+                )
+                for offset, aggregate_id in enumerate(chunk)
+            )
+            await self._invalidate_many(list(existing))
+        return results
+
+    async def upsert_by_external_id(self, aggregates: List[BaseModel], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        """Create or update documents matched on `external_id`, with one unordered bulk_write per chunk.
+
+        Existing documents keep their `_id`; new ones take the aggregate's id.
+        """
+        results = []
+        for start, chunk in self._chunks(aggregates, chunk_size):
+            for aggregate in chunk:
+                self._assign_id(aggregate)
+            documents = [self._to_document(aggregate) for aggregate in chunk]
+            keys = [document[EXTERNAL_ID] for document in documents]
+            existing = {
+                document[EXTERNAL_ID]: document["_id"]
+                for document in await self.collection.find(
+                    {EXTERNAL_ID: {"$in": keys, "$type": "string"}}, {EXTERNAL_ID: 1}
+                ).to_list(length=None)
+            }
+            operations = []
+            for document in documents:
+                document_id = document.pop("_id")
+                operations.append(self._upsert_operation(document, document_id))
+                document["_id"] = existing.get(document[EXTERNAL_ID], document_id)
+            errors = {}
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                errors = self._write_errors(e)
+            for offset, document in enumerate(documents):
+                status = BulkItemStatus.UPDATED if document[EXTERNAL_ID] in existing else BulkItemStatus.CREATED
+                results.append(self._bulk_result(start + offset, document["_id"], status, errors.get(offset)))
+            await self._invalidate_many([document["_id"] for document in documents])
+        return results
+
+    async def paginate(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        sort_field: str = "_id",
+        direction: int = ASCENDING,
+        total: TotalCount = TotalCount.NONE,
+        projection: Optional[Dict[str, Any]] = None,
+        to_item: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        fields: Optional[FieldSet] = None,
+    ) -> Page:
+        """Return one page in `(sort_field, _id)` order, resuming after `cursor`.
+
+        The cursor encodes the last item's sort key and id, so every page is an
+        index seek rather than a skip; back it with an index ending in the sort
+        field and `_id`. `to_item` converts raw documents (defaults to the model,
+        or to a partial model of the selected `fields`).
+        """
+        if fields:
+            model = partial_model(self.model, fields)
+            projection = build_projection(self.model, fields)
+            # The cursor needs the sort key even when it was not selected.
+            if not any(sort_field == key or sort_field.startswith(f"{key}.") for key in projection):
+                projection[sort_field] = 1
+            to_item = to_item or (lambda document: self._to_model(document, model))
+        query = dict(filter or {})
+        after = keyset_filter(sort_field, direction, cursor)
+        if after:
+            query = {"$and": [query, after]} if query else after
+        sort = [("_id", direction)] if sort_field == "_id" else [(sort_field, direction), ("_id", direction)]
+        documents = await self.collection.find(query, projection).sort(sort).limit(limit + 1).to_list(length=limit + 1)
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            last = documents[-1]
+            next_cursor = encode_cursor(get_path(last, sort_field), last["_id"])
+        to_item = to_item or self._to_model
+        return Page(
+            items=[to_item(document) for document in documents],
+            next_cursor=next_cursor,
+            total=await self.count(filter, total),
+        )
+
+    async def count(self, filter: Optional[Dict[str, Any]] = None, mode: TotalCount = TotalCount.EXACT) -> Optional[int]:
+        """Count matching documents without paying for a full count on every page.
+
+        An unfiltered estimate is read from collection metadata; otherwise the
+        exact count is cached per filter for `count_cache_seconds`.
+        """
+        if mode == TotalCount.NONE:
+            return None
+        if mode == TotalCount.ESTIMATED and not filter:
+            return await self.collection.estimated_document_count()
+        key = json_util.dumps(filter or {})
+        now = time.monotonic()
+        cached = self._counts.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        value = await self.collection.count_documents(filter or {})
+        if len(self._counts) >= 1000:
+            self._counts = {k: v for k, v in self._counts.items() if v[0] > now}
+        self._counts[key] = (now + self.count_cache_seconds, value)
+        return value
+
+    async def stream(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        after: Optional[Any] = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[BaseModel]:
+        """Iterate matching documents in `_id` order, one cursor batch in memory at a time.
+
+        Pass the id of the last item received as `after` to resume an interrupted stream.
+        """
+        query = dict(filter or {})
+        if after is not None:
+            query["_id"] = {"$gt": after}
+        cursor = self.collection.find(query, batch_size=batch_size).sort("_id", ASCENDING)
+        async for document in cursor:
+            yield self._to_model(document)
+
+    async def _near(
+        self, point: GeoPoint, max_distance_m: float, query: Dict[str, Any], limit: int, cursor: Optional[str]
+    ) -> NearbyPage:
+        """One page of documents within `max_distance_m` of `point`, nearest first (needs a 2dsphere index)."""
+        pipeline = geo_near_pipeline(point, max_distance_m, query, limit, cursor)
+        documents = await self.collection.aggregate(pipeline).to_list(length=limit + 1)
+        has_more = len(documents) > limit
+        documents = documents[:limit]
+        items = [Nearby[self.model](distance_m=doc.pop(DISTANCE_FIELD), item=self._to_model(doc)) for doc in documents]
+        next_cursor = encode_cursor(items[-1].distance_m, documents[-1]["_id"]) if has_more else None
+        return NearbyPage[self.model](items=items, next_cursor=next_cursor)
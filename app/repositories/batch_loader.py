@@ -0,0 +1,77 @@
+# app/repositories/batch_loader.py
+import asyncio
+from typing import Dict, Generic, List, Optional, Set, TypeVar
+
+from app.repositories.base_repository import BaseRepository
+
+T = TypeVar("T")
+
+
+class BatchLoader(Generic[T]):
+    """Coalesces `load` calls made in the same event-loop tick into one `get_many` query.
+
+    Meant to live for one request: results are remembered, so loading an id
+    twice costs nothing, but they are never refreshed. Typical use is to
+    `asyncio.gather` several `load` calls, e.g. the locations and developers
+    of a listing, and pay one query per repository instead of one per id.
+    """
+
+    def __init__(self, repository: BaseRepository, max_batch_size: int = 100):
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        self._results: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._fetches: Set[asyncio.Task] = set()
+
+    async def load(self, aggregate_id: str) -> Optional[T]:
+        """The entity with this id, or None when there is none."""
+        future = self._results.get(aggregate_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._results[aggregate_id] = loop.create_future()
+            if not self._pending:
+                # Runs after every callback already queued, i.e. after the other
+                # coroutines started in this tick have queued their ids too.
+                loop.call_soon(self._dispatch)
+            self._pending.append(aggregate_id)
+        # Shielded: a cancelled caller must not cancel the result for the others.
+        return await asyncio.shield(future)
+
+    async def load_many(self, aggregate_ids: List[str]) -> List[Optional[T]]:
+        return list(await asyncio.gather(*(self.load(aggregate_id) for aggregate_id in aggregate_ids)))
+
+    def _dispatch(self) -> None:
+        ids, self._pending = self._pending, []
+        for start in range(0, len(ids), self.max_batch_size):
+            task = asyncio.ensure_future(self._fetch(ids[start:start + self.max_batch_size]))
+            self._fetches.add(task)
+            task.add_done_callback(self._fetches.discard)
+
+    async def _fetch(self, ids: List[str]) -> None:
+        try:
+            batch = await self.repository.get_many(ids)
+        except Exception as e:
+            for aggregate_id in ids:
+                # Not remembered, so a later load can retry.
+                future = self._results.pop(aggregate_id)
+                future.set_exception(e)
+                future.exception()
+            return
+        found = iter(batch.items)
+        missing = set(batch.missing)
+        for aggregate_id in ids:
+            self._results[aggregate_id].set_result(None if aggregate_id in missing else next(found))
+
+
+class Loaders:
+    """One `BatchLoader` per repository, created on first use; see `app.dependencies.get_loaders`."""
+
+    def __init__(self, max_batch_size: int = 100):
+        self.max_batch_size = max_batch_size
+        self._loaders: Dict[BaseRepository, BatchLoader] = {}
+
+    def __call__(self, repository: BaseRepository) -> BatchLoader:
+        loader = self._loaders.get(repository)
+        if loader is None:
+            loader = self._loaders[repository] = BatchLoader(repository, self.max_batch_size)
+        return loader
@@ -1,21 +1,422 @@
 # app/repositories/conversation_repository.py
+from collections import defaultdict
+from itertools import groupby
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReplaceOne, ReturnDocument
 from pymongo.collection import Collection
-from typing import List
-from app.models.conversation_models.conversation import Conversation
-from app.repositories.base_repository import BaseRepository
+from pymongo.errors import DuplicateKeyError
+from typing import Any, Dict, List, Optional
+from app.database.config import (
+    CONVERSATION_BUCKET_SIZE, CONVERSATION_INLINE_MESSAGES, CONVERSATION_PREVIEW_LENGTH, CONVERSATION_STORAGE_MODE,
+)
+from app.database.indexes import reconcile_indexes
+from app.models.conversation_models.conversation import (
+    Conversation, ConversationStatus, Message, MessageStorage, Response,
+)
+from app.models.conversation_models.message_bucket import MessageBucket
+from app.repositories.base_repository import BaseRepository, QueryShape
+from app.schemas.conversation import ConversationSummary, MessagePage
+from app.schemas.pagination import Page, TotalCount
+
+# What a conversation list reads; never the messages.
+SUMMARY_PROJECTION = {
+    "user_id": 1, "title": 1, "status": 1, "message_count": 1, "last_message_timestamp": 1, "last_message_preview": 1,
+}
+
+
+def preview(content: str) -> str:
+    return content[:CONVERSATION_PREVIEW_LENGTH]
+
+
+class WriteConflictError(Exception):
+    """Raised when a conditional conversation write loses to a concurrent writer."""
 
 
 class ConversationRepository(BaseRepository):
-    def __init__(self, collection: Collection):
+    """Conversations with either embedded or bucketed message storage.
+
+    In bucketed mode the conversation document is a header holding the counters
+    and the last `inline_messages` messages, and the full history lives in
+    `message_collection` as `MessageBucket` documents of `bucket_size` messages.
+    The layout is recorded per conversation in `message_storage`, so both kinds
+    can be read and written side by side while a migration is running. Reads
+    by id put the full history back together, so callers always see every
+    message; use `retrieve_conversation_history_by_id` to read it a page at a time.
+    """
+    # Conversation lists page newest first on (last_message_timestamp, _id), by user and/or status.
+    indexes = [
+        IndexModel([("user_id", ASCENDING), ("last_message_timestamp", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("last_message_timestamp", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("last_message_timestamp", ASCENDING), ("_id", ASCENDING)]),
+    ]
+    message_indexes = [
+        IndexModel([("conversation_id", ASCENDING), ("bucket", ASCENDING)]),
+    ]
+    query_shapes = [
+        QueryShape("get_summaries", {"user_id": "probe"}, [("last_message_timestamp", DESCENDING), ("_id", DESCENDING)]),
+        QueryShape(
+            "get_summaries",
+            {"user_id": "probe", "status": "active"},
+            [("last_message_timestamp", DESCENDING), ("_id", DESCENDING)],
+        ),
+        QueryShape("get_summaries", {"status": "active"}, [("last_message_timestamp", DESCENDING), ("_id", DESCENDING)]),
+        QueryShape(
+            "retrieve_bucketed_history",
+            {"conversation_id": "probe", "bucket": {"$gte": 0, "$lte": 1}},
+            collection="message_collection",
+        ),
+    ]
+
+    def __init__(
+        self,
+        collection: Collection,
+        message_collection: Optional[Collection] = None,
+        storage_mode: MessageStorage = MessageStorage(CONVERSATION_STORAGE_MODE),
+        bucket_size: int = CONVERSATION_BUCKET_SIZE,
+        inline_messages: int = CONVERSATION_INLINE_MESSAGES,
+    ):
         super().__init__(collection, Conversation)
+        self.message_collection = message_collection
+        self.storage_mode = storage_mode if message_collection is not None else MessageStorage.EMBEDDED
+        self.bucket_size = bucket_size
+        self.inline_messages = max(inline_messages, 1)
+
+    async def ensure_indexes(self, rebuild: bool = False) -> None:
+        """Create the declared indexes, including those of the message collection."""
+        await super().ensure_indexes(rebuild)
+        if self.message_collection is not None:
+            await reconcile_indexes(self.message_collection, self.message_indexes, rebuild)
+
+    def _bucket_of(self, number: int) -> int:
+        return (number - 1) // self.bucket_size
+
+    @staticmethod
+    def _reads_messages(projection: Optional[Dict[str, Any]]) -> bool:
+        return projection is None or any(key == "messages" or key.startswith("messages.") for key in projection)
+
+    async def _find_document(self, aggregate_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        if projection is not None and self._reads_messages(projection):
+            # Needed to tell whether the history has to be read from the buckets.
+            projection = {**projection, "message_storage": 1, "message_count": 1}
+        return await super()._find_document(aggregate_id, projection)
+
+    async def _find_documents(
+        self, aggregate_ids: List[str], projection: Optional[Dict[str, Any]] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        if projection is not None and self._reads_messages(projection):
+            projection = {**projection, "message_storage": 1, "message_count": 1}
+        return await super()._find_documents(aggregate_ids, projection)
+
+    async def _complete(self, documents: List[Dict[str, Any]]) -> None:
+        """Replace the inline messages of bucketed conversations with their whole history."""
+        bucketed = {
+            document["_id"]: document for document in documents
+            if document.get("message_storage") == MessageStorage.BUCKETED and "messages" in document
+        }
+        if not bucketed or self.message_collection is None:
+            return
+        history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        async for bucket in self.message_collection.find({"conversation_id": {"$in": list(bucketed)}}):
+            history[bucket["conversation_id"]].extend(bucket["messages"])
+        for conversation_id, document in bucketed.items():
+            count = document.get("message_count") or 0
+            # Messages past the header's count belong to an append that has not finished yet.
+            document["messages"] = sorted(
+                (message for message in history[conversation_id] if message["number"] <= count),
+                key=lambda message: message["number"],
+            )
+
+    async def _write_buckets(self, conversation_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Write whole buckets for already-numbered messages; safe to repeat."""
+        requests = []
+        for bucket, group in groupby(messages, key=lambda message: self._bucket_of(message["number"])):
+            group = list(group)
+            bucket_id = MessageBucket.make_id(conversation_id, bucket)
+            document = MessageBucket(
+                _id=bucket_id, conversation_id=conversation_id, bucket=bucket, count=len(group), messages=group
+            ).dict(by_alias=True)
+            requests.append(ReplaceOne({"_id": bucket_id}, document, upsert=True))
+        if requests:
+            await self.message_collection.bulk_write(requests, ordered=False)
+
+    @staticmethod
+    def _with_preview(aggregate: Conversation) -> Conversation:
+        if not aggregate.messages:
+            return aggregate
+        return aggregate.copy(update={"last_message_preview": preview(aggregate.messages[-1].content)})
+
+    async def save(self, aggregate: Conversation) -> None:
+        """Save a conversation using the configured message layout."""
+        self._assign_id(aggregate)
+        aggregate = self._with_preview(aggregate)
+        if self.storage_mode != MessageStorage.BUCKETED:
+            return await super().save(aggregate)
+        document = aggregate.copy(update={"message_storage": MessageStorage.BUCKETED}).dict(by_alias=True)
+        for index, message in enumerate(document["messages"]):
+            if message.get("number") is None:
+                message["number"] = index + 1
+        await self._write_buckets(aggregate.id, document["messages"])
+        document["messages"] = document["messages"][-self.inline_messages:]
+        await self.collection.insert_one(document)
+        await self._invalidate(aggregate.id)
+
+    async def update(self, aggregate: Conversation) -> None:
+        """Update a conversation; for bucketed ones the fields maintained by appends are left alone."""
+        if aggregate.message_storage != MessageStorage.BUCKETED:
+            return await super().update(self._with_preview(aggregate))
+        document = aggregate.dict(
+            by_alias=True,
+            exclude={
+                "id", "messages", "message_count", "last_message_timestamp", "last_message_preview", "related_property_ids",
+            },
+        )
+        await self.collection.update_one({"_id": aggregate.id}, {"$set": document})
+        await self._invalidate(aggregate.id)
+
+    async def delete(self, aggregate_id: str) -> None:
+        """Delete a conversation and any message buckets it owns."""
+        await super().delete(aggregate_id)
+        if self.message_collection is not None:
+            await self.message_collection.delete_many({"conversation_id": aggregate_id})
+
+    async def append_message(self, conversation_id: str, message: Message, max_attempts: int = 5) -> Optional[Message]:
+        """Append a message with $push, numbering it after the stored message_count.
+
+        The update is conditional on the count read just before it, so concurrent
+        appends never reuse a number; a lost race is retried up to `max_attempts`.
+        Bucketed conversations write the message into its bucket first, where
+        its number can only be taken once, and then count it on the header
+        (keeping only the last few messages inline); see `_append_bucketed`.
+        """
+        for _ in range(max_attempts):
+            header = await self.collection.find_one({"_id": conversation_id}, {"message_count": 1, "message_storage": 1})
+            if header is None:
+                return None
+            count = header.get("message_count")
+            numbered = message.copy(update={"number": (count or 0) + 1})
+            if header.get("message_storage") == MessageStorage.BUCKETED:
+                appended = await self._append_bucketed(conversation_id, count, numbered)
+            else:
+                appended = await self._push_to_header(conversation_id, count, numbered, bucketed=False)
+            if appended:
+                await self._invalidate(conversation_id)
+                return numbered
+        raise WriteConflictError(f"Could not append to conversation {conversation_id} after {max_attempts} attempts")
+
+    async def _push_to_header(self, conversation_id: str, count: Optional[int], message: Message, bucketed: bool) -> bool:
+        document = message.dict()
+        push = {"$each": [document], "$slice": -self.inline_messages} if bucketed else document
+        result = await self.collection.update_one(
+            {"_id": conversation_id, "message_count": count},
+            {
+                "$push": {"messages": push},
+                "$inc": {"message_count": 1},
+                "$max": {"last_message_timestamp": message.timestamp},
+                "$set": {"last_message_preview": preview(message.content)},
+            },
+        )
+        return result.modified_count == 1
+
+    async def _append_bucketed(self, conversation_id: str, count: Optional[int], message: Message) -> bool:
+        """Write the message to its bucket, then count it on the header.
+
+        The bucket is the record: the push only applies if no message there has
+        this number yet, so whoever stores a number owns it. A header that lags
+        its buckets (an append that failed or was cancelled between the writes)
+        is rolled forward by the next append, which finds the number taken and
+        finishes that append before retrying its own. Until then reads ignore
+        the extra message, so nothing counted on the header is ever missing.
+        """
+        bucket = self._bucket_of(message.number)
+        bucket_id = MessageBucket.make_id(conversation_id, bucket)
+        try:
+            await self.message_collection.update_one(
+                {"_id": bucket_id, "messages.number": {"$ne": message.number}},
+                {
+                    "$push": {"messages": message.dict()},
+                    "$inc": {"count": 1},
+                    "$setOnInsert": {"conversation_id": conversation_id, "bucket": bucket},
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            stored = await self.message_collection.find_one(
+                {"_id": bucket_id}, {"messages": {"$elemMatch": {"number": message.number}}}
+            )
+            if stored and stored.get("messages"):
+                await self._push_to_header(conversation_id, count, Message(**stored["messages"][0]), bucketed=True)
+            return False
+        # The number is ours, so if the header moved past `count` it was rolled forward with this message.
+        await self._push_to_header(conversation_id, count, message, bucketed=True)
+        return True
+
+    async def append_response(self, conversation_id: str, response: Response) -> Optional[Message]:
+        """Attach a response to the last message if it does not have one yet.
+
+        Uses a positional update on the last message and $addToSet for the
+        related property ids; raises WriteConflictError if the last message
+        already has a response or a new message arrived in between.
+        """
+        header = await self.collection.find_one({"_id": conversation_id}, {"message_count": 1, "message_storage": 1})
+        if header is None:
+            return None
+        count = header.get("message_count") or 0
+        document = await self.collection.find_one_and_update(
+            {
+                "_id": conversation_id,
+                "message_count": count,
+                "messages": {"$elemMatch": {"number": count, "response": None}},
+            },
+            {
+                "$set": {"messages.$.response": response.dict()},
+                "$addToSet": {"related_property_ids": {"$each": response.related_property_ids}},
+            },
+            projection={"messages": {"$elemMatch": {"number": count}}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if document is None:
+            raise WriteConflictError(f"Last message of conversation {conversation_id} is not awaiting a response")
+        await self._invalidate(conversation_id)
+        if header.get("message_storage") == MessageStorage.BUCKETED:
+            await self.message_collection.update_one(
+                {"_id": MessageBucket.make_id(conversation_id, self._bucket_of(count)), "messages.number": count},
+                {"$set": {"messages.$.response": response.dict()}},
+            )
+        return Message(**document["messages"][0])
+
+    async def retrieve_conversation_history_by_id(
+        self, conversation_id: str, limit: int = 10, offset: int = 0, before: Optional[int] = None
+    ) -> Optional[MessagePage]:
+        """Return one page of messages, newest page first, without loading the whole history.
+
+        Messages are returned in chronological order. `before` is a cursor on
+        `Message.number`; `offset` skips that many of the newest matching messages.
+        """
+        source = {"$ifNull": ["$messages", []]}
+        if before is not None:
+            source = {"$filter": {"input": source, "as": "message", "cond": {"$lt": ["$$message.number", before]}}}
+        pipeline = [
+            {"$match": {"_id": conversation_id}},
+            {"$project": {
+                "message_storage": 1,
+                "stored_message_count": "$message_count",
+                "message_count": {"$size": {"$ifNull": ["$messages", []]}},
+                "window": {"$let": {
+                    "vars": {"source": source},
+                    "in": {"$let": {
+                        "vars": {
+                            "available": {"$size": "$$source"},
+                            "end": {"$max": [{"$subtract": [{"$size": "$$source"}, offset]}, 0]},
+                        },
+                        "in": {
+                            "available": "$$available",
+                            "messages": {"$cond": [
+                                {"$gt": ["$$end", 0]},
+                                {"$slice": [
+                                    "$$source",
+                                    {"$max": [{"$subtract": ["$$end", limit]}, 0]},
+                                    {"$min": ["$$end", limit]},
+                                ]},
+                                [],
+                            ]},
+                        },
+                    }},
+                }},
+            }},
+        ]
+        documents = await self.collection.aggregate(pipeline).to_list(length=1)
+        if not documents:
+            return None
+        document = documents[0]
+        if document.get("message_storage") == MessageStorage.BUCKETED:
+            return await self._retrieve_bucketed_history(
+                conversation_id, document.get("stored_message_count") or 0, limit, offset, before
+            )
+        window = document["window"]
+        messages = [Message(**message) for message in window["messages"]]
+        has_more = max(window["available"] - offset, 0) > limit
+        return MessagePage(
+            conversation_id=conversation_id,
+            messages=messages,
+            message_count=document["message_count"],
+            has_more=has_more,
+            next_before=messages[0].number if has_more and messages else None,
+        )
+
+    async def _retrieve_bucketed_history(
+        self, conversation_id: str, message_count: int, limit: int, offset: int, before: Optional[int]
+    ) -> MessagePage:
+        """Read a page from the buckets covering its message numbers (at most a couple of documents)."""
+        last = message_count if before is None else min(before - 1, message_count)
+        end = last - offset
+        start = max(end - limit + 1, 1)
+        messages: List[Message] = []
+        if end >= 1:
+            cursor = self.message_collection.find({
+                "conversation_id": conversation_id,
+                "bucket": {"$gte": self._bucket_of(start), "$lte": self._bucket_of(end)},
+            })
+            async for bucket in cursor:
+                messages.extend(
+                    Message(**message) for message in bucket["messages"] if start <= message["number"] <= end
+                )
+            messages.sort(key=lambda message: message.number)
+        has_more = end >= 1 and start > 1
+        return MessagePage(
+            conversation_id=conversation_id,
+            messages=messages,
+            message_count=message_count,
+            has_more=has_more,
+            next_before=start if has_more else None,
+        )
+
+    async def rebucket(self, document: Dict[str, Any]) -> bool:
+        """Move an embedded conversation's messages into buckets.
 
-    async def retrieve_conversation_history_by_id(self, conversation_id: str, limit: int = 10, offset: int = 0) -> Conversation:
-        document = await self.collection.find_one({"_id": conversation_id})
-        if document:
-            return self.model(**document)
-        return None
+        Buckets are written idempotently before the header is trimmed, and the
+        header update is conditional on the message count, so a conversation
+        that receives a message mid-migration is simply left for the next run.
+        """
+        if self.message_collection is None:
+            raise ValueError("Bucketed storage requires a message collection")
+        messages = document.get("messages") or []
+        for index, message in enumerate(messages):
+            if message.get("number") is None:
+                message["number"] = index + 1
+        await self._write_buckets(document["_id"], messages)
+        result = await self.collection.update_one(
+            {
+                "_id": document["_id"],
+                "message_count": document.get("message_count"),
+                "message_storage": {"$ne": MessageStorage.BUCKETED},
+            },
+            {"$set": {
+                "messages": messages[-self.inline_messages:],
+                "message_count": len(messages),
+                "message_storage": MessageStorage.BUCKETED,
+            }},
+        )
+        await self._invalidate(document["_id"])
+        return result.modified_count == 1
 
-    async def retrieve_conversation_info_by_user_id(self, user_id: str) -> List[Conversation]:
-        cursor = self.collection.find({"user_id": user_id})
-        documents = await cursor.to_list(length=None)
-        return [self.model(**doc) for doc in documents]
\ No newline at end of file
+    async def get_summaries(
+        self,
+        user_id: Optional[str] = None,
+        status: Optional[ConversationStatus] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        total: TotalCount = TotalCount.NONE,
+    ) -> Page[ConversationSummary]:
+        """Conversation summaries, most recent first, projected so no message is ever read."""
+        query: Dict[str, Any] = {}
+        if user_id is not None:
+            query["user_id"] = user_id
+        if status is not None:
+            query["status"] = status
+        return await self.paginate(
+            query, limit, cursor,
+            sort_field="last_message_timestamp",
+            direction=DESCENDING,
+            total=total,
+            projection=SUMMARY_PROJECTION,
+            to_item=lambda document: ConversationSummary(id=document.pop("_id"), **document),
+        )
@@ -1,21 +1,24 @@
 # src/repositories/developer_repository.py
+from pymongo import ASCENDING
 from pymongo.collection import Collection
-from typing import List, Optional
+from typing import Optional
 from app.models.developer_models.developer import Developer
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, QueryShape
+from app.repositories.entity_cache import EntityCache
+from app.repositories.projection import FieldSet
+from app.schemas.pagination import Page, TotalCount
 
 
 class DeveloperRepository(BaseRepository):
-    def __init__(self, collection: Collection):
-        super().__init__(collection, Developer)
+    query_shapes = [
+        QueryShape("get_all", {}, [("_id", ASCENDING)]),
+    ]
 
-    async def get_by_id(self, developer_id: str) -> Optional[Developer]:
-        document = await self.collection.find_one({"_id": developer_id})
-        if document:
-            return self.model(**document)
-        return None
+    def __init__(self, collection: Collection, cache: Optional[EntityCache] = None):
+        super().__init__(collection, Developer, cache)
 
-    async def get_all(self) -> List[Developer]:
-        cursor = self.collection.find({})
-        documents = await cursor.to_list(length=None)
-        return [self.model(**doc) for doc in documents]
+    async def get_all(
+        self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Developer]:
+        return await self.paginate(limit=limit, cursor=cursor, total=total, fields=fields)
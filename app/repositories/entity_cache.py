@@ -0,0 +1,168 @@
+# app/repositories/entity_cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.schemas.admin import CacheStats
+
+Document = Optional[Dict[str, Any]]
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Every caller may have gone away; mark a failure as retrieved so it is not logged as lost.
+    if not task.cancelled():
+        task.exception()
+
+
+class EntityCache:
+    """A bounded LRU of raw documents by id, with TTL expiry and negative caching.
+
+    Concurrent misses for the same id share a single in-flight load. The load
+    runs in its own task, so a caller that is cancelled (e.g. its client went
+    away) does not cancel it for the others waiting on it. Documents
+    are cached as returned by MongoDB; repositories build a fresh model from
+    them on every hit, so callers never share mutable state through the cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 10000,
+        ttl_seconds: float = 300,
+        negative_ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Any, Tuple[float, Document]]" = OrderedDict()
+        self._inflight: Dict[Any, asyncio.Task] = {}
+        self._stale: Set[Any] = set()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup(self, key: Any) -> Tuple[bool, Document]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, document = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, document
+
+    def _store(self, key: Any, document: Document) -> None:
+        ttl = self.ttl_seconds if document is not None else self.negative_ttl_seconds
+        if ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, document)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _start(self, keys: List[Any], load: Callable[[], Awaitable[Dict[Any, Document]]]) -> asyncio.Task:
+        """Load `keys` in a task of its own, which caches what it finds before anyone waiting sees it."""
+        task = asyncio.ensure_future(self._run(keys, load))
+        task.add_done_callback(_retrieve_exception)
+        for key in keys:
+            self._inflight[key] = task
+        return task
+
+    async def _run(self, keys: List[Any], load: Callable[[], Awaitable[Dict[Any, Document]]]) -> Dict[Any, Document]:
+        try:
+            loaded = await load()
+            for key in keys:
+                # A write that invalidated the key during the load may have made this result stale.
+                if key not in self._stale:
+                    self._store(key, loaded.get(key))
+            return loaded
+        finally:
+            for key in keys:
+                del self._inflight[key]
+                self._stale.discard(key)
+
+    async def get_or_load(self, key: Any, loader: Callable[[], Awaitable[Document]]) -> Document:
+        found, document = self._lookup(key)
+        if found:
+            if document is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return document
+        task = self._inflight.get(key)
+        if task is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+            async def load() -> Dict[Any, Document]:
+                return {key: await loader()}
+
+            task = self._start([key], load)
+        return (await asyncio.shield(task)).get(key)
+
+    async def get_many_or_load(
+        self, keys: List[Any], loader: Callable[[List[Any]], Awaitable[Dict[Any, Dict[str, Any]]]]
+    ) -> Dict[Any, Document]:
+        """Like `get_or_load` for many keys: all misses are loaded by one `loader` call.
+
+        The loader gets the missing keys and returns the documents it found by
+        key; keys it does not return are cached as absent. Keys another caller
+        is already loading are awaited instead of loaded again.
+        """
+        found: Dict[Any, Document] = {}
+        waiting: Dict[Any, asyncio.Task] = {}
+        missing: List[Any] = []
+        for key in dict.fromkeys(keys):
+            hit, document = self._lookup(key)
+            if hit:
+                if document is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                found[key] = document
+            elif key in self._inflight:
+                self.hits += 1
+                waiting[key] = self._inflight[key]
+            else:
+                self.misses += 1
+                missing.append(key)
+
+        if missing:
+            task = self._start(missing, lambda: loader(missing))
+            waiting.update((key, task) for key in missing)
+        for key, task in waiting.items():
+            found[key] = (await asyncio.shield(task)).get(key)
+        return found
+
+    def invalidate(self, key: Any) -> None:
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        if key in self._inflight:
+            self._stale.add(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._stale.update(self._inflight)
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.negative_hits + self.misses
+        return CacheStats(
+            name=self.name,
+            size=len(self._entries),
+            max_entries=self.max_entries,
+            hits=self.hits,
+            negative_hits=self.negative_hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+            hit_ratio=(self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        )
@@ -0,0 +1,41 @@
+# app/repositories/geo.py
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING
+
+from app.models.location_models.geo_point import GeoPoint
+from app.repositories.pagination import decode_cursor, keyset_filter
+
+DISTANCE_FIELD = "distance_m"
+
+
+def geo_near_pipeline(
+    point: GeoPoint,
+    max_distance_m: float,
+    query: Dict[str, Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    key: str = "coordinates",
+) -> List[Dict[str, Any]]:
+    """Build a `$geoNear` pipeline returning up to `limit + 1` documents in `(distance, _id)` order.
+
+    Paging is keyset based: the cursor holds the distance and `_id` of the last
+    item, which becomes `minDistance` so later pages never rescan the nearer
+    ring; the `_id` tie-breaker handles points at exactly the same distance.
+    """
+    geo_near: Dict[str, Any] = {
+        "near": point.dict(),
+        "key": key,
+        "distanceField": DISTANCE_FIELD,
+        "maxDistance": max_distance_m,
+        "spherical": True,
+        "query": query,
+    }
+    pipeline: List[Dict[str, Any]] = [{"$geoNear": geo_near}]
+    if cursor:
+        min_distance, _ = decode_cursor(cursor)
+        geo_near["minDistance"] = min_distance
+        pipeline.append({"$match": keyset_filter(DISTANCE_FIELD, ASCENDING, cursor)})
+    pipeline.append({"$sort": {DISTANCE_FIELD: ASCENDING, "_id": ASCENDING}})
+    pipeline.append({"$limit": limit + 1})
+    return pipeline
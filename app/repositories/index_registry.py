@@ -0,0 +1,10 @@
+# app/repositories/index_registry.py
+import asyncio
+from typing import List
+
+from app.repositories.base_repository import BaseRepository
+
+
+async def ensure_indexes(repositories: List[BaseRepository], rebuild: bool = False) -> None:
+    """Create every repository's declared indexes concurrently; `rebuild` also replaces drifted ones."""
+    await asyncio.gather(*(repository.ensure_indexes(rebuild) for repository in repositories))
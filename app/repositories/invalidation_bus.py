@@ -0,0 +1,164 @@
+# app/repositories/invalidation_bus.py
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+InvalidationHandler = Callable[[str, Any], Awaitable[None]]
+ResetHandler = Callable[[], Awaitable[None]]
+
+
+class InvalidationBus(ABC):
+    """Broadcasts `(collection, id)` invalidations to every worker.
+
+    `publish` always applies the invalidation to the local subscribers before
+    it returns, so a worker reads its own writes; remote backends additionally
+    forward it to the other workers. Reset handlers run when a backend may have
+    missed messages (e.g. after a reconnect) and should drop everything cached.
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._handlers: List[InvalidationHandler] = []
+        self._reset_handlers: List[ResetHandler] = []
+
+    def subscribe(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+    def subscribe_reset(self, handler: ResetHandler) -> None:
+        self._reset_handlers.append(handler)
+
+    async def _dispatch(self, collection: str, document_id: Any) -> None:
+        for handler in self._handlers:
+            try:
+                await handler(collection, document_id)
+            except Exception:
+                logger.exception(f"Invalidation handler failed for {collection}/{document_id}")
+
+    async def _reset(self) -> None:
+        for handler in self._reset_handlers:
+            try:
+                await handler()
+            except Exception:
+                logger.exception("Invalidation reset handler failed")
+
+    @abstractmethod
+    async def publish(self, collection: str, document_id: Any) -> None:
+        ...
+
+    async def publish_many(self, collection: str, document_ids: List[Any]) -> None:
+        for document_id in document_ids:
+            await self.publish(collection, document_id)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class InProcessInvalidationBus(InvalidationBus):
+    """Delivers invalidations within this process only (single worker, tests)."""
+
+    async def publish(self, collection: str, document_id: Any) -> None:
+        await self._dispatch(collection, document_id)
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Delivers invalidations to every worker over a Redis pub/sub channel.
+
+    Messages carry the publishing worker's origin so each worker skips its own,
+    which it already applied locally. If the subscription drops, the listener
+    reconnects with backoff and then triggers a reset, since invalidations
+    published in between were lost.
+    """
+
+    def __init__(self, url: str, channel: str = "cache-invalidation", client: Optional[Any] = None):
+        super().__init__()
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError("The redis invalidation backend requires the 'redis' package") from e
+            client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._client = client
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def publish(self, collection: str, document_id: Any) -> None:
+        await self._dispatch(collection, document_id)
+        message = json.dumps({"origin": self.origin, "collection": collection, "id": document_id}, default=str)
+        try:
+            await self._client.publish(self.channel, message)
+        except Exception:
+            # The write itself succeeded; other workers fall back to their cache TTL.
+            logger.exception(f"Failed to publish invalidation for {collection}/{document_id}")
+
+    async def publish_many(self, collection: str, document_ids: List[Any]) -> None:
+        """One message for a whole bulk write instead of one per document."""
+        for document_id in document_ids:
+            await self._dispatch(collection, document_id)
+        message = json.dumps({"origin": self.origin, "collection": collection, "ids": document_ids}, default=str)
+        try:
+            await self._client.publish(self.channel, message)
+        except Exception:
+            logger.exception(f"Failed to publish {len(document_ids)} invalidations for {collection}")
+
+    async def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+        await self._subscribed.wait()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        await self._client.aclose()
+
+    async def _listen(self) -> None:
+        delay = 0.5
+        reconnecting = False
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                self._subscribed.set()
+                if reconnecting:
+                    await self._reset()
+                delay = 0.5
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") == self.origin:
+                        continue
+                    for document_id in payload["ids"] if "ids" in payload else [payload["id"]]:
+                        await self._dispatch(payload["collection"], document_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Invalidation subscription lost; reconnecting")
+                self._subscribed.set()
+                reconnecting = True
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def create_invalidation_bus(backend: str, redis_url: str, channel: str) -> InvalidationBus:
+    if backend == "redis":
+        return RedisInvalidationBus(redis_url, channel)
+    if backend == "local":
+        return InProcessInvalidationBus()
+    raise ValueError(f"Unknown cache invalidation backend: {backend}")
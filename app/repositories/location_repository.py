@@ -1,20 +1,97 @@
 # src/repositories/location_repository.py
+from pymongo import ASCENDING, GEOSPHERE, IndexModel
 from pymongo.collection import Collection
-from typing import List
+from typing import List, Optional
+from app.models.location_models.geo_point import GeoPoint
 from app.models.location_models.location import Location, LocationType
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, QueryShape
+from app.repositories.entity_cache import EntityCache
+from app.repositories.projection import FieldSet
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page, TotalCount
 
 
 class LocationRepository(BaseRepository):
-    def __init__(self, collection: Collection):
-        super().__init__(collection, Location)
+    indexes = [
+        IndexModel([("parent_ids", ASCENDING)]),
+        IndexModel([("location_type", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("coordinates", GEOSPHERE), ("location_type", ASCENDING)]),
+    ]
+    query_shapes = [
+        QueryShape("get_by_type", {"location_type": "city"}, [("_id", ASCENDING)]),
+        # Also the per-level lookup $graphLookup performs for get_descendants.
+        QueryShape("get_direct_children", {"parent_ids": "probe"}),
+        QueryShape("near", {
+            "coordinates": {"$nearSphere": {"$geometry": {"type": "Point", "coordinates": [31.23, 30.04]}, "$maxDistance": 3000}},
+            "location_type": {"$in": ["point_of_interest"]},
+        }),
+    ]
 
-    async def get_by_type(self, location_type: LocationType) -> List[Location]:
-        cursor = self.collection.find({"location_type": location_type})
-        documents = await cursor.to_list(length=None)
-        return [self.model(**doc) for doc in documents]
+    def __init__(self, collection: Collection, cache: Optional[EntityCache] = None):
+        super().__init__(collection, Location, cache)
+
+    async def update(self, aggregate: Location) -> None:
+        """Update a location, leaving its price average to the rollup that maintains it."""
+        document = self._to_document(aggregate)
+        document.pop("_id", None)
+        document.pop("average_price_m2", None)
+        await self.collection.update_one({"_id": aggregate.id}, {"$set": document})
+        await self._invalidate(aggregate.id)
+
+    async def get_by_type(
+        self, location_type: LocationType, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Location]:
+        return await self.paginate({"location_type": location_type}, limit, cursor, total=total, fields=fields)
 
     async def get_direct_children(self, location_id: str) -> List[Location]:
         cursor = self.collection.find({"parent_ids": location_id})
         documents = await cursor.to_list(length=None)
-        return [self.model(**doc) for doc in documents]
+        return [self._to_model(doc) for doc in documents]
+
+    async def get_direct_parents(self, location_id: str) -> Optional[List[Location]]:
+        """None if the location does not exist."""
+        return await self.get_ancestors(location_id, max_depth=0)
+
+    async def _graph_lookup(
+        self, location_id: str, start_with: str, connect_from: str, connect_to: str, max_depth: Optional[int]
+    ) -> Optional[List[Location]]:
+        graph_lookup = {
+            "from": self.collection.name,
+            "startWith": start_with,
+            "connectFromField": connect_from,
+            "connectToField": connect_to,
+            "as": "related",
+            "depthField": "depth",
+        }
+        if max_depth is not None:
+            graph_lookup["maxDepth"] = max_depth
+        pipeline = [
+            {"$match": {"_id": location_id}},
+            {"$graphLookup": graph_lookup},
+            {"$project": {"related": 1}},
+        ]
+        documents = await self.collection.aggregate(pipeline).to_list(length=1)
+        if not documents:
+            return None
+        related = sorted(documents[0]["related"], key=lambda doc: (doc.pop("depth"), doc.get("name", "")))
+        return [self._to_model(doc) for doc in related]
+
+    async def get_ancestors(self, location_id: str, max_depth: Optional[int] = None) -> Optional[List[Location]]:
+        """All locations above this one, nearest first, in one query. None if the location does not exist."""
+        return await self._graph_lookup(location_id, "$parent_ids", "parent_ids", "_id", max_depth)
+
+    async def get_descendants(self, location_id: str, max_depth: Optional[int] = None) -> Optional[List[Location]]:
+        """All locations inside this one, nearest first, in one query. None if the location does not exist."""
+        return await self._graph_lookup(location_id, "$_id", "_id", "parent_ids", max_depth)
+
+    async def near(
+        self,
+        point: GeoPoint,
+        max_distance_m: float,
+        location_types: Optional[List[LocationType]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> NearbyPage[Location]:
+        query = {"location_type": {"$in": location_types}} if location_types else {}
+        return await self._near(point, max_distance_m, query, limit, cursor)
@@ -0,0 +1,81 @@
+# app/repositories/location_rollup.py
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+
+from app.repositories.location_repository import LocationRepository
+from app.repositories.location_tree import LocationTree
+from app.repositories.pagination import get_path
+
+PRICE_FIELD = "current_price.price_per_sqm"
+# What a property write has to read back for the rollup.
+ROLLUP_PROJECTION = {"is_active": 1, "location_ids": 1, PRICE_FIELD: 1}
+
+# A property document before and after a write; None when it did not or no longer exists.
+Change = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def _increment(total: float, count: int) -> List[Dict[str, Any]]:
+    """Pipeline update adding to the running sum and count, then recomputing the average."""
+    return [
+        {"$set": {"price_rollup": {
+            "sum": {"$add": [{"$ifNull": ["$price_rollup.sum", 0]}, total]},
+            "count": {"$add": [{"$ifNull": ["$price_rollup.count", 0]}, count]},
+        }}},
+        {"$set": {"average_price_m2": {"$cond": [
+            {"$gt": ["$price_rollup.count", 0]},
+            {"$divide": ["$price_rollup.sum", "$price_rollup.count"]},
+            None,
+        ]}}},
+    ]
+
+
+class LocationPriceRollup:
+    """Keeps `Location.average_price_m2` current from property writes.
+
+    Every active property with a `current_price.price_per_sqm` counts once in
+    each of its locations and in every location containing them, so a city's
+    average covers the properties in all its districts. Locations store the
+    running `price_rollup.sum` and `price_rollup.count`; a write only sends the
+    net change per affected location, as one atomic pipeline update that also
+    recomputes the average. `app.commands.rebuild_location_prices` recomputes
+    everything from scratch.
+    """
+
+    def __init__(self, locations: LocationRepository, tree: LocationTree):
+        self.locations = locations
+        self.tree = tree
+
+    def _contribution(self, document: Optional[Dict[str, Any]]) -> Tuple[Set[str], float]:
+        if not document or not document.get("is_active", True):
+            return set(), 0.0
+        value = get_path(document, PRICE_FIELD)
+        if value is None:
+            return set(), 0.0
+        return set(self.tree.enclosing(document.get("location_ids") or [])), float(value)
+
+    def deltas(self, changes: Iterable[Change]) -> Dict[str, Tuple[float, int]]:
+        """Net (sum, count) change per location; locations whose totals do not move are left out."""
+        totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+        for before, after in changes:
+            for sign, document in ((-1, before), (1, after)):
+                location_ids, value = self._contribution(document)
+                for location_id in location_ids:
+                    totals[location_id][0] += sign * value
+                    totals[location_id][1] += sign
+        return {
+            location_id: (total, int(count))
+            for location_id, (total, count) in totals.items()
+            if count or abs(total) > 1e-9
+        }
+
+    async def apply(self, changes: Iterable[Change]) -> None:
+        deltas = self.deltas(changes)
+        if not deltas:
+            return
+        await self.locations.collection.bulk_write(
+            [UpdateOne({"_id": location_id}, _increment(total, count)) for location_id, (total, count) in deltas.items()],
+            ordered=False,
+        )
+        await self.locations._invalidate_many(list(deltas))
@@ -0,0 +1,85 @@
+# app/repositories/location_tree.py
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Set
+
+from pymongo.collection import Collection
+
+
+class LocationTree:
+    """An in-memory snapshot of the location hierarchy (ids and parent links only).
+
+    Loaded once at startup and kept current by `refresh`, which the container
+    calls for every location write published on the invalidation bus. Used to
+    expand a location into its full descendant set without touching MongoDB.
+    """
+
+    def __init__(self, collection: Collection):
+        self.collection = collection
+        self._parents: Dict[str, List[str]] = {}
+        self._children: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def __contains__(self, location_id: str) -> bool:
+        return location_id in self._parents
+
+    def _link(self, location_id: str, parent_ids: List[str]) -> None:
+        self._unlink(location_id)
+        self._parents[location_id] = list(parent_ids)
+        for parent_id in parent_ids:
+            self._children[parent_id].add(location_id)
+
+    def _unlink(self, location_id: str) -> None:
+        for parent_id in self._parents.pop(location_id, []):
+            children = self._children.get(parent_id)
+            if children is not None:
+                children.discard(location_id)
+                if not children:
+                    del self._children[parent_id]
+
+    async def load(self) -> None:
+        """Rebuild the snapshot from the whole collection."""
+        parents: Dict[str, List[str]] = {}
+        async for document in self.collection.find({}, {"parent_ids": 1}):
+            parents[str(document["_id"])] = document.get("parent_ids", [])
+        self._parents = {}
+        self._children = defaultdict(set)
+        for location_id, parent_ids in parents.items():
+            self._link(location_id, parent_ids)
+
+    async def refresh(self, location_id: str) -> None:
+        """Re-read a single location after a write; removes it if it was deleted."""
+        document = await self.collection.find_one({"_id": location_id}, {"parent_ids": 1})
+        if document is None:
+            self._unlink(location_id)
+        else:
+            self._link(location_id, document.get("parent_ids", []))
+
+    def _walk(self, start: Iterable[str], edges: Dict[str, Iterable[str]]) -> List[str]:
+        # Breadth-first, nearest first; the visited set also guards against cycles in bad data.
+        visited: Set[str] = set()
+        ordered: List[str] = []
+        queue = deque(start)
+        while queue:
+            location_id = queue.popleft()
+            if location_id in visited:
+                continue
+            visited.add(location_id)
+            ordered.append(location_id)
+            queue.extend(edges.get(location_id, ()))
+        return ordered
+
+    def ancestors(self, location_id: str) -> List[str]:
+        return self._walk(self._parents.get(location_id, []), self._parents)
+
+    def descendants(self, location_id: str) -> List[str]:
+        return self._walk(self._children.get(location_id, ()), self._children)
+
+    def enclosing(self, location_ids: Iterable[str]) -> List[str]:
+        """The given locations plus every location containing them, each once."""
+        return self._walk(location_ids, self._parents)
+
+    def expand(self, location_ids: Iterable[str]) -> List[str]:
+        """The given locations plus everything inside them, e.g. for an `$in` filter."""
+        return self._walk(location_ids, self._children)
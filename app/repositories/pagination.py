@@ -0,0 +1,61 @@
+# app/repositories/pagination.py
+import base64
+from typing import Any, Dict, Optional, Tuple
+
+from bson import json_util
+from pymongo import ASCENDING, DESCENDING
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(sort_value: Any, document_id: Any) -> str:
+    """Encode the `(sort_key, _id)` of the last item on a page as an opaque token.
+
+    Extended JSON keeps BSON types such as datetimes, Decimal128 and ObjectId
+    intact across the round trip.
+    """
+    payload = json_util.dumps([sort_value, document_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, document_id = json_util.loads(payload)
+    except Exception as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    return sort_value, document_id
+
+
+def get_path(document: Dict[str, Any], path: str) -> Any:
+    """Read a dotted field path from a raw document."""
+    value: Any = document
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def keyset_filter(sort_field: str, direction: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """Build the filter selecting documents strictly after `cursor` in `(sort_field, _id)` order.
+
+    Nulls and missing values sort before every other value, matching MongoDB's
+    own ordering, so they are handled explicitly.
+    """
+    if not cursor:
+        return {}
+    sort_value, document_id = decode_cursor(cursor)
+    after = "$gt" if direction == ASCENDING else "$lt"
+    if sort_field == "_id":
+        return {"_id": {after: document_id}}
+    if sort_value is None:
+        if direction == ASCENDING:
+            return {"$or": [{sort_field: None, "_id": {after: document_id}}, {sort_field: {"$ne": None}}]}
+        return {sort_field: None, "_id": {after: document_id}}
+    branches = [{sort_field: {after: sort_value}}, {sort_field: sort_value, "_id": {after: document_id}}]
+    if direction == DESCENDING:
+        branches.append({sort_field: None})
+    return {"$or": branches}
@@ -0,0 +1,94 @@
+# src/repositories/price_history_repository.py
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReplaceOne
+from pymongo.collection import Collection
+from typing import Any, Dict, List, Optional
+from app.models.property_models.price_record import PriceRecord
+from app.repositories.base_repository import BaseRepository, QueryShape
+from app.schemas.pagination import Page, TotalCount
+from app.schemas.price import PricePoint, TrendInterval
+
+# Caps a trend at about ten years of monthly points (or a year of daily ones).
+MAX_TREND_POINTS = 400
+
+
+def trend_pipeline(match: Dict[str, Any], interval: TrendInterval) -> List[Dict[str, Any]]:
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$date_submitted", "unit": interval.value, "startOfWeek": "monday"}},
+            "average": {"$avg": "$amount"},
+            "minimum": {"$min": "$amount"},
+            "maximum": {"$max": "$amount"},
+            "average_price_per_sqm": {"$avg": "$price_per_sqm"},
+            "count": {"$sum": 1},
+        }},
+        {"$sort": {"_id": ASCENDING}},
+        {"$limit": MAX_TREND_POINTS},
+    ]
+
+
+class PriceHistoryRepository(BaseRepository):
+    """Every price submitted for a property, newest first per property.
+
+    Only `Property.current_price` lives on the property document, so property
+    reads stay the same size however often a property is repriced.
+    """
+    indexes = [
+        IndexModel([("property_id", ASCENDING), ("date_submitted", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("location_ids", ASCENDING), ("date_submitted", ASCENDING)]),
+    ]
+    query_shapes = [
+        QueryShape("get_history", {"property_id": "probe"}, [("date_submitted", DESCENDING), ("_id", DESCENDING)]),
+        QueryShape("trend", {}, pipeline=trend_pipeline(
+            {
+                "location_ids": {"$in": ["probe"]}, "currency": "EGP", "is_active": True,
+                "date_submitted": {"$ne": None, "$gte": datetime(2020, 1, 1)},
+            },
+            TrendInterval.MONTH,
+        )),
+    ]
+
+    def __init__(self, collection: Collection):
+        super().__init__(collection, PriceRecord)
+
+    async def record_many(self, records: List[PriceRecord]) -> None:
+        """Store records by id with one unordered bulk write, so recording the same price again keeps one record."""
+        if not records:
+            return
+        documents = [self._to_document(record) for record in records]
+        await self.collection.bulk_write(
+            [ReplaceOne({"_id": document["_id"]}, document, upsert=True) for document in documents], ordered=False
+        )
+        await self._invalidate_many([document["_id"] for document in documents])
+
+    async def get_history(
+        self, property_id: str, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE
+    ) -> Page[PriceRecord]:
+        return await self.paginate(
+            {"property_id": property_id}, limit, cursor, sort_field="date_submitted", direction=DESCENDING, total=total
+        )
+
+    async def trend(
+        self,
+        filter: Dict[str, Any],
+        interval: TrendInterval,
+        currency: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[PricePoint]:
+        """Prices matching `filter` downsampled to one point per interval, oldest first.
+
+        Grouping runs in the database, so the response size depends on the
+        interval and date range rather than on how many prices were submitted.
+        """
+        match: Dict[str, Any] = {**filter, "currency": currency, "is_active": True}
+        submitted: Dict[str, Any] = {"$ne": None}
+        if start is not None:
+            submitted["$gte"] = start
+        if end is not None:
+            submitted["$lt"] = end
+        match["date_submitted"] = submitted
+        pipeline = trend_pipeline(match, interval)
+        documents = await self.collection.aggregate(pipeline).to_list(length=MAX_TREND_POINTS)
+        return [PricePoint(period_start=document.pop("_id"), **document) for document in documents]
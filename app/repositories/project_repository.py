@@ -1,12 +1,28 @@
+from pymongo import ASCENDING, IndexModel
 from pymongo.collection import Collection
-from typing import List, Optional
-from app.models.developer_models.project import Project
-from app.repositories.base_repository import BaseRepository
+from typing import Any, AsyncIterator, Dict, Optional
+from app.models.developer_models.project import Project, ProjectStatus
+from app.repositories.base_repository import BaseRepository, QueryShape
+from app.repositories.entity_cache import EntityCache
+from app.repositories.projection import FieldSet
+from app.schemas.pagination import Page, TotalCount
 
 
 class ProjectRepository(BaseRepository):
-    def __init__(self, collection: Collection):
-        super().__init__(collection, Project)
+    indexes = [
+        IndexModel([("basic_info.name", ASCENDING)]),
+        IndexModel([("basic_info.developer_ids", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("external_id", ASCENDING)], unique=True, partialFilterExpression={"external_id": {"$type": "string"}}),
+    ]
+    query_shapes = [
+        QueryShape("get_by_name", {"basic_info.name": "probe"}),
+        QueryShape("get_all", {}, [("_id", ASCENDING)]),
+        QueryShape("upsert_by_external_id", {"external_id": {"$in": ["probe"], "$type": "string"}}),
+        QueryShape("stream_projects", {"basic_info.developer_ids": "probe"}, [("_id", ASCENDING)]),
+    ]
+
+    def __init__(self, collection: Collection, cache: Optional[EntityCache] = None):
+        super().__init__(collection, Project, cache)
 
     async def get_by_name(self, name: str) -> Optional[Project]:
         document = await self.collection.find_one({"basic_info.name": name})
@@ -14,7 +30,18 @@ class ProjectRepository(BaseRepository):
             return self.model(**document)
         return None
 
-    async def get_all(self) -> List[Project]:
-        cursor = self.collection.find({})
-        documents = await cursor.to_list(length=None)
-        return [self.model(**doc) for doc in documents]
+    async def get_all(
+        self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Project]:
+        return await self.paginate(limit=limit, cursor=cursor, total=total, fields=fields)
+
+    def stream_projects(
+        self, developer_id: Optional[str] = None, status: Optional[ProjectStatus] = None, after: Optional[str] = None
+    ) -> AsyncIterator[Project]:
+        query: Dict[str, Any] = {}
+        if developer_id is not None:
+            query["basic_info.developer_ids"] = developer_id
+        if status is not None:
+            query["basic_info.status"] = status
+        return self.stream(query, after)
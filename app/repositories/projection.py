@@ -0,0 +1,106 @@
+# app/repositories/projection.py
+import inspect
+import types
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, Field, create_model
+
+# A validated, normalised selection of dotted field paths, e.g. ("basic_info.name", "id").
+FieldSet = Tuple[str, ...]
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a `fields=` selection names paths the model does not have."""
+
+
+def _is_model(annotation: Any) -> bool:
+    return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+
+
+def _map_models(annotation: Any, fn: Callable[[Type[BaseModel]], Any]) -> Any:
+    """Apply `fn` to the models inside Optional/Union/List annotations, rebuilding the annotation."""
+    if _is_model(annotation):
+        return fn(annotation)
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return Union[tuple(_map_models(arg, fn) for arg in get_args(annotation))]
+    if origin in (list, List):
+        return List[_map_models(get_args(annotation)[0], fn)]
+    return annotation
+
+
+def _nested_models(annotation: Any) -> List[Type[BaseModel]]:
+    found: List[Type[BaseModel]] = []
+    _map_models(annotation, found.append)
+    return found
+
+
+@lru_cache(maxsize=None)
+def field_paths(model: Type[BaseModel]) -> FrozenSet[str]:
+    """Every selectable dotted path of a model, descending into nested models and lists of them."""
+    paths = set()
+    for name, info in model.model_fields.items():
+        paths.add(name)
+        for nested in _nested_models(info.annotation):
+            if nested is not model:
+                paths.update(f"{name}.{path}" for path in field_paths(nested))
+    return frozenset(paths)
+
+
+def parse_fields(model: Type[BaseModel], fields: str) -> FieldSet:
+    """Validate a comma separated `fields=` value against the model schema.
+
+    `id` is always included so partial items can still be addressed and paged.
+    Paths already covered by a selected parent are dropped.
+    """
+    requested = {path.strip() for path in fields.split(",") if path.strip()}
+    unknown = sorted(requested - field_paths(model))
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields for {model.__name__}: {', '.join(unknown)}")
+    if "id" in model.model_fields:
+        requested.add("id")
+    return tuple(sorted(
+        path for path in requested
+        if not any(path.startswith(f"{other}.") for other in requested)
+    ))
+
+
+def _storage_key(model: Type[BaseModel], name: str) -> str:
+    if name == "id":
+        return "_id"
+    return model.model_fields[name].alias or name
+
+
+def build_projection(model: Type[BaseModel], fields: FieldSet) -> Dict[str, int]:
+    """The MongoDB projection returning only the selected paths."""
+    projection = {}
+    for path in fields:
+        head, _, rest = path.partition(".")
+        key = _storage_key(model, head)
+        projection[f"{key}.{rest}" if rest else key] = 1
+    return projection
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: FieldSet) -> Type[BaseModel]:
+    """A model with only the selected fields, all optional, so nothing else is validated.
+
+    Field aliases are kept, so partial responses serialise like full ones.
+    """
+    selected: Dict[str, Optional[List[str]]] = {}
+    for path in fields:
+        head, _, rest = path.partition(".")
+        if not rest:
+            selected[head] = None
+        elif selected.get(head, []) is not None:
+            selected.setdefault(head, []).append(rest)
+
+    definitions = {}
+    for name, subpaths in selected.items():
+        info = model.model_fields[name]
+        annotation = info.annotation
+        if subpaths is not None:
+            annotation = _map_models(annotation, lambda nested: partial_model(nested, tuple(sorted(subpaths))))
+        definitions[name] = (Optional[annotation], Field(default=None, alias=info.alias))
+    return create_model(f"Partial{model.__name__}", **definitions)
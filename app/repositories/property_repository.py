@@ -1,18 +1,434 @@
 # src/repositories/property_repository.py
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from bson import Decimal128
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel, UpdateOne
 from pymongo.collection import Collection
-from typing import List, Optional
-from app.models.property_models.property import Property
-from app.repositories.base_repository import BaseRepository
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.database.config import BULK_CHUNK_SIZE
+from app.models.location_models.geo_point import GeoPoint
+from app.models.property_models.price import Price
+from app.models.property_models.price_record import PriceRecord
+from app.models.property_models.property import Property, PropertyType
+from app.repositories.base_repository import EXTERNAL_ID, BaseRepository, QueryShape
+from app.repositories.location_rollup import ROLLUP_PROJECTION, Change, LocationPriceRollup
+from app.repositories.price_history_repository import PriceHistoryRepository
+from app.repositories.pagination import encode_cursor, get_path, keyset_filter
+from app.schemas.property import (
+    FacetCount, PropertySearchFilters, PropertySearchRequest, PropertySearchResult, PropertySortField, RangeFilter,
+    SortOrder,
+)
+from app.schemas.bulk import SUCCESS_STATUSES, BulkItemResult, BulkItemStatus
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page, TotalCount
+
+SORT_FIELDS = {
+    PropertySortField.PRICE: "current_price.amount",
+    PropertySortField.AREA: "area",
+    PropertySortField.BEDROOMS: "bedrooms",
+    PropertySortField.DELIVERY_DATE: "delivery_date",
+}
+
+FACET_FIELDS = ["property_type", "usage_type", "finishing_type", "bedrooms"]
+
+
+def search_pipeline(query: Dict[str, Any], sort_field: str, direction: int, limit: int) -> List[Dict[str, Any]]:
+    return [
+        {"$match": query},
+        {"$sort": {sort_field: direction, "_id": direction}},
+        {"$limit": limit},
+    ]
+
+
+def facets_pipeline(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"$match": query},
+        {"$facet": {field: [{"$sortByCount": f"${field}"}] for field in FACET_FIELDS}},
+    ]
+
+
+# What a write needs of the document it changes: the rollup's fields and the whole current price.
+BEFORE_PROJECTION = {"is_active": 1, "location_ids": 1, "current_price": 1}
+
+
+def _latest_price(price: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline expression for `current_price`: `price`, unless the stored one was submitted later.
+
+    The rule `set_current_price` applies with its filter, for writes that carry a whole document.
+    """
+    return {"$cond": [
+        {"$gt": ["$current_price.date_submitted", price.get("date_submitted")]},
+        "$current_price",
+        {"$literal": price},
+    ]}
+
+
+def _replace_keeping_latest_price(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pipeline update replacing a property with `document` except for an older `current_price`.
+
+    The $project keeps only `_id` and the winning price, so fields `document`
+    does not have are removed, as by a replacement.
+    """
+    values = {key: {"$literal": value} for key, value in document.items() if key not in ("_id", "current_price")}
+    return [{"$project": {"current_price": _latest_price(document["current_price"])}}, {"$set": values}]
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC at MongoDB's millisecond precision, so stored and incoming dates compare."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _submitted_later(stored: Optional[Dict[str, Any]], price: Dict[str, Any]) -> bool:
+    """Whether `_latest_price` keeps the stored price over `price`."""
+    stored_date = _utc((stored or {}).get("date_submitted"))
+    if stored_date is None:
+        return False
+    date = _utc(price.get("date_submitted"))
+    return date is None or stored_date > date
+
+
+def _stored_price(before: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return before.get("current_price") if before else None
+
+
+def _as_written(before: Optional[Dict[str, Any]], document: Dict[str, Any]) -> Dict[str, Any]:
+    """`document` as a write through `_latest_price` leaves it, given the stored document `before`."""
+    price = document.get("current_price")
+    if price is not None and _submitted_later(_stored_price(before), price):
+        return {**document, "current_price": _stored_price(before)}
+    return document
+
+
+def _price_value(price: Optional[Dict[str, Any]]) -> Optional[Tuple[Any, ...]]:
+    if price is None:
+        return None
+    amount = price.get("amount")
+    amount = amount.to_decimal() if isinstance(amount, Decimal128) else Decimal(str(amount))
+    return _utc(price.get("date_submitted")), amount.normalize(), price.get("currency")
+
+
+def _record_id(property_id: Any, price: Dict[str, Any]) -> str:
+    """The price's own id, or one derived from the price, so importing it again never duplicates its record."""
+    if price.get("id"):
+        return price["id"]
+    date, amount, currency = _price_value(price)
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{property_id}|{date.isoformat() if date else ''}|{amount}|{currency}"))
+
+
+def _with_values(document: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    """A copy of `document` as a `$set` of `values` (dotted paths allowed) would leave it."""
+    document = dict(document)
+    for path, value in values.items():
+        *parents, leaf = path.split(".")
+        target = document
+        for key in parents:
+            target[key] = dict(target.get(key) or {})
+            target = target[key]
+        target[leaf] = value
+    return document
 
 
 class PropertyRepository(BaseRepository):
+    # Equality filters first, then the sort key and `_id` tie-breaker, so the
+    # common search shapes are served by an index scan in sort order.
+    indexes = [
+        IndexModel([("is_active", ASCENDING), ("property_type", ASCENDING), ("current_price.amount", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("is_active", ASCENDING), ("usage_type", ASCENDING), ("current_price.amount", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("is_active", ASCENDING), ("location_ids", ASCENDING), ("current_price.amount", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("is_active", ASCENDING), ("current_price.amount", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("is_active", ASCENDING), ("area", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("is_active", ASCENDING), ("bedrooms", ASCENDING), ("current_price.amount", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("is_active", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("coordinates", GEOSPHERE), ("is_active", ASCENDING), ("property_type", ASCENDING)]),
+        IndexModel([("external_id", ASCENDING)], unique=True, partialFilterExpression={"external_id": {"$type": "string"}}),
+    ]
+    query_shapes = [
+        QueryShape("get_all_ids", {}, [("_id", ASCENDING)]),
+        QueryShape("get_active_properties_ids", {"is_active": True}),
+        QueryShape("search", {}, pipeline=search_pipeline(
+            {"is_active": True, "property_type": {"$in": ["apartment"]}}, "current_price.amount", ASCENDING, 21,
+        )),
+        QueryShape("search_by_location", {}, pipeline=search_pipeline(
+            {"is_active": True, "location_ids": {"$in": ["probe"]}}, "current_price.amount", DESCENDING, 21,
+        )),
+        QueryShape("search_facets", {}, pipeline=facets_pipeline({"is_active": True, "property_type": {"$in": ["apartment"]}})),
+        QueryShape("upsert_by_external_id", {"external_id": {"$in": ["probe"], "$type": "string"}}),
+        QueryShape("stream_properties", {"is_active": True}, [("_id", ASCENDING)]),
+        QueryShape("near", {
+            "coordinates": {"$nearSphere": {"$geometry": {"type": "Point", "coordinates": [31.23, 30.04]}, "$maxDistance": 3000}},
+            "is_active": True,
+        }),
+    ]
+
     def __init__(self, collection: Collection):
         super().__init__(collection, Property)
+        # Set by the container; every write below then feeds Location.average_price_m2.
+        self.rollup: Optional[LocationPriceRollup] = None
+        # Set by the container; writes carrying a new current_price then record it in the price history.
+        self.price_history: Optional[PriceHistoryRepository] = None
 
-    async def get_all_ids(self) -> List[str]:
-        cursor = self.collection.find({}, {"_id": 1})
-        return [doc["_id"] for doc in await cursor.to_list(length=None)]
+    async def _roll_up(self, changes: List[Change]) -> None:
+        if self.rollup is not None and changes:
+            await self.rollup.apply(changes)
+
+    async def _before_documents(self, query: Dict[str, Any], key: str = "_id") -> Dict[Any, Dict[str, Any]]:
+        """What the rollup and price history need of the documents a bulk write is about to change, by `key`."""
+        if self.rollup is None and self.price_history is None:
+            return {}
+        projection = {**BEFORE_PROJECTION, key: 1}
+        return {document[key]: document for document in await self.collection.find(query, projection).to_list(length=None)}
+
+    async def _written(self, changes: List[Change]) -> None:
+        """Roll up and record the prices of documents just written whole, as (stored before, document sent)."""
+        await self._roll_up([(before, _as_written(before, document)) for before, document in changes])
+        if self.price_history is None:
+            return
+        records = []
+        for before, document in changes:
+            price = document.get("current_price")
+            if price is None or _price_value(price) == _price_value(_stored_price(before)):
+                continue
+            property_id = before["_id"] if before else document["_id"]
+            records.append(PriceRecord(
+                **{**price, "id": _record_id(property_id, price), "date_submitted": price.get("date_submitted") or datetime.now()},
+                property_id=property_id,
+                location_ids=document.get("location_ids") or [],
+            ))
+        await self.price_history.record_many(records)
+
+    def _replace_operation(self, document: Dict[str, Any]) -> Any:
+        if document.get("current_price") is None:
+            return super()._replace_operation(document)
+        return UpdateOne({"_id": document["_id"]}, _replace_keeping_latest_price(document))
+
+    def _upsert_operation(self, document: Dict[str, Any], document_id: Any) -> Any:
+        if document.get("current_price") is None:
+            return super()._upsert_operation(document, document_id)
+        values = {key: {"$literal": value} for key, value in document.items()}
+        values["current_price"] = _latest_price(document["current_price"])
+        # A pipeline update cannot use $setOnInsert; an existing document keeps its _id.
+        values["_id"] = {"$ifNull": ["$_id", {"$literal": document_id}]}
+        return UpdateOne({EXTERNAL_ID: {"$eq": document[EXTERNAL_ID], "$type": "string"}}, [{"$set": values}], upsert=True)
+
+    async def save(self, aggregate: Property) -> None:
+        await super().save(aggregate)
+        await self._written([(None, self._to_document(aggregate))])
+
+    async def update(self, aggregate: Property) -> None:
+        """Replace a property, keeping its current price if the stored one was submitted later."""
+        document = self._to_document(aggregate)
+        if document.get("current_price") is None:
+            before = await self.collection.find_one_and_replace(
+                {"_id": aggregate.id}, document, projection=BEFORE_PROJECTION
+            )
+        else:
+            before = await self.collection.find_one_and_update(
+                {"_id": aggregate.id}, _replace_keeping_latest_price(document), projection=BEFORE_PROJECTION
+            )
+        await self._invalidate(aggregate.id)
+        if before is not None:
+            await self._written([(before, document)])
+
+    async def delete(self, aggregate_id: str) -> None:
+        before = await self.collection.find_one_and_delete({"_id": aggregate_id}, projection=ROLLUP_PROJECTION)
+        await self._invalidate(aggregate_id)
+        await self._roll_up([(before, None)])
+
+    async def _set_active(self, aggregate_id: str, is_active: bool) -> None:
+        before = await self.collection.find_one_and_update(
+            {"_id": aggregate_id}, {"$set": {"is_active": is_active}}, projection=ROLLUP_PROJECTION
+        )
+        await self._invalidate(aggregate_id)
+        if before is not None:
+            await self._roll_up([(before, {**before, "is_active": is_active})])
+
+    async def activate(self, aggregate_id: str) -> None:
+        await self._set_active(aggregate_id, True)
+
+    async def deactivate(self, aggregate_id: str) -> None:
+        await self._set_active(aggregate_id, False)
+
+    async def insert_many(self, aggregates: List[Property], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        results = await super().insert_many(aggregates, chunk_size)
+        await self._written([
+            (None, self._to_document(aggregates[result.index]))
+            for result in results if result.status == BulkItemStatus.CREATED
+        ])
+        return results
+
+    async def replace_many(self, aggregates: List[Property], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        """Replace properties in bulk; like `update`, an older current price does not replace a later one."""
+        before = await self._before_documents({"_id": {"$in": [aggregate.id for aggregate in aggregates]}})
+        results = await super().replace_many(aggregates, chunk_size)
+        await self._written([
+            (before.get(aggregates[result.index].id), self._to_document(aggregates[result.index]))
+            for result in results if result.status == BulkItemStatus.UPDATED
+        ])
+        return results
+
+    async def set_many(self, aggregate_ids: List[Any], values: Dict[str, Any], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        before = await self._before_documents({"_id": {"$in": list(aggregate_ids)}})
+        results = await super().set_many(aggregate_ids, values, chunk_size)
+        await self._roll_up([
+            (before[result.id], _with_values(before[result.id], values))
+            for result in results if result.status == BulkItemStatus.UPDATED and result.id in before
+        ])
+        return results
+
+    async def upsert_by_external_id(self, aggregates: List[Property], chunk_size: int = BULK_CHUNK_SIZE) -> List[BulkItemResult]:
+        """Create or update properties by `external_id`; an older current price does not replace a later one."""
+        keys = [aggregate.external_id for aggregate in aggregates]
+        before = await self._before_documents({EXTERNAL_ID: {"$in": keys, "$type": "string"}}, key=EXTERNAL_ID)
+        results = await super().upsert_by_external_id(aggregates, chunk_size)
+        await self._written([
+            (before.get(keys[result.index]), self._to_document(aggregates[result.index]))
+            for result in results if result.status in SUCCESS_STATUSES
+        ])
+        return results
+
+    async def get_all_ids(self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE) -> Page[str]:
+        return await self.paginate(
+            limit=limit, cursor=cursor, total=total, projection={"_id": 1}, to_item=lambda doc: doc["_id"]
+        )
+
+    async def set_current_price(self, property_id: str, price: Price) -> bool:
+        """Make `price` the current price unless a later one is already set, in one atomic update.
+
+        Returns False when the property does not exist or already has a later price.
+        """
+        current_price = price.dict()
+        before = await self.collection.find_one_and_update(
+            {"_id": property_id, "$or": [
+                {"current_price": None},
+                {"current_price.date_submitted": {"$lte": price.date_submitted}},
+                {"current_price.date_submitted": None},
+            ]},
+            {"$set": {"current_price": current_price}},
+            projection=ROLLUP_PROJECTION,
+        )
+        await self._invalidate(property_id)
+        if before is None:
+            return False
+        await self._roll_up([(before, {**before, "current_price": current_price})])
+        return True
 
     async def get_active_properties_ids(self) -> List[str]:
         cursor = self.collection.find({"is_active": True}, {"_id": 1})
         return [doc["_id"] for doc in await cursor.to_list(length=None)]
+
+    @staticmethod
+    def _range(range_filter: Optional[RangeFilter]) -> Optional[Dict[str, Any]]:
+        if range_filter is None:
+            return None
+        bounds = {}
+        if range_filter.min is not None:
+            bounds["$gte"] = range_filter.min
+        if range_filter.max is not None:
+            bounds["$lte"] = range_filter.max
+        return bounds or None
+
+    def _search_filter(self, filters: PropertySearchFilters) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if filters.is_active is not None:
+            query["is_active"] = filters.is_active
+        for field, values in (
+            ("property_type", filters.property_types),
+            ("usage_type", filters.usage_types),
+            ("finishing_type", filters.finishing_types),
+            ("location_ids", filters.location_ids),
+        ):
+            if values:
+                query[field] = {"$in": list(values)}
+        for field, range_filter in (
+            ("bedrooms", filters.bedrooms),
+            ("area", filters.area),
+            ("current_price.amount", filters.price),
+        ):
+            bounds = self._range(range_filter)
+            if bounds:
+                query[field] = bounds
+        return query
+
+    async def search(self, request: PropertySearchRequest) -> PropertySearchResult:
+        """Filter, sort and page properties, with the total and facet counts when asked for.
+
+        The page is a $match on the filters and the keyset cursor, then $sort
+        and $limit, so with the compound indexes above a deep page is an index
+        seek rather than a scan from the start of the match. The total and the
+        facets need the whole match and are computed, concurrently, only on the
+        first page unless `include_total`/`include_facets` say otherwise.
+        """
+        sort_field = SORT_FIELDS[request.sort_by]
+        direction = DESCENDING if request.sort_order == SortOrder.DESC else ASCENDING
+        first_page = request.cursor is None
+        include_total = first_page if request.include_total is None else request.include_total
+        include_facets = first_page if request.include_facets is None else request.include_facets
+
+        query = self._search_filter(request.filters)
+        page_query = query
+        after = keyset_filter(sort_field, direction, request.cursor)
+        if after:
+            page_query = {"$and": [query, after]} if query else after
+        pipeline = search_pipeline(page_query, sort_field, direction, request.limit + 1)
+        documents, total, facets = await asyncio.gather(
+            self.collection.aggregate(pipeline).to_list(length=request.limit + 1),
+            self.count(query, TotalCount.EXACT if include_total else TotalCount.NONE),
+            self._facets(query, include_facets),
+        )
+
+        next_cursor = None
+        if len(documents) > request.limit:
+            documents = documents[:request.limit]
+            last = documents[-1]
+            next_cursor = encode_cursor(get_path(last, sort_field), last["_id"])
+        return PropertySearchResult(
+            items=[self._to_model(doc) for doc in documents],
+            total=total,
+            next_cursor=next_cursor,
+            facets=facets,
+        )
+
+    async def _facets(self, query: Dict[str, Any], include: bool) -> Dict[str, List[FacetCount]]:
+        """Counts of each value of the facet fields over the whole match, in one aggregation."""
+        if not include:
+            return {}
+        result = (await self.collection.aggregate(facets_pipeline(query)).to_list(length=1))[0]
+        return {
+            field: [FacetCount(value=bucket["_id"], count=bucket["count"]) for bucket in result[field]]
+            for field in FACET_FIELDS
+        }
+
+    async def near(
+        self,
+        point: GeoPoint,
+        max_distance_m: float,
+        property_types: Optional[List[PropertyType]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> NearbyPage[Property]:
+        query: Dict[str, Any] = {"is_active": True}
+        if property_types:
+            query["property_type"] = {"$in": property_types}
+        return await self._near(point, max_distance_m, query, limit, cursor)
+
+    def stream_properties(
+        self,
+        is_active: Optional[bool] = None,
+        property_types: Optional[List[PropertyType]] = None,
+        location_id: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> AsyncIterator[Property]:
+        query: Dict[str, Any] = {}
+        if is_active is not None:
+            query["is_active"] = is_active
+        if property_types:
+            query["property_type"] = {"$in": property_types}
+        if location_id is not None:
+            query["location_ids"] = location_id
+        return self.stream(query, after)
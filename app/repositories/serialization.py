@@ -0,0 +1,101 @@
+# app/repositories/serialization.py
+import inspect
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+import orjson
+from bson import Decimal128, ObjectId
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+# Default factories whose value is the same every time, so it can be computed once.
+_CONSTANT_FACTORIES = (list, dict, set)
+
+
+def _default(value: Any) -> Any:
+    # Matches pydantic's JSON output for the BSON types orjson does not know.
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (Decimal, ObjectId)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _nested_model(annotation: Any) -> Optional[Tuple[Type[BaseModel], bool]]:
+    """The model held by a field, and whether it is a list of them, looking through Optional."""
+    if get_origin(annotation) is Union:
+        arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+        if len(arguments) != 1:
+            return None
+        annotation = arguments[0]
+    many = get_origin(annotation) in (list, List)
+    if many:
+        annotation = get_args(annotation)[0]
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return annotation, many
+    return None
+
+
+class _Plan:
+    """Per-model defaults for missing keys and the nested fields to descend into."""
+    __slots__ = ("defaults", "nested")
+
+    def __init__(self):
+        self.defaults: Dict[str, Any] = {}
+        self.nested: Dict[str, Tuple["_Plan", bool]] = {}
+
+
+def _compile(model: Type[BaseModel], plans: Dict[Type[BaseModel], _Plan]) -> _Plan:
+    if model in plans:
+        return plans[model]
+    plan = plans[model] = _Plan()
+    for name, info in model.model_fields.items():
+        key = info.alias or name
+        if key not in ("id", "_id"):
+            if info.default is not PydanticUndefined:
+                plan.defaults[key] = info.default
+            elif info.default_factory in _CONSTANT_FACTORIES:
+                plan.defaults[key] = info.default_factory()
+        nested = _nested_model(info.annotation)
+        if nested is not None:
+            plan.nested[key] = (_compile(nested[0], plans), nested[1])
+    return plan
+
+
+def _fill(document: Dict[str, Any], plan: _Plan) -> Dict[str, Any]:
+    # Always copies, so cached documents are never modified.
+    document = {**plan.defaults, **document}
+    for key, (nested, many) in plan.nested.items():
+        value = document.get(key)
+        if value is not None:
+            document[key] = [_fill(item, nested) for item in value] if many else _fill(value, nested)
+    return document
+
+
+class DocumentSerializer:
+    """Serialises stored documents straight to JSON bytes for trusted reads.
+
+    Documents written through our own repositories were validated on the way
+    in, so reads can skip building models and FastAPI's response validation.
+    Keys follow the model's aliases (`_id` for aliased ids, `id` otherwise) and
+    missing fields get the model's static defaults, so the payload has the same
+    shape as a validated response. Enums are already their values in BSON.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        id_field = model.model_fields.get("id")
+        self.rename_id = id_field is not None and id_field.alias != "_id"
+        self.plan = _compile(model, {})
+
+    def to_dict(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        document = _fill(document, self.plan)
+        if self.rename_id and "_id" in document:
+            document["id"] = str(document.pop("_id"))
+        return document
+
+    def dumps(self, document: Optional[Dict[str, Any]]) -> bytes:
+        if document is None:
+            return b"null"
+        return orjson.dumps(self.to_dict(document), default=_default)
@@ -1,24 +1,44 @@
 # src/repositories/user_repository.py
+from pymongo import ASCENDING, IndexModel
 from pymongo.collection import Collection
-from typing import List, Optional
-from app.models.user_models.user import User
-from app.repositories.base_repository import BaseRepository
+from typing import AsyncIterator, List, Optional
+from app.models.user_models.user import User, UserRole
+from app.repositories.base_repository import BaseRepository, QueryShape
+from app.repositories.entity_cache import EntityCache
+from app.repositories.projection import FieldSet
+from app.schemas.pagination import Page, TotalCount
 
 
 class UserRepository(BaseRepository):
-    def __init__(self, collection: Collection):
-        super().__init__(collection, User)
+    indexes = [
+        IndexModel(
+            [("email.address", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"email.address": {"$type": "string"}},
+        ),
+        IndexModel([("role", ASCENDING), ("_id", ASCENDING)]),
+    ]
+    query_shapes = [
+        QueryShape("get_by_email", {"email.address": "probe@example.com"}),
+        QueryShape("get_users_by_role", {"role": "user"}, [("_id", ASCENDING)]),
+        QueryShape("get_users_ids_by_role", {"role": "user"}),
+        QueryShape("stream_users", {"role": "user"}, [("_id", ASCENDING)]),
+    ]
+
+    def __init__(self, collection: Collection, cache: Optional[EntityCache] = None):
+        super().__init__(collection, User, cache)
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        document = await self.collection.find_one({"email": email})
+        document = await self.collection.find_one({"email.address": email})
         if document:
             return self.model(**document)
         return None
 
-    async def get_users_by_role(self, role: str, skip: int = 0, limit: int = 50) -> List[User]:
-        cursor = self.collection.find({"role": role}).skip(skip).limit(limit)
-        documents = await cursor.to_list(length=limit)
-        return [self.model(**doc) for doc in documents]
+    async def get_users_by_role(
+        self, role: str, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[User]:
+        return await self.paginate({"role": role}, limit, cursor, total=total, fields=fields)
 
     async def get_users_ids_by_role(self, role: str) -> List[str]:
         cursor = self.collection.find({"role": role}, {"_id": 1})
@@ -27,3 +47,6 @@ class UserRepository(BaseRepository):
     async def get_user_role_by_id(self, user_id: str) -> Optional[str]:
         document = await self.collection.find_one({"_id": user_id}, {"role": 1})
         return document["role"] if document else None
+
+    def stream_users(self, role: Optional[UserRole] = None, after: Optional[str] = None) -> AsyncIterator[User]:
+        return self.stream({"role": role} if role is not None else {}, after)
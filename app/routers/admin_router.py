@@ -0,0 +1,17 @@
+# app/routers/admin_router.py
+from fastapi import APIRouter, Depends, Request
+from typing import List
+from app.database.session import db_session
+from app.dependencies import admin_user, get_container
+from app.schemas.admin import CacheStats, DatabasePoolReport
+
+# Pool and cache internals, including the principal cache: admins only.
+router = APIRouter(dependencies=[Depends(admin_user)])
+
+@router.get("/db/pool", response_model=DatabasePoolReport)
+async def get_database_pool():
+    return db_session.pool_report()
+
+@router.get("/cache", response_model=List[CacheStats])
+async def get_cache_stats(request: Request):
+    return [cache.stats() for cache in get_container(request).caches]
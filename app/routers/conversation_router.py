@@ -1,35 +1,94 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Optional
+from app.config import settings
 from app.controllers.conversation_controller import ConversationController
-from app.database.collections import get_conversation_collection
-from app.repositories.conversation_repository import ConversationRepository
-from app.services.conversation_service import ConversationService
-from app.models.conversation_models.conversation import Conversation, ConversationStatus
+from app.dependencies import PageParams, batch_ids, get_container
+from app.repositories.conversation_repository import WriteConflictError
+from app.models.conversation_models.conversation import Conversation, ConversationStatus, Message, Response
+from app.schemas.batch import Batch
+from app.repositories.pagination import InvalidCursorError
+from app.schemas.conversation import ConversationSummary, MessagePage
+from app.schemas.pagination import Page
+from app.routers.responses import json_response
 
 router = APIRouter()
 
 # Dependency to get the ConversationController
-async def get_conversation_controller() -> ConversationController:
-    conversation_collection = await get_conversation_collection()
-    repository = ConversationRepository(conversation_collection)
-    service = ConversationService(repository)
-    return ConversationController(service)
+async def get_conversation_controller(request: Request) -> ConversationController:
+    return get_container(request).conversation_controller
 
 # Create a new conversation
 @router.post("/", response_model=Conversation)
 async def create_conversation(conversation: Conversation, controller: ConversationController = Depends(get_conversation_controller)):
     return await controller.create_conversation(conversation)
 
+# Declared before /{conversation_id} so "batch" is not taken for an id.
+@router.get("/batch", response_model=Batch[Conversation])
+async def get_conversations_batch(
+    ids: List[str] = Depends(batch_ids), controller: ConversationController = Depends(get_conversation_controller)
+):
+    """Many conversations by id in one query, in the order given; unknown ids are listed in `missing`."""
+    return await controller.get_conversations_by_ids(ids)
+
 # Get a conversation by ID
 @router.get("/{conversation_id}", response_model=Conversation)
 async def get_conversation(conversation_id: str, controller: ConversationController = Depends(get_conversation_controller)):
     print(conversation_id)
-    return await controller.get_conversation(conversation_id)
+    if settings.TRUSTED_READS:
+        return json_response(await controller.get_conversation_json(conversation_id), "Conversation not found")
+    conversation = await controller.get_conversation(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return conversation
+
+# Get a page of messages, newest page first; pass `before` from `next_before` to page back
+@router.get("/{conversation_id}/messages", response_model=MessagePage)
+async def get_conversation_messages(
+    conversation_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    before: Optional[int] = Query(None, ge=1),
+    controller: ConversationController = Depends(get_conversation_controller),
+):
+    page = await controller.get_conversation_history(conversation_id, limit, offset, before)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return page
+
+# Append a message; the server assigns its number
+@router.post("/{conversation_id}/messages", response_model=Message)
+async def add_message(conversation_id: str, message: Message, controller: ConversationController = Depends(get_conversation_controller)):
+    try:
+        appended = await controller.add_message(conversation_id, message)
+    except WriteConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if appended is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return appended
+
+# Attach the assistant response to the last message
+@router.post("/{conversation_id}/messages/response", response_model=Message)
+async def add_response(conversation_id: str, response: Response, controller: ConversationController = Depends(get_conversation_controller)):
+    try:
+        message = await controller.add_response(conversation_id, response)
+    except WriteConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if message is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return message
 
-# Get all conversations for a specific user
-@router.get("/user/{user_id}", response_model=List[Conversation])
-async def get_conversations_by_user(user_id: str, controller: ConversationController = Depends(get_conversation_controller)):
-    return await controller.get_conversations_by_user(user_id)
+# A page of a user's conversation summaries (no messages), most recent first
+@router.get("/user/{user_id}", response_model=Page[ConversationSummary])
+async def get_conversations_by_user(
+    user_id: str,
+    status: Optional[ConversationStatus] = None,
+    page: PageParams = Depends(),
+    controller: ConversationController = Depends(get_conversation_controller),
+):
+    try:
+        return await controller.get_conversations_by_user(user_id, status, page.limit, page.cursor, page.total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # Update a conversation
 @router.put("/{conversation_id}", response_model=Conversation)
@@ -42,7 +101,14 @@ async def delete_conversation(conversation_id: str, controller: ConversationCont
     await controller.delete_conversation(conversation_id)
     return {"message": "Conversation deleted successfully"}
 
-# Get conversations by status
-@router.get("/status/{status}", response_model=List[Conversation])
-async def get_conversations_by_status(status: ConversationStatus, controller: ConversationController = Depends(get_conversation_controller)):
-    return await controller.get_conversations_by_status(status)
+# A page of conversation summaries with this status across all users, most recent first
+@router.get("/status/{status}", response_model=Page[ConversationSummary])
+async def get_conversations_by_status(
+    status: ConversationStatus,
+    page: PageParams = Depends(),
+    controller: ConversationController = Depends(get_conversation_controller),
+):
+    try:
+        return await controller.get_conversations_by_status(status, page.limit, page.cursor, page.total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,31 +1,67 @@
 # app/routers/developer_router.py
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import List, Optional
+from app.config import settings
 from app.controllers.developer_controller import DeveloperController
-from app.repositories.developer_repository import DeveloperRepository
-from app.database.collections import get_developer_collection
-from app.services.developer_service import DeveloperService
+from app.dependencies import PageParams, SparseFields, batch_ids, get_container
 from app.models.developer_models.developer import Developer
+from app.repositories.pagination import InvalidCursorError
+from app.repositories.projection import FieldSet
+from app.routers.responses import json_response, partial_response
+from app.routers.streaming import ndjson_response
+from app.schemas.batch import Batch
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
-async def get_developer_controller() -> DeveloperController:
-    developer_collection = await get_developer_collection()
-    repository = DeveloperRepository(developer_collection)
-    service = DeveloperService(repository)
-    return DeveloperController(service)
+async def get_developer_controller(request: Request) -> DeveloperController:
+    return get_container(request).developer_controller
 
 @router.post("/", response_model=Developer)
 async def create_developer(developer: Developer, controller: DeveloperController = Depends(get_developer_controller)):
     return await controller.create_developer(developer)
 
+# Declared before /{developer_id} so "export" is not taken for an id.
+@router.get("/export")
+async def export_developers(after: Optional[str] = None, controller: DeveloperController = Depends(get_developer_controller)):
+    """All developers as NDJSON in id order; pass the last id received as `after` to resume."""
+    return ndjson_response(controller.export_developers(after))
+
+# Declared before /{developer_id} so "batch" is not taken for an id.
+@router.get("/batch", response_model=Batch[Developer])
+async def get_developers_batch(
+    ids: List[str] = Depends(batch_ids),
+    fields: Optional[FieldSet] = Depends(SparseFields(Developer)),
+    controller: DeveloperController = Depends(get_developer_controller),
+):
+    """Many developers by id in one query, in the order given; unknown ids are listed in `missing`."""
+    developers = await controller.get_developers_by_ids(ids, fields)
+    return partial_response(developers) if fields else developers
+
 @router.get("/{developer_id}", response_model=Developer)
-async def get_developer(developer_id: str, controller: DeveloperController = Depends(get_developer_controller)):
-    return await controller.get_developer_by_id(developer_id)
+async def get_developer(
+    developer_id: str,
+    fields: Optional[FieldSet] = Depends(SparseFields(Developer)),
+    controller: DeveloperController = Depends(get_developer_controller),
+):
+    if settings.TRUSTED_READS and not fields:
+        return json_response(await controller.get_developer_json(developer_id), "Developer not found")
+    developer = await controller.get_developer_by_id(developer_id, fields)
+    if developer is None:
+        raise HTTPException(status_code=404, detail="Developer not found")
+    return partial_response(developer) if fields else developer
 
-@router.get("/", response_model=List[Developer])
-async def get_all_developers(controller: DeveloperController = Depends(get_developer_controller)):
-    return await controller.get_all_developers()
+@router.get("/", response_model=Page[Developer])
+async def get_all_developers(
+    page: PageParams = Depends(),
+    fields: Optional[FieldSet] = Depends(SparseFields(Developer)),
+    controller: DeveloperController = Depends(get_developer_controller),
+):
+    try:
+        developers = await controller.get_all_developers(page.limit, page.cursor, page.total, fields)
+        return partial_response(developers) if fields else developers
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/", response_model=Developer)
 async def update_developer(developer: Developer, controller: DeveloperController = Depends(get_developer_controller)):
@@ -1,31 +1,82 @@
 # app/routers/location_router.py
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import List, Optional
+from app.config import settings
 from app.controllers.location_controller import LocationController
-from app.repositories.location_repository import LocationRepository
-from app.database.collections import get_location_collection
-from app.services.location_service import LocationService
+from app.dependencies import PageParams, SparseFields, TrendParams, batch_ids, get_container
+from app.models.location_models.geo_point import GeoPoint
 from app.models.location_models.location import Location, LocationType
+from app.repositories.pagination import InvalidCursorError
+from app.repositories.projection import FieldSet
+from app.routers.responses import json_response, partial_response
+from app.schemas.batch import Batch
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page
+from app.schemas.price import PriceTrend
 
 router = APIRouter()
 
-async def get_location_controller() -> LocationController:
-    location_collection = await get_location_collection()
-    repository = LocationRepository(location_collection)
-    service = LocationService(repository)
-    return LocationController(service)
+async def get_location_controller(request: Request) -> LocationController:
+    return get_container(request).location_controller
 
 @router.post("/", response_model=Location)
 async def create_location(location: Location, controller: LocationController = Depends(get_location_controller)):
     return await controller.create_location(location)
 
+# Declared before /{location_id} so "near" is not taken for an id.
+@router.get("/near", response_model=NearbyPage[Location])
+async def get_locations_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    max_distance_m: float = Query(3000, gt=0, le=50000),
+    location_type: Optional[List[LocationType]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    controller: LocationController = Depends(get_location_controller),
+):
+    try:
+        return await controller.get_locations_near(
+            GeoPoint.from_lat_lng(lat, lng), max_distance_m, location_type, limit, cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Declared before /{location_id} so "batch" is not taken for an id.
+@router.get("/batch", response_model=Batch[Location])
+async def get_locations_batch(
+    ids: List[str] = Depends(batch_ids),
+    fields: Optional[FieldSet] = Depends(SparseFields(Location)),
+    controller: LocationController = Depends(get_location_controller),
+):
+    """Many locations by id in one query, in the order given; unknown ids are listed in `missing`."""
+    locations = await controller.get_locations_by_ids(ids, fields)
+    return partial_response(locations) if fields else locations
+
 @router.get("/{location_id}", response_model=Location)
-async def get_location(location_id: str, controller: LocationController = Depends(get_location_controller)):
-    return await controller.get_location_by_id(location_id)
+async def get_location(
+    location_id: str,
+    fields: Optional[FieldSet] = Depends(SparseFields(Location)),
+    controller: LocationController = Depends(get_location_controller),
+):
+    if settings.TRUSTED_READS and not fields:
+        return json_response(await controller.get_location_json(location_id), "Location not found")
+    location = await controller.get_location_by_id(location_id, fields)
+    if location is None:
+        raise HTTPException(status_code=404, detail="Location not found")
+    return partial_response(location) if fields else location
 
-@router.get("/type/{location_type}", response_model=List[Location])
-async def get_locations_by_type(location_type: LocationType, controller: LocationController = Depends(get_location_controller)):
-    return await controller.get_locations_by_type(location_type)
+@router.get("/type/{location_type}", response_model=Page[Location])
+async def get_locations_by_type(
+    location_type: LocationType,
+    page: PageParams = Depends(),
+    fields: Optional[FieldSet] = Depends(SparseFields(Location)),
+    controller: LocationController = Depends(get_location_controller),
+):
+    try:
+        locations = await controller.get_locations_by_type(location_type, page.limit, page.cursor, page.total, fields)
+        return partial_response(locations) if fields else locations
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{location_id}/children", response_model=List[Location])
 async def get_direct_children(location_id: str, controller: LocationController = Depends(get_location_controller)):
@@ -33,7 +84,31 @@ async def get_direct_children(location_id: str, controller: LocationController =
 
 @router.get("/{location_id}/parents", response_model=List[Location])
 async def get_direct_parents(location_id: str, controller: LocationController = Depends(get_location_controller)):
-    return await controller.get_direct_parents(location_id)
+    parents = await controller.get_direct_parents(location_id)
+    if parents is None:
+        raise HTTPException(status_code=404, detail="Location not found")
+    return parents
+
+@router.get("/{location_id}/ancestors", response_model=List[Location])
+async def get_ancestors(location_id: str, controller: LocationController = Depends(get_location_controller)):
+    ancestors = await controller.get_ancestors(location_id)
+    if ancestors is None:
+        raise HTTPException(status_code=404, detail="Location not found")
+    return ancestors
+
+@router.get("/{location_id}/descendants", response_model=List[Location])
+async def get_descendants(location_id: str, controller: LocationController = Depends(get_location_controller)):
+    descendants = await controller.get_descendants(location_id)
+    if descendants is None:
+        raise HTTPException(status_code=404, detail="Location not found")
+    return descendants
+
+@router.get("/{location_id}/prices/trend", response_model=PriceTrend)
+async def get_price_trend(
+    location_id: str, trend: TrendParams = Depends(), controller: LocationController = Depends(get_location_controller)
+):
+    """Prices submitted for properties in this location or any location inside it."""
+    return await controller.get_price_trend(location_id, trend.interval, trend.currency, trend.start, trend.end)
 
 @router.put("/", response_model=Location)
 async def update_location(location: Location, controller: LocationController = Depends(get_location_controller)):
@@ -0,0 +1,27 @@
+# app/routers/payment_plan_router.py
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.controllers.payment_plan_controller import PaymentPlanController
+from app.dependencies import get_container
+from app.schemas.payment_plan import PaymentSchedule, ScheduleBatchRequest, ScheduleBatchResult, ScheduleRequest
+from app.services.payment_plan_service import InvalidPlanError
+
+router = APIRouter()
+
+async def get_payment_plan_controller(request: Request) -> PaymentPlanController:
+    return get_container(request).payment_plan_controller
+
+# Plain `def` routes: schedules are CPU work, so FastAPI runs them in its threadpool
+# instead of on the event loop.
+@router.post("/schedule", response_model=PaymentSchedule)
+def schedule(request: ScheduleRequest, controller: PaymentPlanController = Depends(get_payment_plan_controller)):
+    try:
+        return controller.schedule(request.price, request.plan)
+    except InvalidPlanError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/schedule/batch", response_model=ScheduleBatchResult)
+def schedule_batch(request: ScheduleBatchRequest, controller: PaymentPlanController = Depends(get_payment_plan_controller)):
+    try:
+        return controller.schedule_batch(request)
+    except InvalidPlanError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,31 +1,92 @@
 # app/routers/project_router.py
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from typing import Any, Dict, List, Optional
+from app.config import settings
 from app.controllers.project_controller import ProjectController
-from app.repositories.project_repository import ProjectRepository
-from app.database.collections import get_project_collection
-from app.services.project_service import ProjectService
-from app.models.developer_models.project import Project
+from app.dependencies import PageParams, SparseFields, batch_ids, get_container
+from app.models.developer_models.project import Project, ProjectStatus
+from app.repositories.pagination import InvalidCursorError
+from app.repositories.projection import FieldSet
+from app.routers.responses import json_response, partial_response
+from app.routers.streaming import ndjson_response
+from app.schemas.batch import Batch
+from app.schemas.bulk import BulkProjectStatusRequest, BulkResult
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
-async def get_project_controller() -> ProjectController:
-    project_collection = await get_project_collection()
-    repository = ProjectRepository(project_collection)
-    service = ProjectService(repository)
-    return ProjectController(service)
+async def get_project_controller(request: Request) -> ProjectController:
+    return get_container(request).project_controller
 
 @router.post("/", response_model=Project)
 async def create_project(project: Project, controller: ProjectController = Depends(get_project_controller)):
     return await controller.create_project(project)
 
+# Items are validated one by one in the service, so a bad item is reported instead of failing the batch.
+@router.post("/bulk", response_model=BulkResult)
+async def create_projects(
+    items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    controller: ProjectController = Depends(get_project_controller),
+):
+    return await controller.create_projects(items)
+
+@router.put("/bulk", response_model=BulkResult)
+async def update_projects(
+    items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    controller: ProjectController = Depends(get_project_controller),
+):
+    return await controller.update_projects(items)
+
+@router.patch("/bulk/status", response_model=BulkResult)
+async def set_projects_status(request: BulkProjectStatusRequest, controller: ProjectController = Depends(get_project_controller)):
+    return await controller.set_projects_status(request.ids, request.status)
+
+# Declared before /{project_id} so "export" is not taken for an id.
+@router.get("/export")
+async def export_projects(
+    developer_id: Optional[str] = None,
+    status: Optional[ProjectStatus] = None,
+    after: Optional[str] = None,
+    controller: ProjectController = Depends(get_project_controller),
+):
+    """Matching projects as NDJSON in id order; pass the last id received as `after` to resume."""
+    return ndjson_response(controller.export_projects(developer_id, status, after))
+
+# Declared before /{project_id} so "batch" is not taken for an id.
+@router.get("/batch", response_model=Batch[Project])
+async def get_projects_batch(
+    ids: List[str] = Depends(batch_ids),
+    fields: Optional[FieldSet] = Depends(SparseFields(Project)),
+    controller: ProjectController = Depends(get_project_controller),
+):
+    """Many projects by id in one query, in the order given; unknown ids are listed in `missing`."""
+    projects = await controller.get_projects_by_ids(ids, fields)
+    return partial_response(projects) if fields else projects
+
 @router.get("/{project_id}", response_model=Project)
-async def get_project(project_id: str, controller: ProjectController = Depends(get_project_controller)):
-    return await controller.get_project_by_id(project_id)
+async def get_project(
+    project_id: str,
+    fields: Optional[FieldSet] = Depends(SparseFields(Project)),
+    controller: ProjectController = Depends(get_project_controller),
+):
+    if settings.TRUSTED_READS and not fields:
+        return json_response(await controller.get_project_json(project_id), "Project not found")
+    project = await controller.get_project_by_id(project_id, fields)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return partial_response(project) if fields else project
 
-@router.get("/", response_model=List[Project])
-async def get_all_projects(controller: ProjectController = Depends(get_project_controller)):
-    return await controller.get_all_projects()
+@router.get("/", response_model=Page[Project])
+async def get_all_projects(
+    page: PageParams = Depends(),
+    fields: Optional[FieldSet] = Depends(SparseFields(Project)),
+    controller: ProjectController = Depends(get_project_controller),
+):
+    try:
+        projects = await controller.get_all_projects(page.limit, page.cursor, page.total, fields)
+        return partial_response(projects) if fields else projects
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/", response_model=Project)
 async def update_project(project: Project, controller: ProjectController = Depends(get_project_controller)):
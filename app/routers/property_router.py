@@ -1,31 +1,157 @@
 # app/routers/property_router.py
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from typing import Any, Dict, List, Optional
+from app.config import settings
 from app.controllers.property_controller import PropertyController
-from app.repositories.property_repository import PropertyRepository
-from app.database.collections import get_property_collection
-from app.services.property_service import PropertyService
-from app.models.property_models.property import Property
+from app.dependencies import PageParams, SparseFields, TrendParams, batch_ids, get_container, get_loaders
+from app.models.location_models.geo_point import GeoPoint
+from app.models.property_models.price import Price
+from app.models.property_models.price_record import PriceRecord
+from app.models.property_models.property import Property, PropertyType
+from app.repositories.batch_loader import Loaders
+from app.repositories.pagination import InvalidCursorError
+from app.repositories.projection import FieldSet
+from app.routers.responses import json_response, partial_response
+from app.routers.streaming import ndjson_response
+from app.schemas.batch import Batch
+from app.schemas.bulk import BulkActiveRequest, BulkResult
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page
+from app.schemas.price import PriceTrend
+from app.schemas.property import PropertyDetail, PropertySearchRequest, PropertySearchResult
+from app.services.server_timing import ServerTiming
 
 router = APIRouter()
 
-async def get_property_controller() -> PropertyController:
-    property_collection = await get_property_collection()
-    repository = PropertyRepository(property_collection)
-    service = PropertyService(repository)
-    return PropertyController(service)
+async def get_property_controller(request: Request) -> PropertyController:
+    return get_container(request).property_controller
 
 @router.post("/", response_model=Property)
 async def create_property(property: Property, controller: PropertyController = Depends(get_property_controller)):
     return await controller.create_property(property)
 
+# Items are validated one by one in the service, so a bad item is reported instead of failing the batch.
+@router.post("/bulk", response_model=BulkResult)
+async def create_properties(
+    items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    controller: PropertyController = Depends(get_property_controller),
+):
+    return await controller.create_properties(items)
+
+@router.put("/bulk", response_model=BulkResult)
+async def update_properties(
+    items: List[Dict[str, Any]] = Body(..., min_length=1, max_length=settings.BULK_MAX_ITEMS),
+    controller: PropertyController = Depends(get_property_controller),
+):
+    return await controller.update_properties(items)
+
+@router.patch("/bulk/status", response_model=BulkResult)
+async def set_properties_active(request: BulkActiveRequest, controller: PropertyController = Depends(get_property_controller)):
+    return await controller.set_properties_active(request.ids, request.is_active)
+
+@router.post("/search", response_model=PropertySearchResult)
+async def search_properties(request: PropertySearchRequest, controller: PropertyController = Depends(get_property_controller)):
+    try:
+        return await controller.search_properties(request)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Declared before /{property_id} so "export" and "near" are not taken for an id.
+@router.get("/export")
+async def export_properties(
+    is_active: Optional[bool] = None,
+    property_type: Optional[List[PropertyType]] = Query(None),
+    location_id: Optional[str] = None,
+    after: Optional[str] = None,
+    controller: PropertyController = Depends(get_property_controller),
+):
+    """Matching properties as NDJSON in id order; pass the last id received as `after` to resume."""
+    return ndjson_response(controller.export_properties(is_active, property_type, location_id, after))
+
+@router.get("/near", response_model=NearbyPage[Property])
+async def get_properties_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    max_distance_m: float = Query(3000, gt=0, le=50000),
+    property_type: Optional[List[PropertyType]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    controller: PropertyController = Depends(get_property_controller),
+):
+    try:
+        return await controller.get_properties_near(
+            GeoPoint.from_lat_lng(lat, lng), max_distance_m, property_type, limit, cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Declared before /{property_id} so "batch" is not taken for an id.
+@router.get("/batch", response_model=Batch[Property])
+async def get_properties_batch(
+    ids: List[str] = Depends(batch_ids),
+    fields: Optional[FieldSet] = Depends(SparseFields(Property)),
+    controller: PropertyController = Depends(get_property_controller),
+):
+    """Many properties by id in one query, in the order given; unknown ids are listed in `missing`."""
+    properties = await controller.get_properties_by_ids(ids, fields)
+    return partial_response(properties) if fields else properties
+
 @router.get("/{property_id}", response_model=Property)
-async def get_property(property_id: str, controller: PropertyController = Depends(get_property_controller)):
-    return await controller.get_property_by_id(property_id)
+async def get_property(
+    property_id: str,
+    fields: Optional[FieldSet] = Depends(SparseFields(Property)),
+    controller: PropertyController = Depends(get_property_controller),
+):
+    if settings.TRUSTED_READS and not fields:
+        return json_response(await controller.get_property_json(property_id), "Property not found")
+    property = await controller.get_property_by_id(property_id, fields)
+    if property is None:
+        raise HTTPException(status_code=404, detail="Property not found")
+    return partial_response(property) if fields else property
+
+@router.get("/{property_id}/detail", response_model=PropertyDetail)
+async def get_property_detail(
+    property_id: str,
+    response: Response,
+    loaders: Loaders = Depends(get_loaders),
+    controller: PropertyController = Depends(get_property_controller),
+):
+    """The property with its location chain, project and developers; per-part timings are in `Server-Timing`."""
+    timing = ServerTiming()
+    detail = await controller.get_property_detail(property_id, loaders, timing)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Property not found", headers={"Server-Timing": timing.header()})
+    response.headers["Server-Timing"] = timing.header()
+    return detail
+
+@router.post("/{property_id}/prices", response_model=PriceRecord)
+async def submit_price(property_id: str, price: Price, controller: PropertyController = Depends(get_property_controller)):
+    record = await controller.submit_price(property_id, price)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Property not found")
+    return record
+
+@router.get("/{property_id}/prices", response_model=Page[PriceRecord])
+async def get_price_history(
+    property_id: str, page: PageParams = Depends(), controller: PropertyController = Depends(get_property_controller)
+):
+    try:
+        return await controller.get_price_history(property_id, page.limit, page.cursor, page.total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{property_id}/prices/trend", response_model=PriceTrend)
+async def get_price_trend(
+    property_id: str, trend: TrendParams = Depends(), controller: PropertyController = Depends(get_property_controller)
+):
+    return await controller.get_price_trend(property_id, trend.interval, trend.currency, trend.start, trend.end)
 
-@router.get("/", response_model=List[str])
-async def get_all_properties(controller: PropertyController = Depends(get_property_controller)):
-    return await controller.get_all_properties()
+@router.get("/", response_model=Page[str])
+async def get_all_properties(page: PageParams = Depends(), controller: PropertyController = Depends(get_property_controller)):
+    try:
+        return await controller.get_all_properties(page.limit, page.cursor, page.total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/", response_model=Property)
 async def update_property(property: Property, controller: PropertyController = Depends(get_property_controller)):
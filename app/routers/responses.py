@@ -0,0 +1,25 @@
+# app/routers/responses.py
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+
+def json_response(body: Optional[bytes], not_found: str = "Not found") -> Response:
+    """Wrap JSON already serialised by a trusted read (see `BaseRepository.get_json_by_id`).
+
+    No body means no document: a 404 with `not_found` as its detail, as the
+    route answers without trusted reads.
+    """
+    if body is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    return Response(content=body, media_type="application/json")
+
+
+def partial_response(result: BaseModel) -> Response:
+    """Serialise a partial model, or a page of them, as-is.
+
+    Returning a Response bypasses the route's full `response_model`, which
+    would otherwise reject or re-validate the missing fields.
+    """
+    return Response(content=result.model_dump_json(by_alias=True), media_type="application/json")
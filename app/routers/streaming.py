@@ -0,0 +1,31 @@
+# app/routers/streaming.py
+from typing import AsyncIterator
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Lines are coalesced into chunks of about this size to keep per-write overhead low.
+CHUNK_SIZE = 64 * 1024
+
+
+async def _ndjson_chunks(models: AsyncIterator[BaseModel]) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for model in models:
+        buffer += orjson.dumps(model.dict(), default=str)
+        buffer += b"\n"
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def ndjson_response(models: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """Stream models as newline-delimited JSON, one object per line.
+
+    Each line carries the item's `id`; clients resume an interrupted export by
+    passing the last one back as `after`.
+    """
+    return StreamingResponse(_ndjson_chunks(models), media_type=NDJSON_MEDIA_TYPE)
@@ -1,34 +1,71 @@
 # app/routers/user_router.py
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import List, Optional
+from app.config import settings
 from app.controllers.user_controller import UserController
-from app.repositories.user_repository import UserRepository
-from app.database.collections import get_user_collection
-from app.services.user_service import UserService
-from app.models.user_models.user import User
+from app.dependencies import PageParams, SparseFields, batch_ids, get_container
+from app.models.user_models.user import User, UserRole
+from app.repositories.pagination import InvalidCursorError
+from app.repositories.projection import FieldSet
+from app.routers.responses import json_response, partial_response
+from app.routers.streaming import ndjson_response
+from app.schemas.batch import Batch
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
-async def get_user_controller() -> UserController:
-    user_collection = await get_user_collection()
-    repository = UserRepository(user_collection)
-    service = UserService(repository)
-    return UserController(service)
+async def get_user_controller(request: Request) -> UserController:
+    return get_container(request).user_controller
 
 @router.post("/", response_model=User)
 async def create_user(user: User, controller: UserController = Depends(get_user_controller)):
     return await controller.create_user(user)
 
+# Declared before /{user_id} so "export" is not taken for an id.
+@router.get("/export")
+async def export_users(
+    role: Optional[UserRole] = None, after: Optional[str] = None, controller: UserController = Depends(get_user_controller)
+):
+    """Matching users as NDJSON in id order; pass the last id received as `after` to resume."""
+    return ndjson_response(controller.export_users(role, after))
+
+# Declared before /{user_id} so "batch" is not taken for an id.
+@router.get("/batch", response_model=Batch[User])
+async def get_users_batch(
+    ids: List[str] = Depends(batch_ids),
+    fields: Optional[FieldSet] = Depends(SparseFields(User)),
+    controller: UserController = Depends(get_user_controller),
+):
+    """Many users by id in one query, in the order given; unknown ids are listed in `missing`."""
+    users = await controller.get_users_by_ids(ids, fields)
+    return partial_response(users) if fields else users
+
 @router.get("/{user_id}", response_model=User)
-async def get_user(user_id: str, controller: UserController = Depends(get_user_controller)):
+async def get_user(
+    user_id: str,
+    fields: Optional[FieldSet] = Depends(SparseFields(User)),
+    controller: UserController = Depends(get_user_controller),
+):
     print(user_id , "\n\n")
-    return await controller.get_user_by_id(user_id)
+    if settings.TRUSTED_READS and not fields:
+        return json_response(await controller.get_user_json(user_id), "User not found")
+    user = await controller.get_user_by_id(user_id, fields)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return partial_response(user) if fields else user
 
-@router.get("/", response_model=List[User])
+@router.get("/", response_model=Page[User])
 async def get_users_by_role(
-    role: str, skip: int = 0, limit: int = 10, controller: UserController = Depends(get_user_controller)
+    role: str,
+    page: PageParams = Depends(),
+    fields: Optional[FieldSet] = Depends(SparseFields(User)),
+    controller: UserController = Depends(get_user_controller),
 ):
-    return await controller.get_users_by_role(role, skip, limit)
+    try:
+        users = await controller.get_users_by_role(role, page.limit, page.cursor, page.total, fields)
+        return partial_response(users) if fields else users
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.put("/", response_model=User)
 async def update_user(user: User, controller: UserController = Depends(get_user_controller)):
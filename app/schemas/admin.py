@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class ConnectionPoolStats(BaseModel):
+    address: str
+    open_connections: int
+    in_use: int
+    available: int
+    checkouts: int
+    failed_checkouts: int
+    cleared: int
+    wait_avg_ms: float
+    wait_p95_ms: float
+    wait_max_ms: float
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    max_entries: int
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    hit_ratio: float
+
+
+class DatabasePoolReport(BaseModel):
+    min_pool_size: int
+    max_pool_size: int
+    pools: List[ConnectionPoolStats] = Field(default_factory=list)
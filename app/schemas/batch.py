@@ -0,0 +1,12 @@
+# app/schemas/batch.py
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Batch(BaseModel, Generic[T]):
+    """Entities fetched by id in one request, in the order asked for; unknown ids are listed in `missing`."""
+    items: List[T]
+    missing: List[str] = Field(default_factory=list)
@@ -0,0 +1,52 @@
+# app/schemas/bulk.py
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.models.developer_models.project import ProjectStatus
+
+
+class BulkItemStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+    # Rejected by model validation; nothing was written.
+    INVALID = "invalid"
+    # The id already exists (create) or was repeated in the request.
+    CONFLICT = "conflict"
+    FAILED = "failed"
+
+
+SUCCESS_STATUSES = (BulkItemStatus.CREATED, BulkItemStatus.UPDATED)
+
+
+class BulkItemResult(BaseModel):
+    """Outcome for one item; `index` is its position in the request."""
+    index: int
+    id: Optional[str] = None
+    status: BulkItemStatus
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int = 0
+    failed: int = 0
+    results: List[BulkItemResult] = Field(default_factory=list)
+
+    @classmethod
+    def from_results(cls, results: List[BulkItemResult]) -> "BulkResult":
+        results = sorted(results, key=lambda result: result.index)
+        succeeded = sum(1 for result in results if result.status in SUCCESS_STATUSES)
+        return cls(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+class BulkActiveRequest(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    is_active: bool
+
+
+class BulkProjectStatusRequest(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    status: ProjectStatus
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
+from app.models.conversation_models.conversation import Message
 
 
 class Role(str, Enum):
@@ -42,3 +43,22 @@ class ConversationResponse(BaseModel):
     messages: List[MessageSchema] = Field(default_factory=list)
     related_property_ids: Optional[List[str]] = Field(default_factory=list)
     last_message_timestamp: datetime
+
+
+class MessagePage(BaseModel):
+    conversation_id: str
+    messages: List[Message] = Field(default_factory=list)
+    message_count: int
+    has_more: bool = False
+    next_before: Optional[int] = None
+
+
+class ConversationSummary(BaseModel):
+    """A conversation as listed in the sidebar; read without its messages."""
+    id: str
+    user_id: str
+    title: str
+    status: ConversationStatus
+    message_count: int = 0
+    last_message_timestamp: datetime
+    last_message_preview: Optional[str] = None
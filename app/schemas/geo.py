@@ -0,0 +1,17 @@
+# app/schemas/geo.py
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Nearby(BaseModel, Generic[T]):
+    distance_m: float
+    item: T
+
+
+class NearbyPage(BaseModel, Generic[T]):
+    """Results ordered by distance; pass `next_cursor` back to get the next page."""
+    items: List[Nearby[T]]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,23 @@
+# app/schemas/pagination.py
+from enum import Enum
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class TotalCount(str, Enum):
+    """How a page reports the total number of matching items."""
+    NONE = "none"
+    # Collection metadata; exact enough for unfiltered lists and free to read.
+    ESTIMATED = "estimated"
+    # count_documents, cached briefly per filter.
+    EXACT = "exact"
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list; pass `next_cursor` back to get the next page."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
@@ -0,0 +1,60 @@
+# app/schemas/payment_plan.py
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
+from app.models.property_models.payment_plan import PaymentPlan
+
+
+class ScheduleEntryKind(str, Enum):
+    DOWN_PAYMENT = "down_payment"
+    INSTALLMENT = "installment"
+    SPECIAL = "special"
+
+
+class ScheduleEntry(BaseModel):
+    month: int  # Months after contract signing; the down payment is month 0
+    amount: float
+    kind: ScheduleEntryKind
+    name: Optional[str] = None  # Special payment name
+
+
+class ScheduleSummary(BaseModel):
+    price: float
+    net_price: float  # After the plan's discounts
+    down_payment: float
+    installment_amount: float
+    installment_count: int
+    total_cost: float
+    duration_months: int
+    # Everything after the down payment, spread evenly over the plan's duration
+    effective_monthly_payment: float
+
+
+class PaymentSchedule(ScheduleSummary):
+    entries: List[ScheduleEntry] = Field(default_factory=list)
+
+
+class ScheduleRequest(BaseModel):
+    price: Decimal = Field(gt=0)
+    plan: PaymentPlan
+
+
+class ScheduleBatchItem(BaseModel):
+    price: Decimal = Field(gt=0)
+    plan_index: int = Field(ge=0)  # Position in `ScheduleBatchRequest.plans`
+
+
+class ScheduleBatchRequest(BaseModel):
+    """Many (price, plan) pairs; plans are listed once and referenced by index."""
+    plans: List[PaymentPlan] = Field(min_length=1)
+    items: List[ScheduleBatchItem] = Field(min_length=1, max_length=settings.SCHEDULE_BATCH_MAX_ITEMS)
+    # Full schedules for thousands of pairs are large; by default only the summaries are returned.
+    include_entries: bool = False
+
+
+class ScheduleBatchResult(BaseModel):
+    results: List[PaymentSchedule] = Field(default_factory=list)
@@ -0,0 +1,32 @@
+# app/schemas/price.py
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.bson_types import BsonDecimal
+
+
+class TrendInterval(str, Enum):
+    """Bucket size of a price trend; the values are $dateTrunc units."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+
+class PricePoint(BaseModel):
+    period_start: datetime
+    average: BsonDecimal
+    minimum: BsonDecimal
+    maximum: BsonDecimal
+    average_price_per_sqm: Optional[float] = None
+    count: int
+
+
+class PriceTrend(BaseModel):
+    interval: TrendInterval
+    currency: str
+    points: List[PricePoint] = Field(default_factory=list)
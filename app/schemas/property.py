@@ -0,0 +1,91 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from enum import Enum
+from datetime import datetime
+from app.models.developer_models.project import ProjectStatus
+from app.models.location_models.location import LocationType
+from app.models.property_models.property import FinishingType, Property, PropertyType, UsageType
+
+
+class PropertySortField(str, Enum):
+    PRICE = "price"
+    AREA = "area"
+    BEDROOMS = "bedrooms"
+    DELIVERY_DATE = "delivery_date"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class RangeFilter(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class PropertySearchFilters(BaseModel):
+    property_types: List[PropertyType] = Field(default_factory=list)
+    usage_types: List[UsageType] = Field(default_factory=list)
+    finishing_types: List[FinishingType] = Field(default_factory=list)
+    bedrooms: Optional[RangeFilter] = None
+    area: Optional[RangeFilter] = None
+    price: Optional[RangeFilter] = None
+    location_ids: List[str] = Field(default_factory=list)
+    # Also match properties in any location inside the given ones (e.g. everything in Cairo).
+    include_descendants: bool = False
+    is_active: Optional[bool] = True
+
+
+class PropertySearchRequest(BaseModel):
+    filters: PropertySearchFilters = Field(default_factory=PropertySearchFilters)
+    sort_by: PropertySortField = PropertySortField.PRICE
+    sort_order: SortOrder = SortOrder.ASC
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = None
+    # Counting scans the whole match, so by default it is done on the first page only (no cursor).
+    include_total: Optional[bool] = None
+    include_facets: Optional[bool] = None
+
+
+class FacetCount(BaseModel):
+    value: Any = None
+    count: int
+
+
+class PropertySearchResult(BaseModel):
+    items: List[Property] = Field(default_factory=list)
+    # None when the total was not computed for this page.
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
+    facets: Dict[str, List[FacetCount]] = Field(default_factory=dict)
+
+
+class LocationSummary(BaseModel):
+    id: str
+    name: str
+    location_type: LocationType
+    average_price_m2: Optional[float] = None
+
+
+class DeveloperSummary(BaseModel):
+    id: str
+    name: str
+    logo_url: Optional[str] = None
+
+
+class ProjectSummary(BaseModel):
+    id: str
+    name: str
+    logo_url: Optional[str] = None
+    status: ProjectStatus
+    delivery_date: Optional[datetime] = None
+    developers: List[DeveloperSummary] = Field(default_factory=list)
+
+
+class PropertyDetail(BaseModel):
+    """Everything a listing page shows, in one response."""
+    property: Property
+    # The property's locations and every location containing them, nearest first.
+    locations: List[LocationSummary] = Field(default_factory=list)
+    project: Optional[ProjectSummary] = None
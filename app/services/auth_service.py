@@ -1,25 +1,26 @@
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from typing import Optional
-import httpx
 from app.models.user_models.user import User, Email
+from app.services.google_auth import GoogleTokenVerifier
+from app.services.principal_cache import PrincipalCache
 from app.services.user_service import UserService
 from app.config import settings
 
 
 class AuthService:
-    def __init__(self, user_service: UserService):
+    def __init__(
+        self,
+        user_service: UserService,
+        google: GoogleTokenVerifier,
+        principals: Optional[PrincipalCache] = None,
+    ):
         self.user_service = user_service
+        self.google = google
+        self.principals = principals
 
     async def verify_google_token(self, token: str) -> dict:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://www.googleapis.com/oauth2/v3/userinfo",
-                headers={"Authorization": f"Bearer {token}"}
-            )
-            if response.status_code != 200:
-                raise ValueError("Failed to verify Google token")
-            return response.json()
+        return await self.google.verify(token)
 
     async def create_access_token(self, data: dict) -> str:
         to_encode = data.copy()
@@ -28,14 +29,24 @@ class AuthService:
         return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
 
     async def get_current_user(self, token: str) -> Optional[User]:
+        """The user a bearer token belongs to, or None when the token or the user is not valid.
+
+        A token seen before is resolved from the principal cache to a user id,
+        read through the users entity cache; only a new token is decoded and
+        looked up by email.
+        """
+        if self.principals is not None:
+            user_id = self.principals.get(token)
+            if user_id is not None:
+                return await self.user_service.get_user_by_id(user_id)
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            email = payload.get("sub")
-            if email is None:
-                return None
-            users = await self.user_service.get_users_by_email(email)
-            if users and len(users) > 0:
-                return users[0]
         except JWTError:
             return None
-        return None
\ No newline at end of file
+        email = payload.get("sub")
+        if email is None:
+            return None
+        user = await self.user_service.get_user_by_email(email)
+        if user is not None and self.principals is not None and payload.get("exp") is not None:
+            self.principals.put(token, user.id, float(payload["exp"]))
+        return user
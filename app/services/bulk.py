@@ -0,0 +1,51 @@
+# app/services/bulk.py
+import uuid
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.schemas.bulk import BulkItemResult, BulkItemStatus
+
+# (position in the request, validated aggregate)
+ValidItems = List[Tuple[int, BaseModel]]
+
+
+def describe_errors(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+def validate_items(
+    model: Type[BaseModel], items: List[Dict[str, Any]], require_id: bool = False
+) -> Tuple[ValidItems, List[BulkItemResult]]:
+    """Validate a bulk request item by item, so one bad item only rejects itself.
+
+    Items without an id get a UUID (unless `require_id`, as for updates) so every
+    result can name its document; an id repeated in the request is a conflict.
+    """
+    valid: ValidItems = []
+    rejected: List[BulkItemResult] = []
+    seen = set()
+    for index, item in enumerate(items):
+        try:
+            aggregate = model(**item)
+        except ValidationError as e:
+            rejected.append(BulkItemResult(index=index, id=item.get("id"), status=BulkItemStatus.INVALID, error=describe_errors(e)))
+            continue
+        if aggregate.id is None:
+            if require_id:
+                rejected.append(BulkItemResult(index=index, status=BulkItemStatus.INVALID, error="id: Field required"))
+                continue
+            aggregate.id = str(uuid.uuid4())
+        if aggregate.id in seen:
+            rejected.append(BulkItemResult(
+                index=index, id=aggregate.id, status=BulkItemStatus.CONFLICT, error="id repeated in this request"
+            ))
+            continue
+        seen.add(aggregate.id)
+        valid.append((index, aggregate))
+    return valid, rejected
+
+
+def restore_indexes(results: List[BulkItemResult], valid: ValidItems) -> List[BulkItemResult]:
+    """Map repository results (indexed within the valid items) back to request positions."""
+    return [result.copy(update={"index": valid[result.index][0]}) for result in results]
@@ -1,7 +1,10 @@
 # src/services/conversation_service.py
 from typing import List, Optional
-from app.models.conversation_models.conversation import Conversation
+from app.models.conversation_models.conversation import Conversation, ConversationStatus, Message, Response
 from app.repositories.conversation_repository import ConversationRepository
+from app.schemas.batch import Batch
+from app.schemas.conversation import ConversationSummary, MessagePage
+from app.schemas.pagination import Page, TotalCount
 
 
 class ConversationService:
@@ -19,11 +22,32 @@ class ConversationService:
     async def delete_conversation(self, conversation_id: str) -> None:
         await self.repository.delete(conversation_id)
 
+    async def get_conversation_json(self, conversation_id: str) -> Optional[bytes]:
+        return await self.repository.get_json_by_id(conversation_id)
+
     async def get_conversation_by_id(self, conversation_id: str) -> Optional[Conversation]:
         return await self.repository.get_by_id(conversation_id)
 
-    async def get_conversation_history(self, conversation_id: str, limit: int = 10, offset: int = 0) -> Conversation:
-        return await self.repository.retrieve_conversation_history_by_id(conversation_id, limit, offset)
-
-    async def get_conversations_by_user_id(self, user_id: str) -> List[Conversation]:
-        return await self.repository.retrieve_conversation_info_by_user_id(user_id)
+    async def get_conversations_by_ids(self, conversation_ids: List[str]) -> Batch[Conversation]:
+        return await self.repository.get_many(conversation_ids)
+
+    async def add_message(self, conversation_id: str, message: Message) -> Optional[Message]:
+        return await self.repository.append_message(conversation_id, message)
+
+    async def add_response(self, conversation_id: str, response: Response) -> Optional[Message]:
+        return await self.repository.append_response(conversation_id, response)
+
+    async def get_conversation_history(
+        self, conversation_id: str, limit: int = 10, offset: int = 0, before: Optional[int] = None
+    ) -> Optional[MessagePage]:
+        return await self.repository.retrieve_conversation_history_by_id(conversation_id, limit, offset, before)
+
+    async def get_conversation_summaries(
+        self,
+        user_id: Optional[str],
+        status: Optional[ConversationStatus],
+        limit: int,
+        cursor: Optional[str] = None,
+        total: TotalCount = TotalCount.NONE,
+    ) -> Page[ConversationSummary]:
+        return await self.repository.get_summaries(user_id, status, limit, cursor, total)
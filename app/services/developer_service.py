@@ -1,7 +1,10 @@
 # src/services/developer_service.py
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from app.models.developer_models.developer import Developer
 from app.repositories.developer_repository import DeveloperRepository
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.pagination import Page, TotalCount
 
 
 class DeveloperService:
@@ -19,8 +22,20 @@ class DeveloperService:
     async def delete_developer(self, developer_id: str) -> None:
         await self.repository.delete(developer_id)
 
-    async def get_developer_by_id(self, developer_id: str) -> Optional[Developer]:
-        return await self.repository.get_by_id(developer_id)
+    async def get_developer_json(self, developer_id: str) -> Optional[bytes]:
+        return await self.repository.get_json_by_id(developer_id)
 
-    async def get_all_developers(self) -> List[Developer]:
-        return await self.repository.get_all()
+    async def get_developer_by_id(self, developer_id: str, fields: Optional[FieldSet] = None) -> Optional[Developer]:
+        return await self.repository.get_by_id(developer_id, fields)
+
+    async def get_developers_by_ids(self, developer_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Developer]:
+        return await self.repository.get_many(developer_ids, fields)
+
+    async def get_all_developers(
+        self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Developer]:
+        return await self.repository.get_all(limit, cursor, total, fields)
+
+    def export_developers(self, after: Optional[str] = None) -> AsyncIterator[Developer]:
+        return self.repository.stream(after=after)
@@ -0,0 +1,162 @@
+# app/services/google_auth.py
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from jose import JWTError, jwt
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def create_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    """The worker's shared outbound HTTP client; pass a transport (e.g. httpx.MockTransport) to test without a network."""
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=settings.HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_connections=settings.HTTP_MAX_CONNECTIONS),
+    )
+
+
+class GoogleKeySet:
+    """Google's ID-token signing keys (JWKS), cached for as long as the response's Cache-Control allows.
+
+    Lookups are served from memory. Within `refresh_ahead` seconds of expiry
+    (at most half the max-age) a lookup still answers from the current keys
+    and starts a background refresh; only a missing or expired set, or a `kid`
+    not in it (Google rotated its keys), is fetched inline, by a single request
+    shared by concurrent callers.
+    Unknown kids trigger at most one fetch per `min_refresh_interval`, so made
+    up tokens cannot turn into requests to Google. If a refresh fails, the
+    previous keys keep being used.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        url: str = GOOGLE_JWKS_URL,
+        default_max_age: float = 3600,
+        refresh_ahead: float = 300,
+        min_refresh_interval: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.url = url
+        self.default_max_age = default_max_age
+        self.refresh_ahead = refresh_ahead
+        self.min_refresh_interval = min_refresh_interval
+        self._clock = clock
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = float("-inf")
+        self._expires_at = float("-inf")
+        self._refresh_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._background: Optional[asyncio.Task] = None
+
+    async def get(self, kid: str) -> Optional[Dict[str, Any]]:
+        """The JWK with this key id, or None when Google does not (or no longer) sign with it."""
+        now = self._clock()
+        unknown = kid not in self._keys and now - self._fetched_at >= self.min_refresh_interval
+        if now >= self._expires_at or unknown:
+            try:
+                await self._refresh()
+            except httpx.HTTPError:
+                if not self._keys:
+                    raise
+                logger.exception("Failed to refresh Google signing keys; using the cached ones")
+        elif now >= self._refresh_at and self._background is None:
+            self._background = asyncio.create_task(self._refresh_in_background())
+        return self._keys.get(kid)
+
+    async def _refresh(self) -> None:
+        fetched_at = self._fetched_at
+        async with self._lock:
+            # Whoever held the lock has just fetched them.
+            if self._fetched_at != fetched_at:
+                return
+            response = await self.client.get(self.url)
+            response.raise_for_status()
+            now = self._clock()
+            self._keys = {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+            max_age = self._max_age(response.headers)
+            self._fetched_at = now
+            self._expires_at = now + max_age
+            self._refresh_at = self._expires_at - min(self.refresh_ahead, max_age / 2)
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self._refresh()
+        except Exception:
+            logger.exception("Background refresh of Google signing keys failed")
+        finally:
+            self._background = None
+
+    def _max_age(self, headers: httpx.Headers) -> float:
+        match = _MAX_AGE.search(headers.get("cache-control", ""))
+        if match is None:
+            return self.default_max_age
+        age = headers.get("age", "0")
+        return max(int(match.group(1)) - (int(age) if age.isdigit() else 0), 0)
+
+    async def close(self) -> None:
+        if self._background is not None:
+            self._background.cancel()
+
+
+class GoogleTokenVerifier:
+    """Verifies Google sign-in tokens, locally when they are ID tokens.
+
+    An ID token (a JWT) is checked against the cached signing keys, the
+    audience (our client id), the issuer and expiry, with no request to Google
+    in the common case. Anything else is taken for an OAuth access token and
+    resolved through the userinfo endpoint on the shared client.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, keys: Optional[GoogleKeySet] = None, client_id: Optional[str] = None):
+        self.client = client
+        self.keys = keys or GoogleKeySet(client)
+        self.client_id = client_id or settings.GOOGLE_CLIENT_ID
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """The token's user claims (email, name, ...); raises ValueError when it is not valid."""
+        if token.count(".") == 2:
+            return await self._verify_id_token(token)
+        return await self._userinfo(token)
+
+    async def _verify_id_token(self, token: str) -> Dict[str, Any]:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = await self.keys.get(kid) if kid else None
+            if key is None:
+                raise ValueError("Google ID token is signed with an unknown key")
+            claims = jwt.decode(
+                token, key, algorithms=["RS256"], audience=self.client_id, issuer=GOOGLE_ISSUERS,
+                options={"verify_at_hash": False},
+            )
+        except (JWTError, httpx.HTTPError) as e:
+            raise ValueError(f"Failed to verify Google ID token: {e}") from e
+        if not claims.get("email_verified"):
+            raise ValueError("Google account email is not verified")
+        return claims
+
+    async def _userinfo(self, token: str) -> Dict[str, Any]:
+        try:
+            response = await self.client.get(GOOGLE_USERINFO_URL, headers={"Authorization": f"Bearer {token}"})
+        except httpx.HTTPError as e:
+            raise ValueError(f"Failed to verify Google token: {e}") from e
+        if response.status_code != 200:
+            raise ValueError("Failed to verify Google token")
+        return response.json()
+
+    async def close(self) -> None:
+        await self.keys.close()
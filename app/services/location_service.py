@@ -1,12 +1,28 @@
 # src/services/location_service.py
+from datetime import datetime
 from typing import List, Optional
+from app.models.location_models.geo_point import GeoPoint
 from app.models.location_models.location import Location, LocationType
 from app.repositories.location_repository import LocationRepository
+from app.repositories.location_tree import LocationTree
+from app.repositories.price_history_repository import PriceHistoryRepository
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page, TotalCount
+from app.schemas.price import PriceTrend, TrendInterval
 
 
 class LocationService:
-    def __init__(self, repository: LocationRepository):
+    def __init__(
+        self,
+        repository: LocationRepository,
+        tree: Optional[LocationTree] = None,
+        price_history: Optional[PriceHistoryRepository] = None,
+    ):
         self.repository = repository
+        self.tree = tree
+        self.price_history = price_history
 
     async def create_location(self, location: Location) -> Location:
         await self.repository.save(location)
@@ -19,14 +35,58 @@ class LocationService:
     async def delete_location(self, location_id: str) -> None:
         await self.repository.delete(location_id)
 
-    async def get_location_by_id(self, location_id: str) -> Optional[Location]:
-        return await self.repository.get_by_id(location_id)
+    async def get_location_json(self, location_id: str) -> Optional[bytes]:
+        return await self.repository.get_json_by_id(location_id)
 
-    async def get_locations_by_type(self, location_type: LocationType) -> List[Location]:
-        return await self.repository.get_by_type(location_type)
+    async def get_location_by_id(self, location_id: str, fields: Optional[FieldSet] = None) -> Optional[Location]:
+        return await self.repository.get_by_id(location_id, fields)
+
+    async def get_locations_by_ids(self, location_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Location]:
+        return await self.repository.get_many(location_ids, fields)
+
+    async def get_locations_by_type(
+        self, location_type: LocationType, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Location]:
+        return await self.repository.get_by_type(location_type, limit, cursor, total, fields)
 
     async def get_direct_children(self, location_id: str) -> List[Location]:
         return await self.repository.get_direct_children(location_id)
 
-    async def get_direct_parents(self, location_id: str) -> List[Location]:
+    async def get_direct_parents(self, location_id: str) -> Optional[List[Location]]:
         return await self.repository.get_direct_parents(location_id)
+
+    async def get_ancestors(self, location_id: str) -> Optional[List[Location]]:
+        return await self.repository.get_ancestors(location_id)
+
+    async def get_descendants(self, location_id: str) -> Optional[List[Location]]:
+        return await self.repository.get_descendants(location_id)
+
+    def expand_location_ids(self, location_ids: List[str]) -> List[str]:
+        """The given ids plus all their descendants, from the in-memory tree snapshot."""
+        if self.tree is None:
+            return list(location_ids)
+        return self.tree.expand(location_ids)
+
+    async def get_locations_near(
+        self,
+        point: GeoPoint,
+        max_distance_m: float,
+        location_types: Optional[List[LocationType]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> NearbyPage[Location]:
+        return await self.repository.near(point, max_distance_m, location_types, limit, cursor)
+
+    async def get_price_trend(
+        self,
+        location_id: str,
+        interval: TrendInterval,
+        currency: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> PriceTrend:
+        """Prices of properties in the location or anywhere inside it."""
+        location_ids = self.expand_location_ids([location_id])
+        points = await self.price_history.trend({"location_ids": {"$in": location_ids}}, interval, currency, start, end)
+        return PriceTrend(interval=interval, currency=currency, points=points)
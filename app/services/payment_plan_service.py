@@ -0,0 +1,196 @@
+# src/services/payment_plan_service.py
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.models.property_models.payment_plan import InstallmentType, PaymentPlan
+from app.schemas.payment_plan import (
+    PaymentSchedule, ScheduleBatchRequest, ScheduleBatchResult, ScheduleEntry, ScheduleEntryKind,
+)
+
+PERIOD_MONTHS = {InstallmentType.MONTHLY: 1, InstallmentType.QUARTERLY: 3, InstallmentType.YEARLY: 12}
+# Plan fields that do not change the schedule, left out of the cache key.
+DESCRIPTIVE_FIELDS = {"id", "description", "is_active"}
+NON_NEGATIVE_FIELDS = ("installment_years", "installment_amount", "interest_rate", "discount_amount")
+PERCENTAGE_FIELDS = ("down_payment_percentage", "discount_percentage")
+
+# An amount as a function of the price: intercept + slope * price.
+Affine = Tuple[float, float]
+
+
+class InvalidPlanError(ValueError):
+    """Raised when a plan cannot produce a schedule, e.g. its payments exceed the price."""
+
+
+class ScheduleTemplate(NamedTuple):
+    """A plan's schedule with every amount affine in the price, so one template serves every price.
+
+    Row 0 is always the down payment; rows are in month order. Row `balance`
+    (the last installment, or the down payment of a cash plan) takes the
+    cents lost to rounding the others.
+    """
+    months: np.ndarray
+    kinds: Tuple[ScheduleEntryKind, ...]
+    names: Tuple[Optional[str], ...]
+    intercept: np.ndarray
+    slope: np.ndarray
+    net_price: Affine
+    installment: Affine
+    installment_count: int
+    duration_months: int
+    balance: int
+
+
+def _scale(value: Affine, factor: float) -> Affine:
+    return value[0] * factor, value[1] * factor
+
+
+def plan_key(plan: PaymentPlan) -> str:
+    return plan.model_dump_json(exclude=DESCRIPTIVE_FIELDS)
+
+
+def check_plan(plan: PaymentPlan) -> None:
+    """Raise InvalidPlanError for values no schedule can be built from, e.g. a negative term."""
+    problems = [f"{name} must not be negative" for name in NON_NEGATIVE_FIELDS if (getattr(plan, name) or 0) < 0]
+    problems += [
+        f"{name} must be between 0 and 100" for name in PERCENTAGE_FIELDS if not 0 <= (getattr(plan, name) or 0) <= 100
+    ]
+    for index, special in enumerate(plan.special_payments):
+        if (special.event_month or 0) < 0:
+            problems.append(f"special_payments[{index}].event_month must not be negative")
+        if (special.amount or 0) < 0:
+            problems.append(f"special_payments[{index}].amount must not be negative")
+        if not 0 <= (special.percentage or 0) <= 100:
+            problems.append(f"special_payments[{index}].percentage must be between 0 and 100")
+    if problems:
+        raise InvalidPlanError("; ".join(problems))
+
+
+@lru_cache(maxsize=1024)
+def compile_plan(key: str) -> ScheduleTemplate:
+    """Build the schedule template of a plan, memoized on the plan's `plan_key`.
+
+    Discounts apply to the price first; the down payment and percentage special
+    payments are shares of the discounted price. The rest is repaid in equal
+    installments, amortized at `interest_rate` (annual, in percent) when one is
+    set, unless the plan fixes `installment_amount`; then the last installment
+    is whatever is left, so the schedule still adds up to the net price.
+    Special payments without an event month are due with the down payment.
+    """
+    plan = PaymentPlan.model_validate_json(key)
+    check_plan(plan)
+    net_price: Affine = (-float(plan.discount_amount or 0), 1 - (plan.discount_percentage or 0) / 100)
+    down = _scale(net_price, (plan.down_payment_percentage or 0) / 100)
+
+    specials = []
+    for special in plan.special_payments:
+        if special.amount is not None:
+            amount: Affine = (float(special.amount), 0.0)
+        else:
+            amount = _scale(net_price, (special.percentage or 0) / 100)
+        specials.append((special.event_month or 0, special.name, amount))
+
+    period = PERIOD_MONTHS[plan.installment_type or InstallmentType.MONTHLY]
+    count = (plan.installment_years or 0) * 12 // period
+    financed = (
+        net_price[0] - down[0] - sum(amount[0] for _, _, amount in specials),
+        net_price[1] - down[1] - sum(amount[1] for _, _, amount in specials),
+    )
+    if count == 0:
+        # A cash plan: whatever is not covered by special payments is due up front.
+        down, installment = (down[0] + financed[0], down[1] + financed[1]), (0.0, 0.0)
+        final = installment
+    elif plan.installment_amount is not None:
+        installment = (float(plan.installment_amount), 0.0)
+        # Negative when the fixed installments overpay; `_schedules` rejects that price.
+        final = (financed[0] - installment[0] * (count - 1), financed[1])
+    else:
+        rate = (plan.interest_rate or 0) / 100 * period / 12
+        installment = _scale(financed, rate / (1 - (1 + rate) ** -count) if rate else 1 / count)
+        final = installment
+
+    months = [0] + [month for month, _, _ in specials] + [period * number for number in range(1, count + 1)]
+    kinds = [ScheduleEntryKind.DOWN_PAYMENT] + [ScheduleEntryKind.SPECIAL] * len(specials) + [ScheduleEntryKind.INSTALLMENT] * count
+    names = [None] + [name for _, name, _ in specials] + [None] * count
+    amounts = [down] + [amount for _, _, amount in specials] + [installment] * (count - 1) + [final] * min(count, 1)
+    # Stable, so the down payment stays first among the month-0 entries.
+    order = np.argsort(np.array(months), kind="stable")
+    balance = int(np.flatnonzero(order == len(amounts) - 1)[0]) if count else 0
+    return ScheduleTemplate(
+        months=np.array(months)[order],
+        kinds=tuple(kinds[i] for i in order),
+        names=tuple(names[i] for i in order),
+        intercept=np.array([amount[0] for amount in amounts])[order],
+        slope=np.array([amount[1] for amount in amounts])[order],
+        net_price=net_price,
+        installment=installment,
+        installment_count=count,
+        duration_months=int(max(months)),
+        balance=balance,
+    )
+
+
+class PaymentPlanService:
+    """Payment schedules for (price, plan) pairs, computed with array math per plan."""
+
+    def schedule(self, price: Decimal, plan: PaymentPlan) -> PaymentSchedule:
+        template = compile_plan(plan_key(plan))
+        return self._schedules(template, np.array([float(price)]), include_entries=True)[0]
+
+    def schedule_batch(self, request: ScheduleBatchRequest) -> ScheduleBatchResult:
+        """Evaluate every pair; pairs sharing a plan are computed as one (prices x entries) matrix."""
+        plan_indexes = np.array([item.plan_index for item in request.items])
+        if plan_indexes.max() >= len(request.plans):
+            raise InvalidPlanError(f"plan_index must be below {len(request.plans)}")
+        prices = np.array([float(item.price) for item in request.items])
+        results: List[Optional[PaymentSchedule]] = [None] * len(request.items)
+        for plan_index in np.unique(plan_indexes):
+            positions = np.flatnonzero(plan_indexes == plan_index)
+            try:
+                template = compile_plan(plan_key(request.plans[plan_index]))
+                schedules = self._schedules(template, prices[positions], request.include_entries)
+            except InvalidPlanError as e:
+                raise InvalidPlanError(f"plans[{plan_index}]: {e}") from e
+            for position, schedule in zip(positions, schedules):
+                results[position] = schedule
+        return ScheduleBatchResult(results=results)
+
+    @staticmethod
+    def _schedules(template: ScheduleTemplate, prices: np.ndarray, include_entries: bool) -> List[PaymentSchedule]:
+        amounts = template.intercept + np.outer(prices, template.slope)
+        if (amounts < -0.005).any():
+            raise InvalidPlanError("the down payment, special payments, discounts and fixed installments exceed the price")
+        totals = np.round(amounts.sum(axis=1), 2)
+        amounts = np.round(amounts, 2)
+        amounts[:, template.balance] = np.round(
+            amounts[:, template.balance] + totals - amounts.sum(axis=1), 2
+        )
+        down_payments = amounts[:, 0]
+        net_prices = np.round(template.net_price[0] + template.net_price[1] * prices, 2)
+        installments = np.round(template.installment[0] + template.installment[1] * prices, 2)
+        duration = template.duration_months
+        monthly = np.round((totals - down_payments) / duration, 2) if duration else np.zeros(len(prices))
+        months = template.months.tolist()
+
+        schedules = []
+        for row in range(len(prices)):
+            entries = []
+            if include_entries:
+                entries = [
+                    ScheduleEntry(month=month, amount=amount, kind=kind, name=name)
+                    for month, amount, kind, name in zip(months, amounts[row].tolist(), template.kinds, template.names)
+                ]
+            schedules.append(PaymentSchedule(
+                price=float(prices[row]),
+                net_price=float(net_prices[row]),
+                down_payment=float(down_payments[row]),
+                installment_amount=float(installments[row]),
+                installment_count=template.installment_count,
+                total_cost=round(float(totals[row]), 2),
+                duration_months=duration,
+                effective_monthly_payment=float(monthly[row]),
+                entries=entries,
+            ))
+        return schedules
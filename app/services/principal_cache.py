@@ -0,0 +1,92 @@
+# app/services/principal_cache.py
+import hashlib
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from app.schemas.admin import CacheStats
+
+
+class PrincipalCache:
+    """Which user an access token resolved to, so repeat requests skip the JWT decode and email lookup.
+
+    Keyed by the SHA-256 digest of the token, never the token itself. An entry
+    lives until the token's `exp` and the cache is a bounded LRU. Only the user
+    id is kept: the user is then read through the users entity cache, and any
+    write to a user drops the entries pointing at them (`invalidate_user`), so
+    a changed email or a deleted user takes effect on the next request.
+    """
+
+    def __init__(self, name: str = "principals", max_entries: int = 10000, clock: Callable[[], float] = time.time):
+        self.name = name
+        self.max_entries = max_entries
+        # Token `exp` claims are epoch seconds, so the clock is wall time.
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._by_user: Dict[str, Set[bytes]] = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def _remove(self, digest: bytes) -> None:
+        _, user_id = self._entries.pop(digest)
+        digests = self._by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[user_id]
+
+    def get(self, token: str) -> Optional[str]:
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user_id = entry
+        if expires_at <= self._clock():
+            self._remove(digest)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return user_id
+
+    def put(self, token: str, user_id: str, expires_at: float) -> None:
+        if expires_at <= self._clock():
+            return
+        digest = self._digest(token)
+        if digest in self._entries:
+            self._remove(digest)
+        self._entries[digest] = (expires_at, user_id)
+        self._by_user[user_id].add(digest)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        for digest in list(self._by_user.get(user_id, ())):
+            self.invalidations += 1
+            self._remove(digest)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.misses
+        return CacheStats(
+            name=self.name,
+            size=len(self._entries),
+            max_entries=self.max_entries,
+            hits=self.hits,
+            negative_hits=0,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+            hit_ratio=self.hits / lookups if lookups else 0.0,
+        )
@@ -1,7 +1,12 @@
 # src/services/project_service.py
-from typing import List, Optional
-from app.models.developer_models.project import Project
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.models.developer_models.project import Project, ProjectStatus
 from app.repositories.project_repository import ProjectRepository
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.bulk import BulkResult
+from app.schemas.pagination import Page, TotalCount
+from app.services.bulk import restore_indexes, validate_items
 
 
 class ProjectService:
@@ -16,14 +21,41 @@ class ProjectService:
         await self.repository.update(project)
         return project
 
+    async def create_projects(self, items: List[Dict[str, Any]]) -> BulkResult:
+        valid, rejected = validate_items(Project, items)
+        results = await self.repository.insert_many([project for _, project in valid])
+        return BulkResult.from_results(rejected + restore_indexes(results, valid))
+
+    async def update_projects(self, items: List[Dict[str, Any]]) -> BulkResult:
+        valid, rejected = validate_items(Project, items, require_id=True)
+        results = await self.repository.replace_many([project for _, project in valid])
+        return BulkResult.from_results(rejected + restore_indexes(results, valid))
+
+    async def set_projects_status(self, project_ids: List[str], status: ProjectStatus) -> BulkResult:
+        return BulkResult.from_results(await self.repository.set_many(project_ids, {"basic_info.status": status.value}))
+
     async def delete_project(self, project_id: str) -> None:
         await self.repository.delete(project_id)
 
-    async def get_project_by_id(self, project_id: str) -> Optional[Project]:
-        return await self.repository.get_by_id(project_id)
+    async def get_project_json(self, project_id: str) -> Optional[bytes]:
+        return await self.repository.get_json_by_id(project_id)
+
+    async def get_project_by_id(self, project_id: str, fields: Optional[FieldSet] = None) -> Optional[Project]:
+        return await self.repository.get_by_id(project_id, fields)
+
+    async def get_projects_by_ids(self, project_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Project]:
+        return await self.repository.get_many(project_ids, fields)
 
     async def get_project_by_name(self, name: str) -> Optional[Project]:
         return await self.repository.get_by_name(name)
 
-    async def get_all_projects(self) -> List[Project]:
-        return await self.repository.get_all()
+    async def get_all_projects(
+        self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[Project]:
+        return await self.repository.get_all(limit, cursor, total, fields)
+
+    def export_projects(
+        self, developer_id: Optional[str] = None, status: Optional[ProjectStatus] = None, after: Optional[str] = None
+    ) -> AsyncIterator[Project]:
+        return self.repository.stream_projects(developer_id, status, after)
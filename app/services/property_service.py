@@ -1,12 +1,49 @@
 # src/services/property_service.py
-from typing import List, Optional
-from app.models.property_models.property import Property
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.models.location_models.geo_point import GeoPoint
+from app.models.property_models.price import Price
+from app.models.property_models.price_record import PriceRecord
+from app.models.property_models.property import Property, PropertyType
+from app.repositories.batch_loader import Loaders
+from app.repositories.developer_repository import DeveloperRepository
+from app.repositories.location_repository import LocationRepository
+from app.repositories.location_tree import LocationTree
+from app.repositories.price_history_repository import PriceHistoryRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.projection import FieldSet
 from app.repositories.property_repository import PropertyRepository
+from app.schemas.batch import Batch
+from app.schemas.bulk import BulkResult
+from app.schemas.geo import NearbyPage
+from app.schemas.pagination import Page, TotalCount
+from app.schemas.price import PriceTrend, TrendInterval
+from app.schemas.property import (
+    DeveloperSummary, LocationSummary, ProjectSummary, PropertyDetail, PropertySearchRequest, PropertySearchResult,
+)
+from app.services.bulk import restore_indexes, validate_items
+from app.services.server_timing import ServerTiming
 
 
 class PropertyService:
-    def __init__(self, repository: PropertyRepository):
+    def __init__(
+        self,
+        repository: PropertyRepository,
+        location_tree: Optional[LocationTree] = None,
+        price_history: Optional[PriceHistoryRepository] = None,
+        locations: Optional[LocationRepository] = None,
+        projects: Optional[ProjectRepository] = None,
+        developers: Optional[DeveloperRepository] = None,
+    ):
         self.repository = repository
+        self.location_tree = location_tree
+        self.price_history = price_history
+        # Read for the composed detail view only.
+        self.locations = locations
+        self.projects = projects
+        self.developers = developers
 
     async def create_property(self, property: Property) -> Property:
         await self.repository.save(property)
@@ -16,20 +53,153 @@ class PropertyService:
         await self.repository.update(property)
         return property
 
+    async def create_properties(self, items: List[Dict[str, Any]]) -> BulkResult:
+        valid, rejected = validate_items(Property, items)
+        results = await self.repository.insert_many([property for _, property in valid])
+        return BulkResult.from_results(rejected + restore_indexes(results, valid))
+
+    async def update_properties(self, items: List[Dict[str, Any]]) -> BulkResult:
+        valid, rejected = validate_items(Property, items, require_id=True)
+        results = await self.repository.replace_many([property for _, property in valid])
+        return BulkResult.from_results(rejected + restore_indexes(results, valid))
+
+    async def set_properties_active(self, property_ids: List[str], is_active: bool) -> BulkResult:
+        return BulkResult.from_results(await self.repository.set_many(property_ids, {"is_active": is_active}))
+
     async def delete_property(self, property_id: str) -> None:
         await self.repository.delete(property_id)
 
-    async def get_property_by_id(self, property_id: str) -> Optional[Property]:
-        return await self.repository.get_by_id(property_id)
+    async def get_property_json(self, property_id: str) -> Optional[bytes]:
+        return await self.repository.get_json_by_id(property_id)
+
+    async def get_property_by_id(self, property_id: str, fields: Optional[FieldSet] = None) -> Optional[Property]:
+        return await self.repository.get_by_id(property_id, fields)
+
+    async def get_properties_by_ids(self, property_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[Property]:
+        return await self.repository.get_many(property_ids, fields)
+
+    async def get_property_detail(
+        self, property_id: str, loaders: Loaders, timing: ServerTiming
+    ) -> Optional[PropertyDetail]:
+        """The property with its location chain, project and developers, or None if it does not exist.
+
+        After the property itself, the location chain and the project branch
+        are fetched concurrently, each as batched `$in` reads through the
+        request's loaders (cache hits for the cached entities).
+        """
+        property = await timing.measure("property", self.repository.get_by_id(property_id))
+        if property is None:
+            return None
+        locations, project = await asyncio.gather(
+            timing.measure("locations", self._detail_locations(property, loaders)),
+            timing.measure("project", self._detail_project(property, loaders)),
+        )
+        return PropertyDetail(property=property, locations=locations, project=project)
+
+    async def _detail_locations(self, property: Property, loaders: Loaders) -> List[LocationSummary]:
+        location_ids = (
+            self.location_tree.enclosing(property.location_ids) if self.location_tree else property.location_ids
+        )
+        return [
+            LocationSummary(
+                id=location.id, name=location.name, location_type=location.location_type,
+                average_price_m2=location.average_price_m2,
+            )
+            for location in await loaders(self.locations).load_many(location_ids)
+            if location is not None
+        ]
 
-    async def get_all_property_ids(self) -> List[str]:
-        return await self.repository.get_all_ids()
+    async def _detail_project(self, property: Property, loaders: Loaders) -> Optional[ProjectSummary]:
+        if property.project_id is None:
+            return None
+        project = await loaders(self.projects).load(property.project_id)
+        if project is None:
+            return None
+        developers = await loaders(self.developers).load_many(project.basic_info.developer_ids)
+        return ProjectSummary(
+            id=project.id,
+            name=project.basic_info.name,
+            logo_url=project.basic_info.logo_url,
+            status=project.basic_info.status,
+            delivery_date=project.basic_info.delivery_date,
+            developers=[
+                DeveloperSummary(id=developer.id, name=developer.basic_info.name, logo_url=developer.basic_info.logo_url)
+                for developer in developers
+                if developer is not None
+            ],
+        )
+
+    async def get_all_property_ids(self, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE) -> Page[str]:
+        return await self.repository.get_all_ids(limit, cursor, total)
 
     async def get_active_properties(self) -> List[str]:
         return await self.repository.get_active_properties_ids()
 
+    async def search_properties(self, request: PropertySearchRequest) -> PropertySearchResult:
+        filters = request.filters
+        if filters.include_descendants and filters.location_ids and self.location_tree is not None:
+            # A single $in over the precomputed descendant set instead of a lookup per level.
+            location_ids = self.location_tree.expand(filters.location_ids)
+            request = request.copy(update={"filters": filters.copy(update={"location_ids": location_ids})})
+        return await self.repository.search(request)
+
+    async def get_properties_near(
+        self,
+        point: GeoPoint,
+        max_distance_m: float,
+        property_types: Optional[List[PropertyType]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> NearbyPage[Property]:
+        return await self.repository.near(point, max_distance_m, property_types, limit, cursor)
+
+    async def submit_price(self, property_id: str, price: Price) -> Optional[PriceRecord]:
+        """Record a new price and make it the property's current price if it is the latest.
+
+        Returns None when the property does not exist.
+        """
+        property = await self.repository.get_by_id(property_id, ("id", "location_ids"))
+        if property is None:
+            return None
+        record = PriceRecord(
+            **price.copy(update={
+                "id": price.id or str(uuid.uuid4()),
+                "date_submitted": price.date_submitted or datetime.now(),
+            }).dict(),
+            property_id=property_id,
+            location_ids=property.location_ids or [],
+        )
+        await self.price_history.save(record)
+        await self.repository.set_current_price(property_id, Price(**record.dict(exclude={"property_id", "location_ids"})))
+        return record
+
+    async def get_price_history(
+        self, property_id: str, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE
+    ) -> Page[PriceRecord]:
+        return await self.price_history.get_history(property_id, limit, cursor, total)
+
+    async def get_price_trend(
+        self,
+        property_id: str,
+        interval: TrendInterval,
+        currency: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> PriceTrend:
+        points = await self.price_history.trend({"property_id": property_id}, interval, currency, start, end)
+        return PriceTrend(interval=interval, currency=currency, points=points)
+
     async def activate_property(self, property_id: str) -> None:
         await self.repository.activate(property_id)
 
     async def deactivate_property(self, property_id: str) -> None:
         await self.repository.deactivate(property_id)
+
+    def export_properties(
+        self,
+        is_active: Optional[bool] = None,
+        property_types: Optional[List[PropertyType]] = None,
+        location_id: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> AsyncIterator[Property]:
+        return self.repository.stream_properties(is_active, property_types, location_id, after)
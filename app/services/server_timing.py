@@ -0,0 +1,27 @@
+# app/services/server_timing.py
+import time
+from typing import Awaitable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class ServerTiming:
+    """Durations of the parts of one request, rendered as a `Server-Timing` header.
+
+    Measured parts may run concurrently; each one reports its own wall time.
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._durations: Dict[str, float] = {}
+
+    async def measure(self, name: str, awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._durations[name] = time.perf_counter() - started
+
+    def header(self) -> str:
+        durations = {**self._durations, "total": time.perf_counter() - self._started}
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in durations.items())
@@ -1,7 +1,10 @@
 # src/services/user_service.py
-from typing import List, Optional
-from app.models.user_models.user import User
+from typing import AsyncIterator, List, Optional
+from app.models.user_models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
+from app.repositories.projection import FieldSet
+from app.schemas.batch import Batch
+from app.schemas.pagination import Page, TotalCount
 
 
 class UserService:
@@ -19,17 +22,23 @@ class UserService:
     async def delete_user(self, user_id: str) -> None:
         await self.repository.delete(user_id)
 
-    async def get_user_by_id(self, user_id: str) -> Optional[User]:
-        print(user_id , " from service \n\n")
-        return await self.repository.get_by_id(user_id)
+    async def get_user_json(self, user_id: str) -> Optional[bytes]:
+        return await self.repository.get_json_by_id(user_id)
 
-    async def get_users_by_email(self, email: str) -> Optional[User]:
-        return await self.repository.get_by_email(email)
+    async def get_user_by_id(self, user_id: str, fields: Optional[FieldSet] = None) -> Optional[User]:
+        return await self.repository.get_by_id(user_id, fields)
 
+    async def get_users_by_ids(self, user_ids: List[str], fields: Optional[FieldSet] = None) -> Batch[User]:
+        return await self.repository.get_many(user_ids, fields)
 
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        return await self.repository.get_by_email(email)
 
-    async def get_users_by_role(self, role: str, skip: int = 0, limit: int = 50) -> List[User]:
-        return await self.repository.get_users_by_role(role, skip, limit)
+    async def get_users_by_role(
+        self, role: str, limit: int, cursor: Optional[str] = None, total: TotalCount = TotalCount.NONE,
+        fields: Optional[FieldSet] = None,
+    ) -> Page[User]:
+        return await self.repository.get_users_by_role(role, limit, cursor, total, fields)
 
     async def get_users_ids_by_role(self, role: str) -> List[str]:
         return await self.repository.get_users_ids_by_role(role)
@@ -39,3 +48,6 @@ class UserService:
 
     async def deactivate_user(self, user_id: str) -> None:
         await self.repository.deactivate(user_id)
+
+    def export_users(self, role: Optional[UserRole] = None, after: Optional[str] = None) -> AsyncIterator[User]:
+        return self.repository.stream_users(role, after)
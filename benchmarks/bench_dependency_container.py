@@ -0,0 +1,121 @@
+# benchmarks/bench_dependency_container.py
+"""Requests per second on GET /users/{id}: per-request controller graphs vs the app-scoped container.
+
+Usage: python -m benchmarks.bench_dependency_container [--requests 5000] [--concurrency 50] [--rounds 5]
+
+The database is replaced by an in-memory collection and requests go through
+httpx's ASGI transport, so the numbers isolate routing and dependency
+overhead from network and MongoDB latency. The two variants alternate for
+several rounds and the median of each is reported. The cost of resolving
+the controller dependency itself is measured separately, since it is small
+next to the per-request overhead of the in-process HTTP stack.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.requests import Request
+
+from app.container import Container
+from app.controllers.user_controller import UserController
+from app.main import app
+from app.repositories.user_repository import UserRepository
+from app.routers.user_router import get_user_controller
+from app.services.user_service import UserService
+
+USER = {
+    "_id": "user-1",
+    "email": {"address": "user@example.com", "is_verified": True},
+    "full_name": "Benchmark User",
+    "role": "user",
+    "language": "en",
+}
+
+
+class InMemoryCollection:
+    name = "users"
+
+    async def find_one(self, query, *args, **kwargs):
+        return dict(USER) if query.get("_id") == USER["_id"] else None
+
+
+class InMemoryDatabase:
+    def __getitem__(self, name):
+        return InMemoryCollection()
+
+
+# Never connects; only used to reproduce the per-request database/collection lookup.
+legacy_client = AsyncIOMotorClient("mongodb://localhost:27017", connect=False)
+
+
+async def get_user_controller_per_request() -> UserController:
+    """The previous dependency: a new repository, service and controller on every request."""
+    legacy_client["real-estate-ai"]["users"]  # what `await get_user_collection()` did
+    user_collection = InMemoryCollection()
+    repository = UserRepository(user_collection)
+    service = UserService(repository)
+    return UserController(service)
+
+
+async def measure(requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                response = await client.get(f"/users/{USER['_id']}")
+                response.raise_for_status()
+
+        await asyncio.gather(*(one() for _ in range(min(requests // 10, 500))))  # warm up
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+async def measure_dependency(calls: int) -> tuple:
+    request = Request({"type": "http", "app": app})
+    started = time.perf_counter()
+    for _ in range(calls):
+        await get_user_controller_per_request()
+    before = (time.perf_counter() - started) / calls
+    started = time.perf_counter()
+    for _ in range(calls):
+        await get_user_controller(request)
+    after = (time.perf_counter() - started) / calls
+    return before * 1e6, after * 1e6
+
+
+async def run(requests: int, concurrency: int, rounds: int) -> None:
+    app.state.container = Container(InMemoryDatabase())
+    before, after = [], []
+    # The request path still has debug prints; keep them out of the measurement output.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(rounds):
+            app.dependency_overrides[get_user_controller] = get_user_controller_per_request
+            before.append(await measure(requests, concurrency))
+            app.dependency_overrides.clear()
+            after.append(await measure(requests, concurrency))
+    before_rps, after_rps = statistics.median(before), statistics.median(after)
+    print(f"per-request graphs: {before_rps:8.0f} req/s")
+    print(f"app container:      {after_rps:8.0f} req/s ({(after_rps / before_rps - 1) * 100:+.1f}%)")
+    before_us, after_us = await measure_dependency(100_000)
+    print(f"dependency resolution: {before_us:.2f} us -> {after_us:.2f} us per request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# benchmarks/bench_trusted_reads.py
+"""Validated vs trusted get-by-id reads on large Project and Conversation documents.
+
+Usage: python -m benchmarks.bench_trusted_reads [--iterations 2000] [--rounds 5]
+
+The validated path is what a route does without TRUSTED_READS: the repository
+builds the model from the stored document, then FastAPI validates it against
+the route's response_model and renders it with JSONResponse. The trusted path
+is `DocumentSerializer.dumps` on the same document. No database is involved;
+each variant runs for several rounds and the median is reported.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Type
+
+import orjson
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import BaseModel
+
+from app.models.conversation_models.conversation import Conversation
+from app.models.developer_models.project import Project
+from app.repositories.serialization import DocumentSerializer
+
+STARTED = datetime(2024, 1, 1, 9, 30)
+
+
+def project_document() -> Dict[str, Any]:
+    urls = lambda kind, n: [f"https://cdn.example.com/projects/p-1/{kind}/{i}.jpg" for i in range(n)]
+    return {
+        "_id": "p-1",
+        "basic_info": {
+            "name": "Benchmark Heights",
+            "description": "A large mixed-use project " * 20,
+            "project_type": "project",
+            "status": "under_construction",
+            "delivery_date": STARTED,
+            "starting_price": 3_500_000.0,
+            "usage_types": ["residential", "commercial"],
+            "developer_ids": [f"d-{i}" for i in range(5)],
+        },
+        "detailed_info": {
+            "full_description": "Details " * 500,
+            "completion_date": STARTED + timedelta(days=900),
+            "available_units_count": 1200,
+            "available_unit_types": ["apartment", "house", "condo"],
+            "master_plan_urls": urls("plans", 50),
+            "image_urls": urls("images", 400),
+            "document_urls": urls("documents", 100),
+            "video_urls": urls("videos", 50),
+            "amenities": ["pool", "gym", "parking", "security"],
+            "location_ids": [f"l-{i}" for i in range(4)],
+        },
+        "backend_info": {"broker_employee_ids": [f"e-{i}" for i in range(50)]},
+    }
+
+
+def conversation_document() -> Dict[str, Any]:
+    messages = []
+    for number in range(1, 501):
+        timestamp = STARTED + timedelta(minutes=number)
+        messages.append({
+            "number": number,
+            "content": f"Looking for a three bedroom apartment, question {number}",
+            "timestamp": timestamp,
+            "role": "user",
+            "response": {
+                "content": "Here are some options that match your budget. " * 4,
+                "related_property_ids": [f"p-{number}-{i}" for i in range(5)],
+                "role": "assistant",
+            },
+        })
+    return {
+        "_id": "c-1",
+        "user_id": "u-1",
+        "title": "Apartment search",
+        "status": "active",
+        "messages": messages,
+        "message_count": len(messages),
+        "related_property_ids": [f"p-{i}" for i in range(200)],
+        "last_message_timestamp": messages[-1]["timestamp"],
+        "message_storage": "embedded",
+    }
+
+
+def run_sync(coroutine):
+    """Drive a coroutine that never suspends, without an event loop's per-call overhead."""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended")
+
+
+def validated_reader(model: Type[BaseModel]) -> Callable[[Dict[str, Any]], bytes]:
+    field = create_model_field(name="Response", type_=model, mode="serialization")
+    rename_id = DocumentSerializer(model).rename_id
+
+    def read(document: Dict[str, Any]) -> bytes:
+        # As BaseRepository._to_model: map `_id` for models without an alias.
+        if rename_id:
+            document = dict(document)
+            document["id"] = str(document.pop("_id"))
+        aggregate = model(**document)
+        content = run_sync(serialize_response(field=field, response_content=aggregate))
+        return JSONResponse(content).body
+
+    return read
+
+
+def trusted_reader(model: Type[BaseModel]) -> Callable[[Dict[str, Any]], bytes]:
+    return DocumentSerializer(model).dumps
+
+
+def measure(read: Callable[[Dict[str, Any]], bytes], document: Dict[str, Any], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        read(document)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(iterations: int, rounds: int) -> None:
+    for model, document in ((Project, project_document()), (Conversation, conversation_document())):
+        validated, trusted = validated_reader(model), trusted_reader(model)
+        # Same payload either way, up to key order.
+        assert orjson.loads(validated(document)) == orjson.loads(trusted(document))
+        size = len(trusted(document))
+        before = [measure(validated, document, iterations) for _ in range(rounds)]
+        after = [measure(trusted, document, iterations) for _ in range(rounds)]
+        before_us, after_us = statistics.median(before), statistics.median(after)
+        print(f"{model.__name__} ({size / 1024:.0f} KiB)")
+        print(f"  validated: {before_us:9.1f} us per read")
+        print(f"  trusted:   {after_us:9.1f} us per read ({before_us / after_us:.1f}x faster)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.iterations, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
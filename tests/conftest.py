@@ -0,0 +1,56 @@
+import os
+from decimal import Decimal
+
+import pytest
+from bson import Decimal128
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+
+# app.config requires these at import time; tests never talk to Google.
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+
+
+def _as_bson(value):
+    if isinstance(value, Decimal):
+        return Decimal128(value)
+    if isinstance(value, dict):
+        return {key: _as_bson(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_as_bson(item) for item in value]
+    return value
+
+
+def _bulk_write(collection, requests, ordered=True, **kwargs):
+    for request in requests:
+        if isinstance(request, InsertOne):
+            collection.insert_one(request._doc)
+        elif isinstance(request, ReplaceOne):
+            collection.replace_one(request._filter, request._doc, upsert=request._upsert)
+        elif isinstance(request, UpdateOne):
+            collection.update_one(request._filter, request._doc, upsert=request._upsert)
+        elif isinstance(request, UpdateMany):
+            collection.update_many(request._filter, request._doc, upsert=request._upsert)
+        elif isinstance(request, DeleteOne):
+            collection.delete_one(request._filter)
+        elif isinstance(request, DeleteMany):
+            collection.delete_many(request._filter)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """An in-memory MongoDB database.
+
+    mongomock ignores the client's type registry, so documents are dumped with
+    Decimal already stored as Decimal128, as the real client encodes them. Its
+    bulk_write predates the operations of current pymongo, so they are applied
+    one at a time instead.
+    """
+    import mongomock
+    from mongomock_motor import AsyncMongoMockClient
+
+    from app.repositories.base_repository import BaseRepository
+
+    to_document = BaseRepository._to_document
+    monkeypatch.setattr(BaseRepository, "_to_document", lambda self, aggregate: _as_bson(to_document(self, aggregate)))
+    monkeypatch.setattr(mongomock.Collection, "bulk_write", _bulk_write)
+    return AsyncMongoMockClient()["test"]
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.container import Container
+from app.models.user_models.user import Email, Language, User, UserRole
+from app.routers.admin_router import router as admin_router
+
+
+@pytest.fixture
+def container(database):
+    return Container(database)
+
+
+@pytest.fixture
+def client(container):
+    app = FastAPI()
+    app.include_router(admin_router, prefix="/admin")
+    app.state.container = container
+    with TestClient(app) as client:
+        yield client
+
+
+def _token(container, role):
+    async def sign_in():
+        email = f"{role.value}@example.com"
+        user = User(email=Email(address=email), full_name=role.value, role=role, language=Language.EN)
+        await container.user_service.create_user(user)
+        return await container.auth_service.create_access_token({"sub": email})
+
+    return asyncio.run(sign_in())
+
+
+@pytest.mark.parametrize("path", ["/admin/db/pool", "/admin/cache"])
+def test_admin_routes_need_authentication(client, path):
+    assert client.get(path).status_code == 401
+
+
+@pytest.mark.parametrize("path", ["/admin/db/pool", "/admin/cache"])
+def test_admin_routes_are_forbidden_to_other_roles(client, container, path):
+    token = _token(container, UserRole.USER)
+
+    assert client.get(path, headers={"Authorization": f"Bearer {token}"}).status_code == 403
+
+
+def test_admin_can_read_cache_stats(client, container):
+    token = _token(container, UserRole.ADMIN)
+
+    response = client.get("/admin/cache", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert "users" in {stats["name"] for stats in response.json()}
@@ -0,0 +1,27 @@
+import asyncio
+
+from app.container import Container
+
+CLAIMS = {"email": "new.user@example.com", "name": "New User", "email_verified": True}
+
+
+def test_first_google_sign_in_creates_the_user(database, monkeypatch):
+    async def main():
+        container = Container(database)
+
+        async def verify(token):
+            return CLAIMS
+
+        monkeypatch.setattr(container.google_token_verifier, "verify", verify)
+
+        token = await container.auth_controller.google_login("google-id-token")
+        user = await container.auth_service.get_current_user(token.access_token)
+        assert user is not None and user.email.address == CLAIMS["email"]
+        assert isinstance(user.id, str)
+        assert (await container.user_service.get_user_by_id(user.id)).full_name == "New User"
+
+        # Signing in again finds the user instead of creating another.
+        await container.auth_controller.google_login("google-id-token")
+        assert await database.users.count_documents({}) == 1
+
+    asyncio.run(main())
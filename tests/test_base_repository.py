@@ -0,0 +1,37 @@
+import asyncio
+
+from app.container import Container
+from app.models.developer_models.basic_info import DeveloperBasicInfo
+from app.models.developer_models.developer import Developer
+from app.models.property_models.property import Property
+
+
+def _property(title):
+    return Property(title=title, property_type="apartment", usage_type="residential")
+
+
+def test_saved_aggregate_without_id_is_found_by_its_new_id(database):
+    async def main():
+        container = Container(database)
+        developer = Developer(_id=None, basic_info=DeveloperBasicInfo(name="Developer"))
+        await container.developer_repository.save(developer)
+
+        assert isinstance(developer.id, str)
+        stored = await container.developer_repository.get_by_id(developer.id)
+        assert stored is not None and stored.id == developer.id
+
+    asyncio.run(main())
+
+
+def test_bulk_inserted_aggregates_get_string_ids_and_stream_resumes_after_them(database):
+    async def main():
+        repository = Container(database).property_repository
+        properties = [_property(f"Unit {n}") for n in range(3)]
+        await repository.insert_many(properties)
+
+        ids = sorted(property.id for property in properties)
+        assert all(isinstance(property_id, str) for property_id in ids)
+        assert [item.id for item in (await repository.get_many(ids)).items] == ids
+        assert [item.id async for item in repository.stream(after=ids[0])] == ids[1:]
+
+    asyncio.run(main())
@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.services.google_auth import GOOGLE_JWKS_URL, GoogleKeySet, GoogleTokenVerifier
+
+CLIENT_ID = "test-client-id"
+
+
+class SigningKey:
+    """An RSA key pair standing in for one of Google's signing keys."""
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self.jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "use": "sig"}
+
+    def sign(self, **overrides) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "user@example.com",
+            "email_verified": True,
+            "iat": now,
+            "exp": now + 3600,
+            **overrides,
+        }
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+class FakeGoogle:
+    """Serves the current signing keys at Google's JWKS URL and counts the requests for them."""
+
+    def __init__(self, *keys: SigningKey):
+        self.keys = list(keys)
+        self.requests = 0
+        self.transport = httpx.MockTransport(self._handle)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == GOOGLE_JWKS_URL
+        self.requests += 1
+        return httpx.Response(
+            200, json={"keys": [key.jwk for key in self.keys]}, headers={"Cache-Control": "public, max-age=3600"},
+        )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run(google: FakeGoogle, scenario, clock=None):
+    async def main():
+        async with httpx.AsyncClient(transport=google.transport) as client:
+            keys = GoogleKeySet(client, clock=clock or FakeClock())
+            verifier = GoogleTokenVerifier(client, keys=keys, client_id=CLIENT_ID)
+            try:
+                await scenario(verifier)
+            finally:
+                await verifier.close()
+
+    asyncio.run(main())
+
+
+def test_valid_id_token_verifies():
+    key = SigningKey("key-1")
+
+    async def scenario(verifier):
+        claims = await verifier.verify(key.sign())
+        assert claims["email"] == "user@example.com"
+        assert claims["aud"] == CLIENT_ID
+
+    _run(FakeGoogle(key), scenario)
+
+
+@pytest.mark.parametrize("overrides", [
+    {"iss": "https://evil.example.com"},
+    {"aud": "another-client-id"},
+    {"exp": int(time.time()) - 60},
+    {"email_verified": False},
+])
+def test_invalid_claims_are_rejected(overrides):
+    key = SigningKey("key-1")
+
+    async def scenario(verifier):
+        with pytest.raises(ValueError):
+            await verifier.verify(key.sign(**overrides))
+
+    _run(FakeGoogle(key), scenario)
+
+
+def test_token_signed_by_another_key_with_a_known_kid_is_rejected():
+    key = SigningKey("key-1")
+    impostor = SigningKey("key-1")
+
+    async def scenario(verifier):
+        with pytest.raises(ValueError):
+            await verifier.verify(impostor.sign())
+
+    _run(FakeGoogle(key), scenario)
+
+
+def test_keys_are_fetched_once_and_then_served_from_the_cache():
+    key = SigningKey("key-1")
+    google = FakeGoogle(key)
+    clock = FakeClock()
+
+    async def scenario(verifier):
+        await verifier.verify(key.sign())
+        clock.now += 600
+        await asyncio.gather(*(verifier.verify(key.sign(sub=str(n))) for n in range(5)))
+        assert google.requests == 1
+
+    _run(google, scenario, clock)
+
+
+def test_unknown_kid_forces_exactly_one_refetch():
+    old, new = SigningKey("key-1"), SigningKey("key-2")
+    google = FakeGoogle(old)
+    clock = FakeClock()
+
+    async def scenario(verifier):
+        await verifier.verify(old.sign())
+        clock.now += 120
+
+        # Google rotated its keys: the first token with the new kid refetches them.
+        google.keys = [old, new]
+        claims = await verifier.verify(new.sign())
+        assert claims["email"] == "user@example.com"
+        assert google.requests == 2
+
+        # Both keys are cached now, and a made up kid right after a fetch is not another request.
+        await verifier.verify(old.sign())
+        await verifier.verify(new.sign())
+        with pytest.raises(ValueError):
+            await verifier.verify(SigningKey("made-up").sign())
+        assert google.requests == 2
+
+    _run(google, scenario, clock)
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.property_models.payment_plan import PaymentPlan, SpecialPayment
+from app.schemas.payment_plan import ScheduleBatchItem, ScheduleBatchRequest, ScheduleEntryKind
+from app.services.payment_plan_service import InvalidPlanError, PaymentPlanService
+
+service = PaymentPlanService()
+
+
+def _plan(**fields):
+    return PaymentPlan(name="Plan", **fields)
+
+
+def _entries_total(schedule):
+    return round(sum(entry.amount for entry in schedule.entries), 2)
+
+
+def test_equal_installments_add_up_to_the_net_price():
+    schedule = service.schedule(Decimal(1_000_000), _plan(down_payment_percentage=10, installment_years=7))
+
+    assert schedule.installment_count == 84
+    assert schedule.installment_amount == 10714.29
+    assert schedule.total_cost == 1_000_000
+    assert _entries_total(schedule) == 1_000_000
+    # The cents lost to rounding come off the last installment.
+    assert schedule.entries[-1].amount == 10713.93
+    assert schedule.entries[-2].amount == 10714.29
+
+
+def test_discounts_and_special_payments_are_taken_from_the_price():
+    plan = _plan(
+        down_payment_percentage=20, installment_years=1, installment_type="quarterly", discount_percentage=10,
+        special_payments=[SpecialPayment(name="Keys", event_month=6, percentage=10)],
+    )
+    schedule = service.schedule(Decimal(1_000_000), plan)
+
+    assert schedule.net_price == 900_000
+    assert schedule.down_payment == 180_000
+    assert [(entry.month, entry.kind) for entry in schedule.entries] == [
+        (0, ScheduleEntryKind.DOWN_PAYMENT), (3, ScheduleEntryKind.INSTALLMENT), (6, ScheduleEntryKind.SPECIAL),
+        (6, ScheduleEntryKind.INSTALLMENT), (9, ScheduleEntryKind.INSTALLMENT), (12, ScheduleEntryKind.INSTALLMENT),
+    ]
+    assert schedule.installment_amount == 157_500
+    assert _entries_total(schedule) == 900_000
+
+
+def test_interest_is_added_on_top_of_the_net_price():
+    schedule = service.schedule(Decimal(100_000), _plan(installment_years=1, interest_rate=12))
+
+    assert schedule.installment_amount == 8884.88
+    assert schedule.total_cost == _entries_total(schedule)
+    assert schedule.total_cost > schedule.net_price
+
+
+def test_fixed_installments_are_balanced_by_the_last_one():
+    schedule = service.schedule(Decimal(100_000), _plan(down_payment_percentage=10, installment_years=1, installment_amount=5000))
+
+    assert [entry.amount for entry in schedule.entries[1:-1]] == [5000] * 11
+    assert schedule.entries[-1].amount == 35_000
+    assert schedule.total_cost == 100_000
+
+
+def test_fixed_installments_that_overpay_are_rejected():
+    with pytest.raises(InvalidPlanError):
+        service.schedule(Decimal(100_000), _plan(down_payment_percentage=10, installment_years=1, installment_amount=10_000))
+
+
+def test_cash_plan_rounds_into_the_down_payment():
+    plan = _plan(special_payments=[SpecialPayment(name="Fees", percentage=33.333)])
+    schedule = service.schedule(Decimal(100_000.01), plan)
+
+    assert schedule.installment_count == 0
+    assert schedule.total_cost == _entries_total(schedule) == 100_000.01
+
+
+@pytest.mark.parametrize("fields", [
+    {"installment_years": -2},
+    {"down_payment_percentage": 120},
+    {"discount_percentage": -5},
+    {"interest_rate": -1},
+    {"installment_years": 1, "installment_amount": -100},
+    {"special_payments": [SpecialPayment(name="Keys", event_month=-3, amount=1000)]},
+    {"special_payments": [SpecialPayment(name="Keys", percentage=150)]},
+])
+def test_out_of_range_plans_are_rejected(fields):
+    with pytest.raises(InvalidPlanError):
+        service.schedule(Decimal(1_000_000), _plan(**fields))
+
+
+def test_batch_groups_pairs_by_plan_and_names_the_invalid_plan():
+    plans = [_plan(installment_years=1), _plan(installment_years=2)]
+    request = ScheduleBatchRequest(plans=plans, items=[
+        ScheduleBatchItem(price=Decimal(120_000), plan_index=1),
+        ScheduleBatchItem(price=Decimal(120_000), plan_index=0),
+    ])
+    results = service.schedule_batch(request).results
+
+    assert [result.installment_count for result in results] == [24, 12]
+    assert [result.entries for result in results] == [[], []]
+
+    request.plans.append(_plan(installment_years=-1))
+    request.items.append(ScheduleBatchItem(price=Decimal(1), plan_index=2))
+    with pytest.raises(InvalidPlanError, match=r"plans\[2\]"):
+        service.schedule_batch(request)
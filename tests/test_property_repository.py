@@ -0,0 +1,40 @@
+import asyncio
+from datetime import datetime
+
+from app.container import Container
+from app.models.property_models.property import Property
+
+
+def _priced_property(amount, date_submitted=None):
+    return Property(
+        title="Unit",
+        property_type="apartment",
+        usage_type="residential",
+        location_ids=["cairo"],
+        current_price={"amount": amount, "date_submitted": date_submitted},
+    )
+
+
+def test_creating_a_priced_property_without_id_records_its_price(database):
+    async def main():
+        container = Container(database)
+        created = await container.property_service.create_property(_priced_property(100))
+
+        stored = await container.property_repository.get_by_id(created.id)
+        assert stored is not None and stored.current_price.amount == 100
+        history = await database.price_history.find({"property_id": created.id}).to_list(length=None)
+        assert [record["amount"].to_decimal() for record in history] == [100]
+
+    asyncio.run(main())
+
+
+def test_bulk_created_priced_properties_record_their_prices(database):
+    async def main():
+        container = Container(database)
+        properties = [_priced_property(100, datetime(2024, 1, 1)), _priced_property(200, datetime(2024, 1, 1))]
+        await container.property_repository.insert_many(properties)
+
+        for property in properties:
+            assert await database.price_history.count_documents({"property_id": property.id}) == 1
+
+    asyncio.run(main())
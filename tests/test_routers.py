@@ -0,0 +1,49 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.container import Container
+from app.routers.conversation_router import router as conversation_router
+from app.routers.developer_router import router as developer_router
+from app.routers.location_router import router as location_router
+from app.routers.project_router import router as project_router
+from app.routers.property_router import router as property_router
+from app.routers.user_router import router as user_router
+
+ROUTERS = {
+    "/users": user_router,
+    "/properties": property_router,
+    "/projects": project_router,
+    "/developers": developer_router,
+    "/locations": location_router,
+    "/conversations": conversation_router,
+}
+
+
+@pytest.fixture
+def client(database):
+    app = FastAPI()
+    for prefix, router in ROUTERS.items():
+        app.include_router(router, prefix=prefix)
+    app.state.container = Container(database)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("trusted_reads", [False, True])
+@pytest.mark.parametrize("prefix", list(ROUTERS))
+def test_unknown_id_is_not_found(client, monkeypatch, prefix, trusted_reads):
+    monkeypatch.setattr(settings, "TRUSTED_READS", trusted_reads)
+
+    response = client.get(f"{prefix}/unknown-id")
+
+    assert response.status_code == 404
+    assert response.json()["detail"].endswith("not found")
+
+
+@pytest.mark.parametrize("prefix", [prefix for prefix in ROUTERS if prefix != "/conversations"])
+def test_unknown_id_with_sparse_fields_is_not_found(client, prefix):
+    response = client.get(f"{prefix}/unknown-id", params={"fields": "id"})
+
+    assert response.status_code == 404